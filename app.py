@@ -2,12 +2,18 @@ import os
 import json
 import logging
 import uuid
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from dotenv import load_dotenv
 import openai_service
+import conversation
 import weather
 import farming_data
-from database import db, ChatMessage, WeatherRequest
+import prefetch
+import gazetteer
+import metrics
+from cache import TTLCache
+from payloads import PreparedResponse
+from database import db, ChatMessage, WeatherRequest, create_missing_indexes
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +35,29 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
 }
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# Maximum number of locations accepted by /api/weather/batch
+WEATHER_BATCH_MAX_LOCATIONS = int(os.environ.get("WEATHER_BATCH_MAX_LOCATIONS", "200"))
+
+# Maximum page size for /api/farming/search
+FARMING_SEARCH_MAX_LIMIT = 50
+
+# Maximum page size for the /api/farming/* lists
+FARMING_PAGE_MAX_LIMIT = 100
+
+# Field selections of the /api/farming/* lists prepared ahead of requests, separated by ';'
+FARMING_PRECOMPUTED_FIELDS = [
+    fields
+    for fields in map(farming_data.parse_fields, os.environ.get("FARMING_PRECOMPUTED_FIELDS", "name;name,description").split(";"))
+    if fields
+]
+
+# Other field selections and pages of the /api/farming/* lists, prepared on first request
+farming_page_cache = TTLCache(
+    max_entries=int(os.environ.get("FARMING_PAGE_CACHE_ENTRIES", "256")),
+    ttl=float("inf")
+)
+metrics.register_stats("farming_page_cache", "Cache of projected and paginated farming list responses", farming_page_cache.stats)
+
 logger.debug(f"Using database URI: {database_uri}")
 
 # Initialize the database with the app
@@ -38,10 +67,53 @@ db.init_app(app)
 with app.app_context():
     try:
         db.create_all()
+        create_missing_indexes(db.engine)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
 
+def _farming_list(resource, category=None, fields=None, limit=None, cursor=None):
+    """Get a farming list from farming_data ('techniques', 'schemes' or 'laws')."""
+    if resource == 'techniques':
+        return farming_data.get_farming_techniques(category, fields, limit, cursor)
+    if resource == 'schemes':
+        return farming_data.get_government_schemes(fields, limit, cursor)
+    return farming_data.get_farming_laws(fields, limit, cursor)
+
+def _is_error(data):
+    return isinstance(data, dict) and 'error' in data
+
+def prepare_farming_payloads():
+    """
+    Serialize and compress the /api/farming/* payloads for the current farming data.
+    
+    Returns:
+        dict: (resource, category, fields) to PreparedResponse, for every list in full
+        and for each field selection in FARMING_PRECOMPUTED_FIELDS
+    """
+    lists = [('techniques', category) for category in ['all', *farming_data.TECHNIQUE_CATEGORIES]]
+    lists += [('schemes', None), ('laws', None)]
+    payloads = {}
+    for resource, category in lists:
+        for fields in [None, *FARMING_PRECOMPUTED_FIELDS]:
+            data = _farming_list(resource, category, fields)
+            if not _is_error(data):
+                payloads[(resource, category, fields)] = PreparedResponse(data)
+    return payloads
+
+def get_farming_payloads():
+    """Return the prepared payloads, rebuilt once after each reload of the farming data."""
+    return farming_data.knowledge.derived('payloads', prepare_farming_payloads)
+
+# Build the payloads at startup rather than on the first request
+get_farming_payloads()
+
+# Keep the most requested locations warm in the weather cache. Started by the first
+# request instead of at import, so the debug reloader's watcher process never runs it
+@app.before_request
+def start_prefetch_scheduler():
+    prefetch.start_prefetch_scheduler(app)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -62,7 +134,8 @@ def chat():
         if 'session_id' not in session:
             session['session_id'] = str(uuid.uuid4())
 
-        response = openai_service.generate_response(user_message)
+        history = conversation.build_context(session['session_id'])
+        response = openai_service.generate_response(user_message, history)
 
         try:
             chat_entry = ChatMessage(
@@ -81,6 +154,56 @@ def chat():
         logger.error(f"Error in chat endpoint: {e}")
         return jsonify({'error': 'Failed to process your message. Please try again.'}), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('message', '')
+    if not user_message:
+        return jsonify({'error': 'No message provided'}), 400
+
+    if 'session_id' not in session:
+        session['session_id'] = str(uuid.uuid4())
+    session_id = session.get('session_id')
+    history = conversation.build_context(session_id)
+
+    def events():
+        parts = []
+        try:
+            for text in openai_service.generate_response_stream(user_message, history):
+                parts.append(text)
+                yield f"data: {json.dumps({'token': text})}\n\n"
+        except Exception as e:
+            logger.error(f"Error in chat stream: {e}")
+            if not parts:
+                fallback = openai_service.get_fallback_response(user_message)
+                parts.append(fallback)
+                yield f"data: {json.dumps({'token': fallback})}\n\n"
+
+        try:
+            chat_entry = ChatMessage(
+                session_id=session_id,
+                user_message=user_message,
+                bot_response="".join(parts).strip()
+            )
+            db.session.add(chat_entry)
+            db.session.commit()
+            logger.info(f"Chat saved to database with ID: {chat_entry.id}")
+        except Exception as db_error:
+            db.session.rollback()
+            logger.error(f"Database error saving chat: {db_error}")
+
+        yield "event: done\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def _as_float(value):
+    """Return value if it is numeric, otherwise None (fallback data uses 'N/A')."""
+    return value if isinstance(value, (int, float)) else None
+
 @app.route('/api/weather', methods=['GET'])
 def get_weather():
     try:
@@ -95,14 +218,15 @@ def get_weather():
                 weather_entry = WeatherRequest(
                     session_id=session.get('session_id'),
                     location=location,
-                    temperature=weather_data['current'].get('temperature'),
-                    humidity=weather_data['current'].get('humidity'),
+                    temperature=_as_float(weather_data['current'].get('temperature')),
+                    humidity=_as_float(weather_data['current'].get('humidity')),
                     description=weather_data['current'].get('description')
                 )
                 db.session.add(weather_entry)
                 db.session.commit()
                 logger.info(f"Weather data saved to database for location: {location}")
         except Exception as db_error:
+            db.session.rollback()
             logger.error(f"Database error saving weather data: {db_error}")
 
         return jsonify(weather_data)
@@ -110,12 +234,104 @@ def get_weather():
         logger.error(f"Error fetching weather data: {e}")
         return jsonify({'error': 'Failed to fetch weather data. Please try again.'}), 500
 
+@app.route('/api/weather/batch', methods=['POST'])
+def get_weather_batch():
+    try:
+        data = request.get_json(silent=True) or {}
+        locations = data.get('locations')
+        if not isinstance(locations, list) or not locations:
+            return jsonify({'error': 'Provide a non-empty list of locations'}), 400
+        if len(locations) > WEATHER_BATCH_MAX_LOCATIONS:
+            return jsonify({'error': f'At most {WEATHER_BATCH_MAX_LOCATIONS} locations per request'}), 400
+        if not all(isinstance(location, str) and location.strip() for location in locations):
+            return jsonify({'error': 'Locations must be non-empty strings'}), 400
+
+        results = weather.get_weather_batch(locations)
+
+        if 'session_id' not in session:
+            session['session_id'] = str(uuid.uuid4())
+
+        try:
+            rows = [
+                {
+                    'session_id': session.get('session_id'),
+                    'location': location,
+                    'temperature': _as_float(weather_data['current'].get('temperature')),
+                    'humidity': _as_float(weather_data['current'].get('humidity')),
+                    'description': weather_data['current'].get('description')
+                }
+                for location, weather_data in results.items()
+                if isinstance(weather_data.get('current'), dict)
+            ]
+            if rows:
+                db.session.execute(db.insert(WeatherRequest), rows)
+                db.session.commit()
+                logger.info(f"Weather data saved to database for {len(rows)} locations")
+        except Exception as db_error:
+            db.session.rollback()
+            logger.error(f"Database error saving batch weather data: {db_error}")
+
+        return jsonify(results)
+    except Exception as e:
+        logger.error(f"Error fetching batch weather data: {e}")
+        return jsonify({'error': 'Failed to fetch weather data. Please try again.'}), 500
+
+@app.route('/api/locations/suggest', methods=['GET'])
+def suggest_locations():
+    try:
+        prefix = request.args.get('q', '')
+        limit = min(request.args.get('limit', 10, type=int), 50)
+        return jsonify(gazetteer.complete(prefix, limit))
+    except Exception as e:
+        logger.error(f"Error suggesting locations: {e}")
+        return jsonify({'error': 'Failed to suggest locations. Please try again.'}), 500
+
+def send_farming_list(resource, category=None):
+    """
+    Serve a farming list, projected and paginated by the request's fields, limit and cursor.
+    
+    Full lists and precomputed field selections are served from the prepared
+    payloads; other selections and pages are prepared once and cached.
+    
+    Args:
+        resource (str): 'techniques', 'schemes' or 'laws'
+        category (str): The techniques category
+        
+    Returns:
+        Response: The prepared response, or a 400 error for unknown fields, an invalid limit or an invalid cursor
+    """
+    fields = farming_data.parse_fields(request.args.get('fields'))
+    try:
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit is not None and not 1 <= limit <= FARMING_PAGE_MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {FARMING_PAGE_MAX_LIMIT}'}), 400
+    cursor = request.args.get('cursor') or None
+    if limit is not None or cursor:
+        limit = limit or FARMING_PAGE_MAX_LIMIT
+    else:
+        prepared = get_farming_payloads().get((resource, category, fields))
+        if prepared is not None:
+            return prepared.send()
+
+    key = (farming_data.knowledge.generation, resource, category, fields, limit, cursor)
+    prepared, _ = farming_page_cache.get(key)
+    if prepared is None:
+        data = _farming_list(resource, category, fields, limit, cursor)
+        if _is_error(data):
+            return jsonify(data), 400
+        prepared = PreparedResponse(data)
+        farming_page_cache.set(key, prepared)
+    return prepared.send()
+
 @app.route('/api/farming/techniques', methods=['GET'])
 def get_farming_techniques():
     try:
         category = request.args.get('category', 'all')
-        techniques = farming_data.get_farming_techniques(category)
-        return jsonify(techniques)
+        if category != 'all' and category not in farming_data.TECHNIQUE_CATEGORIES:
+            return jsonify(farming_data.get_farming_techniques(category))
+        return send_farming_list('techniques', category)
     except Exception as e:
         logger.error(f"Error fetching farming techniques: {e}")
         return jsonify({'error': 'Failed to fetch farming techniques. Please try again.'}), 500
@@ -123,8 +339,7 @@ def get_farming_techniques():
 @app.route('/api/farming/schemes', methods=['GET'])
 def get_government_schemes():
     try:
-        schemes = farming_data.get_government_schemes()
-        return jsonify(schemes)
+        return send_farming_list('schemes')
     except Exception as e:
         logger.error(f"Error fetching government schemes: {e}")
         return jsonify({'error': 'Failed to fetch government schemes. Please try again.'}), 500
@@ -132,11 +347,33 @@ def get_government_schemes():
 @app.route('/api/farming/laws', methods=['GET'])
 def get_farming_laws():
     try:
-        laws = farming_data.get_farming_laws()
-        return jsonify(laws)
+        return send_farming_list('laws')
     except Exception as e:
         logger.error(f"Error fetching farming laws: {e}")
         return jsonify({'error': 'Failed to fetch farming laws. Please try again.'}), 500
 
+@app.route('/api/farming/search', methods=['GET'])
+def search_farming():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'No search query provided'}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    if not 1 <= limit <= FARMING_SEARCH_MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {FARMING_SEARCH_MAX_LIMIT}'}), 400
+    if offset < 0:
+        return jsonify({'error': 'offset must not be negative'}), 400
+    results = farming_data.search_farming_data(query, limit=limit, offset=offset)
+    if 'error' in results:
+        return jsonify({'error': 'Failed to search farming data. Please try again.'}), 500
+    return jsonify(results)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=True)
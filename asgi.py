@@ -0,0 +1,190 @@
+"""
+ASGI entry point that serves the chat and weather API routes without blocking a worker per request.
+
+POST /api/chat and GET /api/weather run as coroutines using AsyncOpenAI and an
+async HTTP client, so one process can hold hundreds of upstream calls in flight.
+Every other route is delegated to the Flask app.
+
+Run with:
+    uvicorn asgi:application --host 0.0.0.0 --port 5001
+"""
+import json
+import uuid
+import asyncio
+import logging
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.http import dump_cookie, parse_cookie
+import conversation
+import openai_service
+import prefetch
+import weather
+from app import app, _as_float
+from database import db, ChatMessage, WeatherRequest
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# All other routes are served by Flask in asgiref's thread pool
+flask_application = WsgiToAsgi(app)
+
+def _load_session(scope):
+    """Read the Flask session cookie from the request headers."""
+    headers = dict(scope.get('headers', []))
+    cookies = parse_cookie(headers.get(b'cookie', b'').decode('latin-1'))
+    cookie = cookies.get(app.config['SESSION_COOKIE_NAME'])
+    serializer = app.session_interface.get_signing_serializer(app)
+    if not cookie or serializer is None:
+        return {}
+    try:
+        return dict(serializer.loads(cookie, max_age=int(app.permanent_session_lifetime.total_seconds())))
+    except Exception:
+        return {}
+
+def _session_cookie_header(session_data):
+    """Build a Set-Cookie header that stores the session the same way Flask does."""
+    serializer = app.session_interface.get_signing_serializer(app)
+    interface = app.session_interface
+    cookie = dump_cookie(
+        app.config['SESSION_COOKIE_NAME'],
+        serializer.dumps(session_data),
+        path=interface.get_cookie_path(app),
+        domain=interface.get_cookie_domain(app),
+        secure=interface.get_cookie_secure(app),
+        httponly=interface.get_cookie_httponly(app),
+        samesite=interface.get_cookie_samesite(app)
+    )
+    return (b'set-cookie', cookie.encode('latin-1'))
+
+def _session_id(scope):
+    """Return the session ID and any Set-Cookie header needed to create it."""
+    session_data = _load_session(scope)
+    if 'session_id' in session_data:
+        return session_data['session_id'], []
+    session_data['session_id'] = str(uuid.uuid4())
+    return session_data['session_id'], [_session_cookie_header(session_data)]
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+async def _send_json(send, payload, status=200, headers=()):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *headers
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def _load_history(session_id):
+    with app.app_context():
+        return conversation.build_context(session_id)
+
+def _save_chat(session_id, user_message, response):
+    with app.app_context():
+        try:
+            chat_entry = ChatMessage(session_id=session_id, user_message=user_message, bot_response=response)
+            db.session.add(chat_entry)
+            db.session.commit()
+            logger.info(f"Chat saved to database with ID: {chat_entry.id}")
+        except Exception as db_error:
+            db.session.rollback()
+            logger.error(f"Database error saving chat: {db_error}")
+
+def _save_weather(session_id, location, weather_data):
+    with app.app_context():
+        try:
+            if 'current' in weather_data and isinstance(weather_data['current'], dict):
+                weather_entry = WeatherRequest(
+                    session_id=session_id,
+                    location=location,
+                    temperature=_as_float(weather_data['current'].get('temperature')),
+                    humidity=_as_float(weather_data['current'].get('humidity')),
+                    description=weather_data['current'].get('description')
+                )
+                db.session.add(weather_entry)
+                db.session.commit()
+                logger.info(f"Weather data saved to database for location: {location}")
+        except Exception as db_error:
+            db.session.rollback()
+            logger.error(f"Database error saving weather data: {db_error}")
+
+async def chat(scope, receive, send):
+    """Async equivalent of the Flask /api/chat route."""
+    try:
+        try:
+            data = json.loads(await _read_body(receive) or b'{}')
+        except ValueError:
+            data = {}
+        user_message = data.get('message', '') if isinstance(data, dict) else ''
+        if not user_message:
+            await _send_json(send, {'error': 'No message provided'}, 400)
+            return
+
+        session_id, cookie_headers = _session_id(scope)
+        history = await asyncio.to_thread(_load_history, session_id)
+        response = await openai_service.generate_response_async(user_message, history)
+
+        # Database writes are synchronous; keep them off the event loop
+        await asyncio.to_thread(_save_chat, session_id, user_message, response)
+
+        await _send_json(send, {'response': response}, headers=cookie_headers)
+    except Exception as e:
+        logger.error(f"Error in chat endpoint: {e}")
+        await _send_json(send, {'error': 'Failed to process your message. Please try again.'}, 500)
+
+async def get_weather(scope, receive, send):
+    """Async equivalent of the Flask /api/weather route."""
+    try:
+        query = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+        location = query.get('location', ['Delhi'])[0]
+        weather_data = await weather.get_weather_data_async(location)
+
+        session_id, cookie_headers = _session_id(scope)
+        await asyncio.to_thread(_save_weather, session_id, location, weather_data)
+
+        await _send_json(send, weather_data, headers=cookie_headers)
+    except Exception as e:
+        logger.error(f"Error fetching weather data: {e}")
+        await _send_json(send, {'error': 'Failed to fetch weather data. Please try again.'}, 500)
+
+ASYNC_ROUTES = {
+    ('POST', '/api/chat'): chat,
+    ('GET', '/api/weather'): get_weather,
+}
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            prefetch.start_prefetch_scheduler(app)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await weather.close_async_client()
+            await openai_service.async_client.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    """ASGI application: async handlers for LLM- and weather-bound routes, Flask for the rest."""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+
+    if scope['type'] == 'http':
+        handler = ASYNC_ROUTES.get((scope['method'], scope['path']))
+        if handler is not None:
+            await handler(scope, receive, send)
+            return
+
+    await flask_application(scope, receive, send)
@@ -0,0 +1,55 @@
+"""
+Benchmark the crop advisory index: build time, memory and per-response lookup cost.
+
+Synthetic catalogues are made by repeating the bundled crop entries under new names.
+
+Run from the repository root:
+    python benchmarks/bench_crop_advisory.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crop_advisory  # noqa: E402
+import farming_data  # noqa: E402
+
+def make_crops(count):
+    """Build (entry ID, crop entry) pairs by cycling through the bundled crops."""
+    bundled = farming_data.knowledge.entries('crops')
+    crops = []
+    for n in range(count):
+        item = dict(bundled[n % len(bundled)], name=f"Crop {n}")
+        crops.append((f"crops:crop-{n}", item))
+    return crops
+
+def make_conditions(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            'temp': rng.uniform(-2, 42),
+            'humidity': rng.uniform(10, 100),
+            'rain_24h': rng.choice([0, 0, rng.uniform(0, 30)]),
+            'rain_72h': rng.choice([0, rng.uniform(0, 60)]),
+            'wind': rng.uniform(0, 14),
+            'month': rng.randint(1, 12)
+        }
+        for _ in range(count)
+    ]
+
+if __name__ == '__main__':
+    conditions = make_conditions(1000)
+    print(f"{'crops':>6} {'build ms':>9} {'index KiB':>10} {'lookup us':>10}")
+    for size in (4, 100, 1000):
+        crops = make_crops(size)
+        started = timeit.default_timer()
+        index = crop_advisory.CropAdvisoryIndex(crops)
+        build_ms = (timeit.default_timer() - started) * 1000
+
+        def serve():
+            for condition in conditions:
+                index.lookup(index.bucket(condition), crop_advisory.CROP_ADVISORIES_MAX_CROPS)
+        lookup_us = timeit.timeit(serve, number=5) / (5 * len(conditions)) * 1e6
+        print(f"{size:>6} {build_ms:>9.1f} {index.advice_ids.nbytes / 1024:>10.0f} {lookup_us:>10.2f}")
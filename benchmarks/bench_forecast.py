@@ -0,0 +1,88 @@
+"""
+Benchmark daily forecast aggregation: the original per-slot loop vs forecast.py.
+
+Run from the repository root:
+    python benchmarks/bench_forecast.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import forecast  # noqa: E402
+
+def make_forecast(seed, start=1760745600, slots=40):
+    """Build a synthetic 5-day, 3-hourly forecast response."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(slots):
+        item = {
+            'dt': start + i * 10800,
+            'dt_txt': '',
+            'main': {'temp': rng.uniform(10, 40), 'humidity': rng.uniform(20, 95)},
+            'wind': {'speed': rng.uniform(0, 12)},
+            'weather': [{'description': 'scattered clouds', 'icon': '03d'}]
+        }
+        if rng.random() < 0.3:
+            item['rain'] = {'3h': rng.uniform(0, 8)}
+        items.append(item)
+    return {'list': items, 'city': {'timezone': 19800}}
+
+def legacy_daily(forecast_data):
+    """The original process_weather_data loop: first slot of each date only."""
+    forecast_days = []
+    date_processed = set()
+    for item in forecast_data['list']:
+        date_str = str(item['dt'] // 86400)
+        if date_str not in date_processed and len(date_processed) < 5:
+            date_processed.add(date_str)
+            forecast_days.append({
+                'date': date_str,
+                'temp': item['main']['temp'],
+                'humidity': item['main']['humidity'],
+                'description': item['weather'][0]['description'],
+                'icon': item['weather'][0]['icon']
+            })
+    return forecast_days
+
+def legacy_full_daily(forecast_data):
+    """A per-slot Python loop computing the same aggregates as forecast.py."""
+    days = {}
+    for item in forecast_data['list']:
+        day = days.setdefault((item['dt'] + forecast_data['city']['timezone']) // 86400, {'temps': [], 'hum': [], 'rain': 0.0, 'wind': 0.0})
+        day['temps'].append(item['main']['temp'])
+        day['hum'].append(item['main']['humidity'])
+        day['rain'] += item.get('rain', {}).get('3h', 0.0)
+        day['wind'] = max(day['wind'], item['wind']['speed'])
+    return [
+        {
+            'temp_min': min(d['temps']), 'temp_max': max(d['temps']),
+            'temp': sum(d['temps']) / len(d['temps']), 'humidity': sum(d['hum']) / len(d['hum']),
+            'rain_total': d['rain'], 'wind_max': d['wind']
+        }
+        for d in list(days.values())[:5]
+    ]
+
+def report(name, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{name:<48} {seconds * 1e6:10.1f} us/call")
+
+def main():
+    single = make_forecast(0)
+    batch = [make_forecast(seed) for seed in range(200)]
+
+    print("Single location (40 slots)")
+    report("legacy loop (first slot per day)", lambda: legacy_daily(single), 2000)
+    report("python loop (full aggregates)", lambda: legacy_full_daily(single), 2000)
+    report("forecast.summarize_forecast", lambda: forecast.summarize_forecast(single), 2000)
+
+    print("\nBatch of 200 locations")
+    report("legacy loop x200", lambda: [legacy_daily(f) for f in batch], 20)
+    report("python loop (full aggregates) x200", lambda: [legacy_full_daily(f) for f in batch], 20)
+    report("forecast.summarize_forecast x200", lambda: [forecast.summarize_forecast(f) for f in batch], 20)
+    report("forecast.summarize_forecasts (stacked)", lambda: forecast.summarize_forecasts(batch), 20)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark message classification: the original keyword scans vs intent.py.
+
+Run from the repository root:
+    python benchmarks/bench_intent.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intent  # noqa: E402
+
+FILLER = (
+    "my family has farmed this land for many years and this season the soil looks dry "
+    "near the canal so i am worried about the coming months and what we should do next"
+).split()
+
+LEGACY_PROMPT_KEYWORDS = {
+    'weather': ['weather', 'rain', 'forecast', 'temperature', 'climate', 'monsoon', 'humidity'],
+    'crops': ['crop', 'plant', 'seed', 'harvest', 'cultivation', 'grow', 'yield'],
+    'schemes': ['scheme', 'subsidy', 'government', 'loan', 'grant', 'support', 'policy', 'program'],
+    'laws': ['law', 'regulation', 'legal', 'act', 'rule', 'compliance', 'guideline']
+}
+
+LEGACY_FALLBACK_KEYWORDS = [
+    ('greeting', ['hello', 'hi', 'hey', 'greetings', 'namaste']),
+    ('techniques', ['technique', 'farming method', 'how to farm', 'cultivat', 'agriculture']),
+    ('crops', ['crop', 'plant', 'seed', 'harvest', 'grow']),
+    ('schemes', ['scheme', 'subsidy', 'government', 'loan', 'support']),
+    ('weather', ['weather', 'rain', 'climate', 'monsoon'])
+]
+
+def make_message(words, seed=0, keyword='subsidy'):
+    """Build a long message with one topic keyword near the end."""
+    rng = random.Random(seed)
+    text = [rng.choice(FILLER) for _ in range(words)]
+    text.insert(words - 3, keyword)
+    return " ".join(text)
+
+def legacy_classify(user_message):
+    """The original build_prompt scan followed by the get_fallback_response scan."""
+    category = 'general'
+    for key, keywords in LEGACY_PROMPT_KEYWORDS.items():
+        if any(keyword in user_message.lower() for keyword in keywords):
+            category = key
+            break
+
+    lowered = user_message.lower()
+    for key, keywords in LEGACY_FALLBACK_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return category, key
+    return category, 'general'
+
+def report(name, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{name:<40} {seconds * 1e6:10.1f} us/call")
+
+def main():
+    for words in (20, 200, 2000):
+        message = make_message(words)
+        number = max(20, 20000 // words)
+        print(f"Message of {words} words ({len(message)} chars)")
+        report("legacy keyword scans", lambda: legacy_classify(message), number)
+        report("intent.classify", lambda: intent.classify(message), number)
+        print()
+
+if __name__ == '__main__':
+    main()
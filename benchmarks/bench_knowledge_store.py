@@ -0,0 +1,70 @@
+"""
+Benchmark the farming knowledge store on synthetic catalogues of growing size.
+
+Reports load (index) time, Python heap held by the store, lookup latency
+and the time to rebuild the search index after a reload.
+
+Run from the repository root:
+    python benchmarks/bench_knowledge_store.py
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_store import KnowledgeStore  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+
+KINDS = ['crops', 'techniques', 'soil_management', 'schemes', 'laws']
+
+def write_catalogue(path, entries):
+    """Write a catalogue of entries shaped like data/farming_knowledge.jsonl."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for n in range(entries):
+            kind = KINDS[n % len(KINDS)]
+            item = {
+                'name': f"Entry {n}",
+                'description': f"Synthetic {kind} entry number {n} for benchmarking the store.",
+                'details': [f"Practice {n}-{i}: irrigate, mulch and rotate as advised" for i in range(8)]
+            }
+            f.write(json.dumps({'id': f"{kind}:entry-{n}", 'kind': kind, 'item': item}) + "\n")
+
+def measure(entries):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'catalogue.jsonl')
+        write_catalogue(path, entries)
+
+        started = timeit.default_timer()
+        store = KnowledgeStore(path, reload_interval=0)
+        load_ms = (timeit.default_timer() - started) * 1000
+
+        # Load again under tracemalloc, which is too slow to time with
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        traced = KnowledgeStore(path, reload_interval=0)
+        heap_kb = (tracemalloc.get_traced_memory()[0] - before) / 1024
+        tracemalloc.stop()
+        del traced
+
+        ids = store.ids()
+        lookups = 10000
+        lookup_us = timeit.timeit(lambda: store.get(ids[len(ids) // 2]), number=lookups) / lookups * 1e6
+
+        started = timeit.default_timer()
+        SearchIndex([{'id': entry_id, 'fields': {'name': item['name'], 'description': item['description']}}
+                     for entry_id, _, item in store.scan()])
+        index_ms = (timeit.default_timer() - started) * 1000
+
+        file_kb = os.path.getsize(path) / 1024
+    print(f"{entries:>8} {file_kb:>10.0f} {load_ms:>9.1f} {heap_kb:>9.0f} {lookup_us:>10.2f} {index_ms:>10.1f}")
+
+if __name__ == '__main__':
+    print(f"{'entries':>8} {'file KiB':>10} {'load ms':>9} {'heap KiB':>9} {'get us':>10} {'index ms':>10}")
+    for size in (100, 1000, 10000, 50000):
+        measure(size)
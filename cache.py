@@ -0,0 +1,357 @@
+"""Caching helpers shared by the application services."""
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Lookup statuses returned by TTLCache.get
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+
+class TTLCache:
+    """
+    Thread-safe, bounded LRU cache whose entries expire after a TTL.
+
+    Entries past their TTL are kept for a further ``stale_ttl`` seconds so a
+    caller can keep serving them while a single refresh runs in the background
+    (stale-while-revalidate). Once the stale window has passed they are dropped.
+    """
+
+    def __init__(self, max_entries=1024, ttl=600, stale_ttl=0):
+        """
+        Args:
+            max_entries (int): Maximum number of entries before LRU eviction
+            ttl (float): Seconds an entry is considered fresh
+            stale_ttl (float): Extra seconds an expired entry may still be served
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            tuple: (value, status) where status is CACHE_HIT, CACHE_STALE or CACHE_MISS
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, CACHE_MISS
+
+            value, expires_at = entry
+            if now < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, CACHE_HIT
+
+            if now < expires_at + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return value, CACHE_STALE
+
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None, CACHE_MISS
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: The cache key
+            value: The value to store
+            ttl (float, optional): Override the default TTL for this entry
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove a key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Get a snapshot of the cache counters.
+
+        Returns:
+            dict: Hit, stale hit, miss, eviction and expiration counts plus current size
+        """
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0
+            }
+
+class SQLiteCache:
+    """
+    JSON value cache stored in a local SQLite database in WAL mode.
+
+    Every process opening the same file shares the entries, and they survive
+    restarts. Like TTLCache, expired entries are served as stale for a further
+    ``stale_ttl`` seconds. Expiry times are wall-clock so they stay valid across
+    processes.
+    """
+
+    # Purge fully expired rows after this many writes
+    PURGE_INTERVAL = 500
+
+    def __init__(self, path, ttl=600, stale_ttl=0):
+        """
+        Args:
+            path (str): Path of the SQLite database file (created if missing)
+            ttl (float): Seconds an entry is considered fresh
+            stale_ttl (float): Extra seconds an expired entry may still be served
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, key):
+        """
+        Look up a key, also reporting how long the entry stays fresh.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            tuple: (value, status, seconds until expiry) where status is CACHE_HIT,
+                CACHE_STALE or CACHE_MISS
+        """
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        remaining = row[1] - time.time() if row else 0.0
+
+        with self._lock:
+            if row is None or remaining <= -self.stale_ttl:
+                self.misses += 1
+                return None, CACHE_MISS, 0.0
+            if remaining > 0:
+                self.hits += 1
+                status = CACHE_HIT
+            else:
+                self.stale_hits += 1
+                status = CACHE_STALE
+        return json.loads(row[0]), status, remaining
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            tuple: (value, status) where status is CACHE_HIT, CACHE_STALE or CACHE_MISS
+        """
+        value, status, _ = self.lookup(key)
+        return value, status
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            key (str): The cache key
+            value: The value to store
+            ttl (float, optional): Override the default TTL for this entry
+        """
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires_at)
+        )
+        conn.commit()
+
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.PURGE_INTERVAL == 0
+        if purge:
+            self.purge_expired()
+
+    def delete(self, key):
+        """Remove a key if present."""
+        conn = self._connection()
+        conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        conn.commit()
+
+    def purge_expired(self):
+        """
+        Delete entries that are past their stale window.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        conn = self._connection()
+        cursor = conn.execute(
+            "DELETE FROM cache_entries WHERE expires_at < ?", (time.time() - self.stale_ttl,)
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def stats(self):
+        """
+        Get a snapshot of this process's counters and the shared entry count.
+
+        Returns:
+            dict: Hit, stale hit and miss counts plus current size
+        """
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0
+            }
+        stats['size'] = len(self)
+        return stats
+
+class _Call:
+    """An in-flight call whose result is shared by every waiting caller."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for it and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` once per key among concurrent callers.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn (callable): The function to run
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self, key):
+        """Return True if a call for the key is currently running."""
+        with self._lock:
+            return key in self._calls
+
+    def stats(self):
+        """
+        Get coalescing counters.
+
+        Returns:
+            dict: Number of executed calls, calls that shared a result and calls in flight
+        """
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'shared': self.shared,
+                'in_flight': len(self._calls)
+            }
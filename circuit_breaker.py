@@ -0,0 +1,142 @@
+"""Circuit breaker for calls to external services."""
+import time
+import logging
+import threading
+from collections import deque
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    Track the error rate of an upstream service and stop calling it while it is failing.
+
+    The breaker opens when, within the rolling window, at least ``min_requests``
+    calls were made and the failure ratio reached ``failure_rate``. While open,
+    ``allow_request`` returns False so callers can serve a fallback straight
+    away. After ``reset_timeout`` seconds a single probe call is let through
+    (half-open). Its success closes the circuit; its failure re-opens it.
+
+    Every call that ``allow_request`` admits must be followed by exactly one
+    ``record_success``, ``record_failure`` or ``cancel``.
+    """
+
+    def __init__(self, name, failure_rate=0.5, min_requests=10, window=60, reset_timeout=30):
+        """
+        Args:
+            name (str): Name used in logs and stats
+            failure_rate (float): Failure ratio (0-1) in the window that opens the circuit
+            min_requests (int): Minimum calls in the window before the ratio is considered
+            window (float): Length of the rolling window in seconds
+            reset_timeout (float): Seconds to stay open before allowing a probe
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._outcomes = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow_request(self):
+        """
+        Check whether a call may be made now.
+
+        Returns:
+            bool: True if the call may proceed, False if the caller should fall back
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit '{self.name}' half-open; probing upstream")
+
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a call that reached the upstream and got a usable answer."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._close()
+                return
+            self._record(True)
+
+    def record_failure(self):
+        """Record a call that failed because the upstream is slow, unreachable or erroring."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+            total = len(self._outcomes)
+            if self.state == CLOSED and total >= self.min_requests and self._failures / total >= self.failure_rate:
+                self._open()
+
+    def cancel(self):
+        """Give back an admitted call that was dropped before it reached the upstream."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def stats(self):
+        """
+        Get the breaker state and counters.
+
+        Returns:
+            dict: State, calls and failures in the window, rejected calls and times opened
+        """
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                'state': self.state,
+                'window_requests': len(self._outcomes),
+                'window_failures': self._failures,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened
+            }
+
+    def _record(self, ok):
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        if not ok:
+            self._failures += 1
+        self._trim(now)
+
+    def _trim(self, now):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.warning(f"Circuit '{self.name}' opened; serving fallbacks for {self.reset_timeout}s")
+
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        self._probe_in_flight = False
+        logger.info(f"Circuit '{self.name}' closed; upstream recovered")
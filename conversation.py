@@ -0,0 +1,135 @@
+"""Session-aware conversation context for chat prompts, kept within a token budget."""
+import os
+import re
+import math
+import logging
+from cache import TTLCache
+from database import db, ChatMessage
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Conversation context configuration
+CHAT_CONTEXT_ENABLED = os.environ.get("CHAT_CONTEXT_ENABLED", "true").lower() in ("1", "true", "yes")
+# Tokens of history (summary plus recent turns) added to each prompt
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.environ.get("CHAT_CONTEXT_TOKEN_BUDGET", "1200"))
+# Part of the budget reserved for the rolling summary of older turns
+CHAT_SUMMARY_TOKEN_BUDGET = int(os.environ.get("CHAT_SUMMARY_TOKEN_BUDGET", "300"))
+# Most recent turns sent verbatim
+CHAT_CONTEXT_MAX_TURNS = int(os.environ.get("CHAT_CONTEXT_MAX_TURNS", "6"))
+# Turns read from the database when a session has no cached summary
+CHAT_CONTEXT_HISTORY_TURNS = int(os.environ.get("CHAT_CONTEXT_HISTORY_TURNS", "20"))
+CHAT_SUMMARY_TTL = float(os.environ.get("CHAT_SUMMARY_TTL", "86400"))
+CHAT_SUMMARY_MAX_SESSIONS = int(os.environ.get("CHAT_SUMMARY_MAX_SESSIONS", "10000"))
+
+# Words kept from each side of a turn when it is folded into the summary
+SUMMARY_GIST_WORDS = 25
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_MARKUP = re.compile(r"[*_#`>•]+")
+
+# session_id -> {'through_id': last ChatMessage.id folded in, 'lines': summary lines}
+summary_cache = TTLCache(max_entries=CHAT_SUMMARY_MAX_SESSIONS, ttl=CHAT_SUMMARY_TTL)
+
+def estimate_tokens(text):
+    """
+    Estimate the number of model tokens in a text (about four characters per token).
+
+    Args:
+        text (str): The text
+
+    Returns:
+        int: Estimated token count
+    """
+    return math.ceil(len(text) / 4)
+
+def _gist(text):
+    """Shorten a message to its first sentence, capped at SUMMARY_GIST_WORDS words."""
+    text = " ".join(_MARKUP.sub(" ", text).split())
+    sentence = _SENTENCE_END.split(text, maxsplit=1)[0]
+    words = sentence.split()
+    if len(words) > SUMMARY_GIST_WORDS:
+        return " ".join(words[:SUMMARY_GIST_WORDS]) + "..."
+    return sentence
+
+def summarize_turn(turn):
+    """
+    Compress a chat turn into one summary line.
+
+    Args:
+        turn (ChatMessage): A stored chat turn
+
+    Returns:
+        str: "Farmer asked: ... Assistant: ..."
+    """
+    return f"Farmer asked: {_gist(turn.user_message)} Assistant: {_gist(turn.bot_response)}"
+
+def _turn_tokens(turn):
+    return estimate_tokens(turn.user_message) + estimate_tokens(turn.bot_response)
+
+def _fold(state, turns):
+    """Add turns to a summary state, dropping the oldest lines beyond the summary budget."""
+    lines = state['lines'] + [summarize_turn(turn) for turn in turns]
+    while lines and sum(estimate_tokens(line) for line in lines) > CHAT_SUMMARY_TOKEN_BUDGET:
+        lines.pop(0)
+    return {'through_id': turns[-1].id, 'lines': lines}
+
+def build_context(session_id):
+    """
+    Assemble earlier turns of a session as chat messages for the model.
+
+    The newest turns that fit the budget are sent verbatim. Turns that fall
+    out of that window are folded once into a rolling summary cached per
+    session, so each request only reads turns newer than the summary.
+
+    Args:
+        session_id (str): The chat session ID
+
+    Returns:
+        list: OpenAI chat messages (a summary system message, then user/assistant pairs),
+        empty if the session has no history
+    """
+    if not CHAT_CONTEXT_ENABLED or not session_id:
+        return []
+
+    state, _ = summary_cache.get(session_id)
+    state = state or {'through_id': 0, 'lines': []}
+    try:
+        turns = db.session.execute(
+            db.select(ChatMessage)
+            .where(ChatMessage.session_id == session_id, ChatMessage.id > state['through_id'])
+            .order_by(ChatMessage.id.desc())
+            .limit(CHAT_CONTEXT_HISTORY_TURNS)
+        ).scalars().all()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error loading conversation history: {e}")
+        return []
+    turns.reverse()
+
+    # Keep the newest turns that fit next to the summary; fold the rest into it
+    budget = CHAT_CONTEXT_TOKEN_BUDGET - CHAT_SUMMARY_TOKEN_BUDGET
+    recent = []
+    for turn in reversed(turns):
+        tokens = _turn_tokens(turn)
+        if len(recent) >= CHAT_CONTEXT_MAX_TURNS or tokens > budget:
+            break
+        budget -= tokens
+        recent.insert(0, turn)
+
+    older = turns[:len(turns) - len(recent)]
+    if older:
+        state = _fold(state, older)
+        summary_cache.set(session_id, state)
+
+    messages = []
+    if state['lines']:
+        messages.append({
+            "role": "system",
+            "content": "Summary of the earlier conversation:\n" + "\n".join(state['lines'])
+        })
+    for turn in recent:
+        messages.append({"role": "user", "content": turn.user_message})
+        messages.append({"role": "assistant", "content": turn.bot_response})
+    return messages
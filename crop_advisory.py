@@ -0,0 +1,382 @@
+"""Crop-specific weather advice from an index precomputed over every combination of weather conditions."""
+import os
+import re
+import math
+import bisect
+import logging
+from datetime import datetime
+import numpy as np
+import farming_data
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Crops with advice listed per weather response, in catalogue order
+CROP_ADVISORIES_MAX_CROPS = int(os.environ.get("CROP_ADVISORIES_MAX_CROPS", "20"))
+
+# Condition dimensions: (upper band edges, band names). A value falls in the first
+# band whose edge it does not exceed, e.g. 35°C is 'warm' and 35.5°C is 'hot'.
+CONDITION_BANDS = {
+    "temp": ((2, 10, 20, 35), ("frost", "cold", "mild", "warm", "hot")),
+    "humidity": ((30, 80), ("dry", "moderate", "humid")),
+    "rain_24h": ((0, 10), ("none", "light", "heavy")),      # mm in the next 24 hours
+    "rain_72h": ((0, 25), ("none", "light", "heavy")),      # mm in the next 72 hours
+    "wind": ((5, 10), ("calm", "windy", "strong"))          # m/s
+}
+DIMENSIONS = (*CONDITION_BANDS, "month")
+
+# 3-hour forecast slots in the rain windows
+RAIN_WINDOWS = {"rain_24h": 8, "rain_72h": 24}
+
+# Each rule fires for a crop when every condition in 'when' holds and the crop
+# profile has a truthy value for 'requires'.
+#   when:     condition dimension -> allowed band names; 'month' is instead
+#             'season' (a month of the crop's growing season) or 'sowing'
+#   requires: profile key the crop must have (see crop_profile)
+#   message:  formatted with the crop profile
+CROP_ADVISORY_RULES = [
+    {
+        "when": {"month": "sowing", "rain_24h": ["none", "light"]},
+        "requires": "sowing_technique",
+        "message": "Sowing time for {crop}: {sowing_technique}."
+    },
+    {
+        "when": {"month": "sowing", "rain_24h": ["heavy"]},
+        "message": "Heavy rain due in the next 24 hours: delay sowing {crop} until the field drains."
+    },
+    {
+        "when": {"month": "season", "rain_72h": ["none"], "temp": ["warm", "hot"]},
+        "requires": "needs_water",
+        "message": "No rain expected for 3 days and {crop} has {water_level} water needs: {water_advice}."
+    },
+    {
+        "when": {"month": "season", "rain_72h": ["heavy"]},
+        "requires": "waterlogging_sensitive",
+        "message": "Heavy rain expected over 3 days: clear field drains around {crop} and skip irrigation to avoid waterlogging."
+    },
+    {
+        "when": {"month": "season", "humidity": ["humid"], "temp": ["mild", "warm"]},
+        "requires": "fungal_issues",
+        "message": "Humid weather favours {fungal_issues} in {crop}: scout the crop and apply a protective spray if symptoms appear."
+    },
+    {
+        "when": {"month": "season", "wind": ["calm"], "rain_24h": ["none"]},
+        "requires": "pests",
+        "message": "Calm, dry weather is a good window to spray {crop} against {pests} if needed."
+    },
+    {
+        "when": {"month": "season", "wind": ["windy", "strong"]},
+        "requires": "pests",
+        "message": "Too windy to spray {crop}: postpone treatments against {pests}."
+    },
+    {
+        "when": {"month": "season", "rain_24h": ["heavy"]},
+        "requires": "fertilizer_technique",
+        "message": "Heavy rain due in the next 24 hours: for {crop}, wait until it passes to {fertilizer_technique}."
+    },
+    {
+        "when": {"month": "season", "temp": ["hot"]},
+        "message": "Temperatures above 35°C stress {crop}: irrigate in the early morning or evening and avoid midday field work."
+    },
+    {
+        "when": {"month": "season", "temp": ["frost"]},
+        "message": "Frost risk for {crop}: irrigate lightly in the evening and cover seedlings overnight."
+    },
+    {
+        "when": {"month": "season", "temp": ["cold"]},
+        "requires": "warm_season",
+        "message": "Temperatures below 10°C slow the growth of {crop}, a warm-season crop: protect young plants and avoid irrigating on cold nights."
+    }
+]
+
+_MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_MONTH = r"(" + "|".join(_MONTH_NAMES) + r")[a-z]*\.?"
+_MONTH_RANGE = re.compile(_MONTH + r"\s*(?:to|-|–)\s*" + _MONTH, re.IGNORECASE)
+
+# Named Indian cropping seasons as (first month, last month)
+_SEASON_NAMES = {"kharif": (6, 10), "monsoon": (6, 9), "rabi": (10, 3), "zaid": (3, 6)}
+
+_WATER_LEVEL = re.compile(r"^\s*(high|moderate|medium|low)", re.IGNORECASE)
+_WATERLOGGING = re.compile(r"waterlog|excess moisture", re.IGNORECASE)
+_FUNGAL = re.compile(r"blast|rust|mildew|blight|\brot\b|wilt|smut|spot|mou?ld|anthracnose", re.IGNORECASE)
+_PESTS = re.compile(r"borer|hopper|aphid|worm|pest|fly|jassid|mite|thrip|weevil|caterpillar|locust|bug", re.IGNORECASE)
+_WATER_TECHNIQUE = re.compile(r"irrigat|water", re.IGNORECASE)
+_FERTILIZER_TECHNIQUE = re.compile(r"fertili[sz]|npk|potassium|phosph|nitrogen|urea|manure", re.IGNORECASE)
+_SOWING_TECHNIQUES = (re.compile(r"sow", re.IGNORECASE), re.compile(r"seed|transplant|germinat", re.IGNORECASE))
+
+def _month_span(first, last):
+    """Months from first to last inclusive, wrapping past December."""
+    return [(first - 1 + offset) % 12 + 1 for offset in range((last - first) % 12 + 1)]
+
+def _month_ranges(text):
+    return [
+        (_MONTH_NAMES.index(first[:3].lower()) + 1, _MONTH_NAMES.index(last[:3].lower()) + 1)
+        for first, last in _MONTH_RANGE.findall(text)
+    ]
+
+def parse_season(text):
+    """
+    Read the growing months from a free-text season description.
+
+    Explicit month ranges ("June to September", "Nov-Dec") take precedence over
+    season names ("Kharif", "Rabi").
+
+    Args:
+        text (str): e.g. "Winter crop (October to April)"
+
+    Returns:
+        tuple: (set of growing months, set of months a season starts in); every
+        month and no start month if the text names no months or seasons
+    """
+    ranges = _month_ranges(text) or [
+        span for season, span in _SEASON_NAMES.items() if re.search(season, text, re.IGNORECASE)
+    ]
+    if not ranges:
+        return set(range(1, 13)), set()
+    months = set()
+    for first, last in ranges:
+        months.update(_month_span(first, last))
+    return months, {first for first, _ in ranges}
+
+def _first_match(pattern, texts):
+    return next((text for text in texts if pattern.search(text)), None)
+
+def _fragment(text):
+    """Lower-case the first letter of a technique so it reads inside a sentence."""
+    if text and not text[1:2].isupper():
+        return text[0].lower() + text[1:]
+    return text
+
+def _join(names):
+    names = [name.lower() for name in names]
+    return names[0] if len(names) == 1 else ", ".join(names[:-1]) + " and " + names[-1]
+
+def crop_profile(item):
+    """
+    Derive the facts advice rules need from a crop entry.
+
+    Args:
+        item (dict): A crop entry from the farming knowledge base
+
+    Returns:
+        dict: Crop name and short name, text used in messages, season and sowing months, and
+        flags such as 'needs_water' and 'waterlogging_sensitive'
+    """
+    growing_season = item.get("growing_season", "")
+    water_requirements = item.get("water_requirements", "")
+    techniques = [str(technique) for technique in item.get("techniques", [])]
+    issues = [str(issue) for issue in item.get("common_issues", [])]
+
+    season, sowing = parse_season(growing_season)
+    sowing_technique = next(
+        (match for match in (_first_match(pattern, techniques) for pattern in _SOWING_TECHNIQUES) if match), None
+    )
+    if sowing_technique and _month_ranges(sowing_technique):
+        sowing = {month for first, last in _month_ranges(sowing_technique) for month in _month_span(first, last)}
+
+    level = _WATER_LEVEL.match(water_requirements)
+    water_level = level.group(1).lower() if level else ""
+    water_technique = _first_match(_WATER_TECHNIQUE, techniques)
+    fertilizer_technique = _first_match(_FERTILIZER_TECHNIQUE, techniques)
+    fungal = [issue for issue in issues if _FUNGAL.search(issue)]
+    pests = [issue for issue in issues if _PESTS.search(issue) and issue not in fungal]
+
+    return {
+        "name": item["name"],
+        "crop": item["name"].split(" (")[0],
+        "season_months": season,
+        "sowing_months": sowing,
+        "water_level": water_level,
+        "needs_water": water_level in ("high", "moderate", "medium"),
+        "water_advice": _fragment(water_technique) if water_technique else "plan irrigation",
+        "waterlogging_sensitive": bool(_WATERLOGGING.search(water_requirements)) or (
+            "well-drained" in item.get("soil_requirements", "").lower() and water_level != "high"
+        ),
+        "warm_season": not season & {12, 1},
+        "fungal_issues": _join(fungal) if fungal else "",
+        "pests": _join(pests) if pests else "",
+        "sowing_technique": _fragment(sowing_technique) if sowing_technique else "",
+        "fertilizer_technique": _fragment(fertilizer_technique) if fertilizer_technique else ""
+    }
+
+def _validate(rules):
+    for index, rule in enumerate(rules):
+        for dimension, allowed in rule["when"].items():
+            if dimension == "month":
+                if allowed not in ("season", "sowing"):
+                    raise ValueError(f"Rule {index}: month must be 'season' or 'sowing', not {allowed!r}")
+            elif dimension not in CONDITION_BANDS:
+                raise ValueError(f"Rule {index}: unknown condition {dimension!r}")
+            elif set(allowed) - set(CONDITION_BANDS[dimension][1]):
+                raise ValueError(f"Rule {index}: unknown {dimension} band in {allowed!r}")
+
+class CropAdvisoryIndex:
+    """
+    Crop-specific advice for every combination of weather condition bands.
+
+    The condition space (temperature, humidity, rain in the next 24 and 72
+    hours, wind and month) is small enough to enumerate up front. Each
+    combination is a bucket, and for every crop the advice of every bucket is
+    stored as a small integer into that crop's table of distinct advice lists.
+    Serving a weather response only computes the bucket and reads one cell per
+    crop.
+    """
+
+    def __init__(self, crops, rules=CROP_ADVISORY_RULES):
+        """
+        Args:
+            crops (list): (entry ID, crop entry) pairs
+            rules (list): Rule dicts in the CROP_ADVISORY_RULES format
+
+        Raises:
+            ValueError: If a rule uses an unknown condition or band
+        """
+        _validate(rules)
+        self.shape = tuple(len(names) for _, names in CONDITION_BANDS.values()) + (12,)
+        grid = dict(zip(DIMENSIONS, np.indices(self.shape).reshape(len(self.shape), -1)))
+        months = grid["month"] + 1
+
+        # Weather part of each rule, shared by every crop
+        weather_masks = []
+        for rule in rules:
+            mask = np.ones(grid["month"].shape, dtype=bool)
+            for dimension, allowed in rule["when"].items():
+                if dimension != "month":
+                    names = CONDITION_BANDS[dimension][1]
+                    mask &= np.isin(grid[dimension], [names.index(name) for name in allowed])
+            weather_masks.append(mask)
+
+        self.crops = []
+        self.tables = []
+        self.advice_ids = np.zeros((len(crops), grid["month"].size), dtype=np.uint16)
+        for row, (entry_id, item) in enumerate(crops):
+            profile = crop_profile(item)
+            codes = np.zeros(grid["month"].size, dtype=np.int64)
+            messages = []
+            for rule, mask in zip(rules, weather_masks):
+                if rule.get("requires") and not profile[rule["requires"]]:
+                    continue
+                period = rule["when"].get("month")
+                if period:
+                    mask = mask & np.isin(months, sorted(profile[f"{period}_months"]))
+                codes |= mask.astype(np.int64) << len(messages)
+                messages.append(rule["message"].format(**profile))
+            distinct, self.advice_ids[row] = np.unique(codes, return_inverse=True)
+            self.tables.append([
+                [message for bit, message in enumerate(messages) if int(code) >> bit & 1]
+                for code in distinct
+            ])
+            self.crops.append((entry_id, profile["name"]))
+
+    def bucket(self, conditions):
+        """
+        Find the bucket of a set of weather conditions.
+
+        Values beyond the outer band edges fall in the outermost bands.
+
+        Args:
+            conditions (dict): 'temp', 'humidity', 'rain_24h', 'rain_72h', 'wind' and 'month'
+
+        Returns:
+            int: The bucket number
+
+        Raises:
+            ValueError: If a condition is missing or not a number, or the month is not 1-12
+        """
+        bands = []
+        for dimension, (edges, _) in CONDITION_BANDS.items():
+            value = conditions.get(dimension)
+            # NaN compares false with every edge, so bisect would file it in the lowest band
+            if not isinstance(value, (int, float)) or math.isnan(value):
+                raise ValueError(f"{dimension} is missing or not a number: {value!r}")
+            bands.append(bisect.bisect_left(edges, value))
+        month = conditions.get("month")
+        if month not in range(1, 13):
+            raise ValueError(f"month must be 1-12, not {month!r}")
+        return int(np.ravel_multi_index((*bands, int(month) - 1), self.shape))
+
+    def lookup(self, bucket, limit=None):
+        """
+        Get the advice for every crop in a bucket.
+
+        Args:
+            bucket (int): Bucket number from bucket()
+            limit (int): Maximum number of crops to return
+
+        Returns:
+            list: {'id', 'crop', 'advice'} for each crop with advice, in catalogue order
+        """
+        results = []
+        for (entry_id, name), table, advice_id in zip(self.crops, self.tables, self.advice_ids[:, bucket]):
+            advice = table[advice_id]
+            if advice:
+                results.append({'id': entry_id, 'crop': name, 'advice': advice})
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def describe(self, bucket):
+        """
+        Name the condition bands of a bucket.
+
+        Args:
+            bucket (int): Bucket number from bucket()
+
+        Returns:
+            dict: Band name per condition, plus the month number
+        """
+        bands = np.unravel_index(bucket, self.shape)
+        described = {dimension: names[band] for (dimension, (_, names)), band in zip(CONDITION_BANDS.items(), bands)}
+        described["month"] = int(bands[-1]) + 1
+        return described
+
+def _build_index():
+    knowledge = farming_data.knowledge
+    return CropAdvisoryIndex(list(zip(knowledge.ids("crops"), knowledge.entries("crops"))))
+
+def get_index():
+    """Return the crop advisory index, rebuilt once after each reload of the farming data."""
+    return farming_data.knowledge.derived("crop_advisory_index", _build_index)
+
+def conditions_for(current_data, forecast_columns, month=None):
+    """
+    Extract the conditions the index is keyed on from one location's weather.
+
+    Args:
+        current_data (dict): Current weather data from the API
+        forecast_columns (dict): The location's forecast from forecast.forecast_columns
+        month (int, optional): Month to advise for (defaults to now)
+
+    Returns:
+        dict: Current temperature, humidity and wind, forecast rain totals and the month
+    """
+    rain = forecast_columns["rain"]
+    conditions = {
+        "temp": current_data["main"]["temp"],
+        "humidity": current_data["main"]["humidity"],
+        "wind": current_data["wind"]["speed"],
+        "month": month or datetime.now().month
+    }
+    for name, slots in RAIN_WINDOWS.items():
+        conditions[name] = float(sum(rain[:slots]))
+    return conditions
+
+def advise(current_data, forecast_columns, month=None):
+    """
+    Get crop-specific advice for one location's weather.
+
+    Args:
+        current_data (dict): Current weather data from the API
+        forecast_columns (dict): The location's forecast from forecast.forecast_columns
+        month (int, optional): Month to advise for (defaults to now)
+
+    Returns:
+        list: {'id', 'crop', 'advice'} for up to CROP_ADVISORIES_MAX_CROPS crops
+    """
+    index = get_index()
+    bucket = index.bucket(conditions_for(current_data, forecast_columns, month))
+    return index.lookup(bucket, CROP_ADVISORIES_MAX_CROPS)
+
+# Build the index at startup rather than on the first weather request
+get_index()
@@ -10,7 +10,7 @@ class ChatMessage(db.Model):
     __tablename__ = 'chat_messages'
     
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.String(100), nullable=False)
+    session_id = db.Column(db.String(100), nullable=False, index=True)
     user_message = db.Column(db.Text, nullable=False)
     bot_response = db.Column(db.Text, nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
@@ -37,4 +37,18 @@ class WeatherRequest(db.Model):
         self.location = location
         self.temperature = temperature
         self.humidity = humidity
-        self.description = description
\ No newline at end of file
+        self.description = description
+
+def create_missing_indexes(engine):
+    """
+    Create declared indexes that are missing from existing tables.
+    
+    db.create_all() skips tables that already exist, so indexes added to a
+    model later (such as chat_messages.session_id) need this on older databases.
+    
+    Args:
+        engine: The SQLAlchemy engine to create the indexes with
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
@@ -1,453 +1,318 @@
-import json
 import os
+import base64
 import logging
+import metrics
+from knowledge_store import KnowledgeStore
+from response_cache import tokenize
+from search_index import SearchIndex
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# In-memory database for farming information
-# This would be replaced by a proper database in a production environment
+# Farming knowledge base: one JSON line per crop, technique, soil practice, scheme and law
+FARMING_DATA_PATH = os.environ.get(
+    "FARMING_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "farming_knowledge.jsonl")
+)
+# Seconds between checks of the data file for changes (0 disables hot reload)
+FARMING_DATA_RELOAD_INTERVAL = float(os.environ.get("FARMING_DATA_RELOAD_INTERVAL", "5"))
+# Entries kept decoded for lookups by ID
+FARMING_DATA_CACHE_ENTRIES = int(os.environ.get("FARMING_DATA_CACHE_ENTRIES", "512"))
 
-# Farming techniques data
-FARMING_TECHNIQUES = {
-    "crops": [
-        {
-            "name": "Rice",
-            "description": "A staple food crop grown in water-logged fields called paddies.",
-            "growing_season": "Primarily during monsoon season (June to September)",
-            "water_requirements": "High - requires flooded conditions for most varieties",
-            "soil_requirements": "Clay soil with good water retention",
-            "techniques": [
-                "Puddle the soil before transplanting",
-                "Maintain water level of 2-5 cm during growth phase",
-                "Control weeds in early stages",
-                "Apply balanced NPK fertilizers"
-            ],
-            "common_issues": [
-                "Blast disease",
-                "Brown plant hopper",
-                "Stem borer",
-                "Bacterial leaf blight"
-            ]
-        },
-        {
-            "name": "Wheat",
-            "description": "One of the world's most important cereal crops used for bread, pasta, and other food products.",
-            "growing_season": "Winter crop (October to April)",
-            "water_requirements": "Moderate - sensitive to both drought and excess moisture",
-            "soil_requirements": "Well-drained loamy soil with neutral pH",
-            "techniques": [
-                "Prepare a fine tilth seedbed",
-                "Opt for timely sowing (Nov-Dec)",
-                "First irrigation at crown root initiation stage",
-                "Follow recommended spacing of 20-22.5 cm between rows"
-            ],
-            "common_issues": [
-                "Rust diseases",
-                "Powdery mildew",
-                "Aphids",
-                "Loose smut"
-            ]
-        },
-        {
-            "name": "Cotton",
-            "description": "An important fiber crop grown for its lint which is used in textile production.",
-            "growing_season": "Summer crop (April to November)",
-            "water_requirements": "Moderate - sensitive to waterlogging",
-            "soil_requirements": "Deep, well-drained black cotton soils or alluvial soils",
-            "techniques": [
-                "Use acid delinted seeds for better germination",
-                "Maintain optimal plant population",
-                "Implement integrated pest management",
-                "Apply potassium for improving fiber quality"
-            ],
-            "common_issues": [
-                "Bollworms",
-                "Sucking pests (jassids, aphids, whitefly)",
-                "Wilt disease",
-                "Cotton leaf curl virus"
-            ]
-        },
-        {
-            "name": "Pulses (Lentils, Chickpeas, Pigeon Peas)",
-            "description": "Leguminous crops that are rich sources of protein and improve soil fertility.",
-            "growing_season": "Varies by type - both Rabi and Kharif seasons",
-            "water_requirements": "Low to moderate - generally drought-resistant",
-            "soil_requirements": "Well-drained loamy soil",
-            "techniques": [
-                "Inoculate seeds with Rhizobium culture",
-                "Apply phosphatic fertilizers",
-                "Control weeds in early stages",
-                "Use trap crops for pest management"
-            ],
-            "common_issues": [
-                "Pod borers",
-                "Wilt",
-                "Root rot",
-                "Yellow mosaic virus"
-            ]
-        }
-    ],
-    "techniques": [
-        {
-            "name": "Organic Farming",
-            "description": "A method of crop and livestock production that avoids the use of synthetic pesticides, fertilizers, growth regulators, and livestock feed additives.",
-            "key_principles": [
-                "Use of organic manures and biofertilizers",
-                "Crop rotation and mixed cropping",
-                "Biological pest control",
-                "Green manuring"
-            ],
-            "benefits": [
-                "Improved soil health and biodiversity",
-                "Reduced pollution",
-                "Potentially better nutritional quality",
-                "Premium pricing for certified organic products"
-            ],
-            "challenges": [
-                "Lower initial yields",
-                "More labor-intensive",
-                "Certification process can be complex",
-                "Limited availability of organic inputs"
-            ]
-        },
-        {
-            "name": "Conservation Agriculture",
-            "description": "Farming system that promotes minimum soil disturbance, permanent soil cover, and diversification of plant species.",
-            "key_principles": [
-                "Minimal or zero tillage",
-                "Permanent soil cover (mulch or cover crops)",
-                "Diverse crop rotations"
-            ],
-            "benefits": [
-                "Reduced soil erosion",
-                "Improved soil structure and health",
-                "Lower production costs",
-                "Better water infiltration and retention"
-            ],
-            "challenges": [
-                "Initial investment in specialized equipment",
-                "Knowledge-intensive",
-                "Weed management can be challenging",
-                "May require changes to traditional farming practices"
-            ]
-        },
-        {
-            "name": "Precision Farming",
-            "description": "An approach where inputs are utilized in precise amounts to get increased average yields compared to traditional cultivation techniques.",
-            "key_principles": [
-                "GPS-guided operations",
-                "Variable rate application of inputs",
-                "Use of sensors and mapping technologies",
-                "Data-driven decision making"
-            ],
-            "benefits": [
-                "Optimized use of inputs",
-                "Reduced environmental impact",
-                "Higher productivity",
-                "Lower costs in the long term"
-            ],
-            "challenges": [
-                "High initial investment",
-                "Requires technical knowledge",
-                "Data management and interpretation",
-                "May not be suitable for small holdings"
-            ]
-        },
-        {
-            "name": "Integrated Farming System",
-            "description": "A mixed farming system that combines crop production with livestock, fishery, poultry, etc. to maximize farm productivity.",
-            "key_principles": [
-                "Efficient resource recycling",
-                "Multiple income sources",
-                "Reduced risk through diversification",
-                "Closed nutrient cycles"
-            ],
-            "benefits": [
-                "Year-round income generation",
-                "Improved resource utilization",
-                "Reduced vulnerability to market fluctuations",
-                "Enhanced food security for the farm family"
-            ],
-            "challenges": [
-                "Complex management",
-                "Requires diverse skills",
-                "Space constraints for small farmers",
-                "Balancing resources among different components"
-            ]
-        }
-    ],
-    "soil_management": [
-        {
-            "name": "Soil Testing",
-            "description": "Scientific analysis of soil samples to determine nutrient content, composition, and other characteristics.",
-            "importance": "Helps in making informed decisions about soil amendments and fertilizer application.",
-            "process": [
-                "Collect soil samples from different parts of the field",
-                "Mix samples to create a composite sample",
-                "Send to a soil testing laboratory",
-                "Interpret results and follow recommendations"
-            ]
-        },
-        {
-            "name": "Crop Rotation",
-            "description": "Practice of growing different types of crops in the same area in sequenced seasons.",
-            "benefits": [
-                "Improves soil structure and fertility",
-                "Helps in controlling pests and diseases",
-                "Reduces soil erosion",
-                "Manages soil nutrients efficiently"
-            ],
-            "examples": [
-                "Cereals followed by legumes",
-                "Deep-rooted crops followed by shallow-rooted ones",
-                "Heavy feeders followed by light feeders"
-            ]
-        },
-        {
-            "name": "Green Manuring",
-            "description": "Growing plants specifically for incorporating into the soil while green to improve soil fertility and structure.",
-            "benefits": [
-                "Adds organic matter to soil",
-                "Improves soil structure",
-                "Adds nitrogen (if leguminous plants are used)",
-                "Suppresses weeds"
-            ],
-            "common_green_manure_crops": [
-                "Sunhemp",
-                "Dhaincha",
-                "Cowpea",
-                "Sesbania"
-            ]
-        }
-    ]
+# Kinds of entry served by get_farming_techniques
+TECHNIQUE_CATEGORIES = ("crops", "techniques", "soil_management")
+
+knowledge = KnowledgeStore(
+    FARMING_DATA_PATH,
+    reload_interval=FARMING_DATA_RELOAD_INTERVAL,
+    cache_entries=FARMING_DATA_CACHE_ENTRIES
+)
+metrics.register_stats("farming_knowledge", "Farming knowledge store generation, size and reload counters", knowledge.stats)
+
+# Search index over the text of every entry (keys are not indexed)
+SEARCH_FIELD_WEIGHTS = {'name': 3.0, 'description': 1.5, 'details': 1.0}
+
+# Result group of each kind of entry
+SEARCH_GROUPS = {
+    'crops': 'techniques',
+    'techniques': 'techniques',
+    'soil_management': 'techniques',
+    'schemes': 'schemes',
+    'laws': 'laws'
 }
 
-# Government schemes data
-GOVERNMENT_SCHEMES = [
-    {
-        "name": "Pradhan Mantri Kisan Samman Nidhi (PM-KISAN)",
-        "description": "A central sector scheme to provide income support to all landholding farmers' families in the country.",
-        "benefits": "Rs. 6,000 per year transferred directly to farmers' bank accounts in three equal installments.",
-        "eligibility": "All landholding farmers' families with cultivable land, subject to certain exclusions.",
-        "how_to_apply": "Apply online through PM-KISAN portal or through Common Service Centers.",
-        "documents_required": [
-            "Aadhaar Card",
-            "Land Records",
-            "Bank Account Details"
-        ]
-    },
-    {
-        "name": "Pradhan Mantri Fasal Bima Yojana (PMFBY)",
-        "description": "A crop insurance scheme that provides comprehensive risk coverage for crops against non-preventable natural risks.",
-        "benefits": "Comprehensive risk insurance for pre-sowing to post-harvest losses due to natural calamities.",
-        "eligibility": "All farmers, including sharecroppers and tenant farmers, growing notified crops.",
-        "how_to_apply": "Through banks at the time of taking crop loans or directly through insurance companies.",
-        "documents_required": [
-            "Land Records/Tenant Agreement",
-            "Bank Account Details",
-            "Aadhaar Card",
-            "Sowing Certificate"
-        ]
-    },
-    {
-        "name": "Kisan Credit Card (KCC)",
-        "description": "A scheme that provides farmers with affordable credit for cultivation and other needs.",
-        "benefits": [
-            "Short-term loans for cultivation at subsidized interest rates",
-            "Flexible repayment options",
-            "Coverage for post-harvest expenses",
-            "Insurance coverage for KCC holders"
-        ],
-        "eligibility": "All farmers, sharecroppers, tenant farmers, and SHGs of farmers.",
-        "how_to_apply": "Apply at nearest bank branch or through online banking portals.",
-        "documents_required": [
-            "Land Records/Tenant Agreement",
-            "Identity Proof",
-            "Address Proof",
-            "Passport Size Photographs"
-        ]
-    },
-    {
-        "name": "Pradhan Mantri Krishi Sinchayee Yojana (PMKSY)",
-        "description": "A scheme to ensure access to protective irrigation to all agricultural farms in the country.",
-        "benefits": [
-            "Improved water use efficiency",
-            "Precision irrigation technologies",
-            "Sustainable water conservation practices",
-            "Enhanced crop productivity"
-        ],
-        "eligibility": "All farmers with focus on small and marginal farmers.",
-        "how_to_apply": "Through State Agriculture/Irrigation Departments or their online portals.",
-        "documents_required": [
-            "Land Records",
-            "Identity Proof",
-            "Bank Account Details",
-            "Water Source Details"
-        ]
-    },
-    {
-        "name": "National Mission for Sustainable Agriculture (NMSA)",
-        "description": "A scheme to promote sustainable agriculture through climate change adaptation measures.",
-        "benefits": [
-            "Financial assistance for adopting sustainable agriculture practices",
-            "Support for organic farming",
-            "Soil health management",
-            "Water conservation technologies"
-        ],
-        "eligibility": "All farmers with preference to small and marginal farmers.",
-        "how_to_apply": "Through State Agriculture Departments or Krishi Vigyan Kendras.",
-        "documents_required": [
-            "Land Records",
-            "Identity Proof",
-            "Bank Account Details",
-            "Project Proposal (if applicable)"
-        ]
+def _flatten_text(value):
+    if isinstance(value, list):
+        return "; ".join(_flatten_text(item) for item in value)
+    if isinstance(value, dict):
+        return "; ".join(_flatten_text(item) for item in value.values())
+    return str(value)
+
+def search_fields(item):
+    """
+    Split an entry into the text fields that are searched and quoted.
+    
+    Args:
+        item (dict): A crop, technique, scheme or law entry
+        
+    Returns:
+        dict: 'name', 'description' and 'details' (every other value, flattened) as text
+    """
+    details = {key: value for key, value in item.items() if key not in ('name', 'description')}
+    return {
+        'name': item['name'],
+        'description': item.get('description', ''),
+        'details': _flatten_text(details)
     }
-]
 
-# Farming laws and regulations data
-FARMING_LAWS = [
-    {
-        "name": "Land Reforms Laws",
-        "description": "Laws related to land ceiling, tenancy reforms, and distribution of agricultural land.",
-        "key_provisions": [
-            "Ceiling on land holdings",
-            "Protection of tenants' rights",
-            "Prohibition of leasing in some states",
-            "Land consolidation provisions"
-        ],
-        "implications_for_farmers": "Affects land ownership, tenancy arrangements, and land transfers."
-    },
-    {
-        "name": "Seed Laws",
-        "description": "Laws governing the quality, production, and distribution of seeds.",
-        "key_provisions": [
-            "Seed certification requirements",
-            "Quality standards for seeds",
-            "Registration of seed varieties",
-            "Penalties for selling substandard seeds"
-        ],
-        "implications_for_farmers": "Ensures access to quality seeds but may restrict use of farm-saved seeds in some cases."
-    },
-    {
-        "name": "Pesticide Regulations",
-        "description": "Laws governing the manufacture, sale, and use of pesticides in agriculture.",
-        "key_provisions": [
-            "Registration of pesticides",
-            "Safety standards for pesticide use",
-            "Licensing for pesticide dealers",
-            "Ban on hazardous pesticides"
-        ],
-        "implications_for_farmers": "Ensures safety in pesticide use but requires compliance with usage guidelines."
-    },
-    {
-        "name": "Water Laws",
-        "description": "Laws related to irrigation water use, groundwater extraction, and water conservation.",
-        "key_provisions": [
-            "Regulation of groundwater extraction",
-            "Water user associations",
-            "Charges for irrigation water",
-            "Rainwater harvesting mandates"
-        ],
-        "implications_for_farmers": "Affects access to water resources and costs for irrigation."
-    },
-    {
-        "name": "Environmental Laws",
-        "description": "Laws related to environmental protection that impact farming practices.",
-        "key_provisions": [
-            "Restrictions on stubble burning",
-            "Regulations on chemical use near water bodies",
-            "Protection of wetlands and forests",
-            "Environmental impact assessment for large-scale farming"
-        ],
-        "implications_for_farmers": "May require changes in traditional farming practices to reduce environmental impact."
+def _search_document(entry_id, kind, item):
+    return {
+        'id': entry_id,
+        'kind': kind,
+        'title_terms': frozenset(tokenize(item['name'])),
+        'fields': search_fields(item)
     }
-]
 
-def get_farming_techniques(category="all"):
+def build_search_documents():
+    """
+    Turn the farming data into search documents.
+    
+    Documents carry the entry ID rather than the entry, which is looked up
+    in the knowledge store when a result is returned.
+    
+    Returns:
+        list: One document per crop, technique, soil practice, scheme and law
+    """
+    return [_search_document(entry_id, kind, item) for entry_id, kind, item in knowledge.scan()]
+
+def get_search_index():
+    """
+    Get the search index over the current farming data.
+    
+    Returns:
+        SearchIndex: The index, rebuilt after the data file is reloaded
+    """
+    return knowledge.derived(
+        'search_index',
+        lambda: SearchIndex(build_search_documents(), field_weights=SEARCH_FIELD_WEIGHTS)
+    )
+
+def get_entry(entry_id):
+    """
+    Look up one farming entry.
+    
+    Args:
+        entry_id (str): The entry ID, e.g. "crops:rice"
+        
+    Returns:
+        dict: The entry, or None if there is no such entry
+    """
+    return knowledge.get(entry_id)
+
+def parse_fields(fields):
+    """
+    Parse a comma-separated list of entry fields.
+    
+    Args:
+        fields (str): e.g. "name,description"
+        
+    Returns:
+        tuple: The field names, sorted and without duplicates, or None to keep every field
+    """
+    if not fields:
+        return None
+    names = sorted({name.strip() for name in fields.split(',') if name.strip()})
+    return tuple(names) or None
+
+def encode_cursor(entry_id):
+    """Encode the ID of the last entry on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(entry_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+
+def _field_names():
+    """Map each kind of entry to the set of fields its entries have."""
+    names = {}
+    for _, kind, item in knowledge.scan():
+        names.setdefault(kind, set()).update(item)
+    return names
+
+def _list_order(kinds):
+    """
+    Get the listing order of some kinds of entries, built once per generation.
+    
+    Returns:
+        tuple: ((kind, entry ID) pairs in listing order, {entry ID: position})
+    """
+    def build():
+        ids = [(kind, entry_id) for kind in kinds for entry_id in knowledge.ids(kind)]
+        return ids, {entry_id: position for position, (_, entry_id) in enumerate(ids)}
+    return knowledge.derived('list_order:' + ','.join(kinds), build)
+
+def _project(item, fields):
+    if fields is None:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
+
+def _list_entries(kinds, fields=None, limit=None, cursor=None):
+    """
+    Collect entries of some kinds, optionally projected and paginated.
+    
+    Entries are in file order, kind by kind. A page starts after the entry
+    named by the cursor; only the entries on it are decoded.
+    
+    Args:
+        kinds (tuple): Entry kinds to list
+        fields (tuple): Fields to keep (see parse_fields), or None for every field
+        limit (int): Maximum number of entries, or None for all
+        cursor (str): next_cursor from the previous page, or None to start at the beginning
+        
+    Returns:
+        tuple: (entries by kind, total number of entries, next_cursor or None)
+        
+    Raises:
+        ValueError: If a field is unknown or the cursor is invalid or expired
+    """
+    if fields is not None:
+        field_names = knowledge.derived('field_names', _field_names)
+        known = set().union(*(field_names.get(kind, set()) for kind in kinds))
+        unknown = [name for name in fields if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(sorted(known))}")
+
+    if limit is None and cursor is None:
+        return {kind: [_project(item, fields) for item in knowledge.entries(kind)] for kind in kinds}, None, None
+
+    ids, positions = _list_order(kinds)
+    start = 0
+    if cursor:
+        try:
+            start = positions[_decode_cursor(cursor)] + 1
+        except (ValueError, KeyError):
+            raise ValueError("Invalid or expired cursor") from None
+    end = len(ids) if limit is None else start + limit
+
+    page = {kind: [] for kind in kinds}
+    for kind, entry_id in ids[start:end]:
+        item = knowledge.get(entry_id)
+        if item is not None:
+            page[kind].append(_project(item, fields))
+    next_cursor = encode_cursor(ids[end - 1][1]) if end < len(ids) else None
+    return page, len(ids), next_cursor
+
+def _page_response(items, total, next_cursor):
+    if total is None:
+        return items
+    return {"items": items, "total": total, "next_cursor": next_cursor}
+
+def get_farming_techniques(category="all", fields=None, limit=None, cursor=None):
     """
     Get information about farming techniques.
     
     Args:
         category (str): The category of farming techniques to retrieve (crops, techniques, soil_management, or all)
+        fields (tuple): Entry fields to return (see parse_fields), or None for every field
+        limit (int): Page size, or None for every entry
+        cursor (str): next_cursor of the previous page
         
     Returns:
-        dict: Information about farming techniques
+        dict: Information about farming techniques by category; with limit or cursor,
+        {"items": <techniques by category>, "total": ..., "next_cursor": ...}
     """
     try:
         if category == "all":
-            return FARMING_TECHNIQUES
-        elif category in FARMING_TECHNIQUES:
-            return {category: FARMING_TECHNIQUES[category]}
+            kinds = TECHNIQUE_CATEGORIES
+        elif category in TECHNIQUE_CATEGORIES:
+            kinds = (category,)
         else:
             return {"error": f"Category '{category}' not found"}
+        return _page_response(*_list_entries(kinds, fields, limit, cursor))
+    except ValueError as e:
+        return {"error": str(e)}
     except Exception as e:
         logger.error(f"Error getting farming techniques: {e}")
         return {"error": "Failed to retrieve farming techniques"}
 
-def get_government_schemes():
+def get_government_schemes(fields=None, limit=None, cursor=None):
     """
     Get information about government schemes for farmers.
     
+    Args:
+        fields (tuple): Scheme fields to return (see parse_fields), or None for every field
+        limit (int): Page size, or None for every scheme
+        cursor (str): next_cursor of the previous page
+        
     Returns:
-        list: List of government schemes
+        list: List of government schemes; with limit or cursor,
+        {"items": <schemes>, "total": ..., "next_cursor": ...}
     """
     try:
-        return GOVERNMENT_SCHEMES
+        items, total, next_cursor = _list_entries(('schemes',), fields, limit, cursor)
+        return _page_response(items['schemes'], total, next_cursor)
+    except ValueError as e:
+        return {"error": str(e)}
     except Exception as e:
         logger.error(f"Error getting government schemes: {e}")
         return {"error": "Failed to retrieve government schemes"}
 
-def get_farming_laws():
+def get_farming_laws(fields=None, limit=None, cursor=None):
     """
     Get information about farming laws and regulations.
     
+    Args:
+        fields (tuple): Law fields to return (see parse_fields), or None for every field
+        limit (int): Page size, or None for every law
+        cursor (str): next_cursor of the previous page
+        
     Returns:
-        list: List of farming laws and regulations
+        list: List of farming laws and regulations; with limit or cursor,
+        {"items": <laws>, "total": ..., "next_cursor": ...}
     """
     try:
-        return FARMING_LAWS
+        items, total, next_cursor = _list_entries(('laws',), fields, limit, cursor)
+        return _page_response(items['laws'], total, next_cursor)
+    except ValueError as e:
+        return {"error": str(e)}
     except Exception as e:
         logger.error(f"Error getting farming laws: {e}")
         return {"error": "Failed to retrieve farming laws"}
 
-def search_farming_data(query):
+def search_farming_data(query, limit=10, offset=0):
     """
     Search for specific information across all farming data.
     
+    Results are ranked with BM25 over entry names, descriptions and details;
+    query words also match longer words they start ("irrig" finds "irrigation").
+    
     Args:
         query (str): The search query
+        limit (int): Maximum number of results to return
+        offset (int): Number of top results to skip
         
     Returns:
-        dict: Search results
+        dict: The total number of matches and one page of ranked results
     """
     try:
-        query = query.lower()
-        results = {
-            "techniques": [],
-            "schemes": [],
-            "laws": []
+        total, hits = get_search_index().search_page(query, limit=limit, offset=offset, prefix=True)
+        return {
+            "query": query,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "results": [
+                {
+                    "id": document['id'],
+                    "group": SEARCH_GROUPS[document['kind']],
+                    "category": document['kind'],
+                    "score": round(score, 4),
+                    "item": knowledge.get(document['id'])
+                }
+                for score, document in hits
+            ]
         }
-        
-        # Search in farming techniques
-        for category in FARMING_TECHNIQUES:
-            for item in FARMING_TECHNIQUES[category]:
-                if query in json.dumps(item).lower():
-                    results["techniques"].append(item)
-        
-        # Search in government schemes
-        for scheme in GOVERNMENT_SCHEMES:
-            if query in json.dumps(scheme).lower():
-                results["schemes"].append(scheme)
-        
-        # Search in farming laws
-        for law in FARMING_LAWS:
-            if query in json.dumps(law).lower():
-                results["laws"].append(law)
-        
-        return results
     except Exception as e:
         logger.error(f"Error searching farming data: {e}")
         return {"error": "Failed to search farming data"}
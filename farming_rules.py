@@ -0,0 +1,275 @@
+"""Declarative weather rules for farming recommendations, compiled once into an evaluator for one or many locations."""
+import logging
+import operator
+from datetime import datetime
+import numpy as np
+import forecast
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Each rule compares one weather feature against a threshold and emits a message.
+#   feature:   'temp', 'humidity' or 'wind' (current conditions), 'month',
+#              or a forecast column ('temp', 'humidity', 'rain', 'wind') when 'window' is set
+#   window:    number of upcoming 3-hour forecast slots to aggregate (8 = next 24 hours)
+#   aggregate: how the forecast window is reduced: 'sum', 'max', 'min' or 'mean'
+#   op:        '>', '>=', '<', '<=', '==', '!=' or 'in'
+# Rules are evaluated in table order, which is also the order of the returned messages.
+RECOMMENDATION_RULES = [
+    {
+        "feature": "temp", "op": ">", "value": 35,
+        "message": "High temperature alert! Ensure crops have adequate water. Consider overhead sprinkling for cooling effect."
+    },
+    {
+        "feature": "temp", "op": "<", "value": 10,
+        "message": "Low temperature alert! Protect sensitive crops from frost. Use covers or heaters if available."
+    },
+    {
+        "feature": "humidity", "op": ">", "value": 80,
+        "message": "High humidity detected. Monitor for fungal diseases and mildew. Apply fungicides if necessary."
+    },
+    {
+        "feature": "humidity", "op": "<", "value": 30,
+        "message": "Low humidity detected. Increase irrigation and consider mulching to retain soil moisture."
+    },
+    {
+        "feature": "rain", "window": 8, "aggregate": "sum", "op": ">", "value": 0,
+        "message": "Rain expected in the next 24 hours. Hold off on applying fertilizers or pesticides."
+    },
+    {
+        "feature": "rain", "window": 8, "aggregate": "sum", "op": "==", "value": 0,
+        "message": "No significant rain expected in the next 24 hours. Good opportunity for field operations."
+    },
+    {
+        "feature": "wind", "op": ">", "value": 5,  # Wind speed in m/s
+        "message": "Moderate to high winds expected. Avoid spraying operations and secure young plants."
+    },
+    {
+        "feature": "month", "op": "in", "value": [3, 4, 5],  # Spring (Northern Hemisphere)
+        "message": "Spring season: Good time for planting summer crops. Prepare fields and ensure adequate nutrition."
+    },
+    {
+        "feature": "month", "op": "in", "value": [6, 7, 8],
+        "message": "Summer season: Monitor irrigation needs carefully. Consider shade for sensitive crops."
+    },
+    {
+        "feature": "month", "op": "in", "value": [9, 10, 11],
+        "message": "Fall season: Prepare for harvest operations. Monitor storage conditions for harvested crops."
+    },
+    {
+        "feature": "month", "op": "in", "value": [12, 1, 2],
+        "message": "Winter season: Focus on winter crops and preparation for spring planting. Protect soil from erosion."
+    }
+]
+
+CURRENT_FEATURES = ("temp", "humidity", "wind", "month")
+FORECAST_COLUMNS = ("temp", "humidity", "rain", "wind")
+
+_COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda values, allowed: np.isin(values, allowed)
+}
+
+# The same comparisons on plain numbers, for evaluating a single location
+_SCALAR_COMPARISONS = dict(_COMPARISONS, **{"in": lambda value, allowed: value in allowed})
+
+_AGGREGATES = ("sum", "max", "min", "mean")
+
+def _feature_key(rule):
+    """Return the key under which a rule's input feature is computed."""
+    if "window" in rule:
+        return (rule["feature"], rule["window"], rule.get("aggregate", "sum"))
+    return rule["feature"]
+
+def compile_rules(rules):
+    """
+    Validate a rule table and compile it into a RuleEvaluator.
+
+    Args:
+        rules (list): Rule dicts in the RECOMMENDATION_RULES format
+
+    Returns:
+        RuleEvaluator: The compiled evaluator
+
+    Raises:
+        ValueError: If a rule uses an unknown feature, aggregate or operator
+    """
+    compiled = []
+    for index, rule in enumerate(rules):
+        if rule.get("op") not in _COMPARISONS:
+            raise ValueError(f"Rule {index}: unknown operator {rule.get('op')!r}")
+        if "window" in rule:
+            if rule["feature"] not in FORECAST_COLUMNS:
+                raise ValueError(f"Rule {index}: unknown forecast feature {rule['feature']!r}")
+            if rule.get("aggregate", "sum") not in _AGGREGATES:
+                raise ValueError(f"Rule {index}: unknown aggregate {rule.get('aggregate')!r}")
+            if int(rule["window"]) < 1:
+                raise ValueError(f"Rule {index}: window must be at least one slot")
+        elif rule.get("feature") not in CURRENT_FEATURES:
+            raise ValueError(f"Rule {index}: unknown feature {rule.get('feature')!r}")
+
+        compiled.append((_feature_key(rule), rule["op"], rule["value"], rule["message"]))
+
+    return RuleEvaluator(compiled)
+
+class RuleEvaluator:
+    """
+    Evaluate compiled recommendation rules over one or many locations.
+
+    Each distinct feature (including each forecast window aggregate) is computed
+    once per call as an array over all locations, and each rule is one vectorized
+    comparison over that array. A single location is cheaper to evaluate with
+    plain Python, so evaluate_one skips NumPy entirely.
+    """
+
+    def __init__(self, compiled_rules):
+        self.rules = compiled_rules
+        self.windows = sorted({key for key, _, _, _ in compiled_rules if isinstance(key, tuple)})
+
+    def features(self, current, forecast_arrays, num_locations, month=None):
+        """
+        Compute every feature the rules need.
+
+        Args:
+            current (dict): Arrays of current 'temp', 'humidity' and 'wind' per location
+            forecast_arrays (dict): Column arrays from forecast.forecast_to_arrays or stack_forecasts
+            num_locations (int): Number of locations
+            month (int, optional): Month to evaluate seasonal rules for (defaults to now)
+
+        Returns:
+            dict: Feature arrays of shape (num_locations,)
+        """
+        month = month or datetime.now().month
+        features = {name: np.asarray(current[name], dtype=np.float64) for name in ("temp", "humidity", "wind")}
+        features["month"] = np.full(num_locations, month)
+
+        if not self.windows:
+            return features
+
+        location = forecast_arrays["location"]
+        slots_per_location = np.bincount(location, minlength=num_locations)
+        location_start = np.r_[0, np.cumsum(slots_per_location)[:-1]]
+        position = np.arange(len(location)) - location_start[location]
+
+        for key in self.windows:
+            column, window, aggregate = key
+            in_window = position < window
+            values = forecast_arrays[column][in_window]
+            owners = location[in_window]
+            if aggregate in ("sum", "mean"):
+                result = np.bincount(owners, weights=values, minlength=num_locations)
+                if aggregate == "mean":
+                    result = result / np.maximum(np.bincount(owners, minlength=num_locations), 1)
+            elif aggregate == "max":
+                result = np.full(num_locations, -np.inf)
+                np.maximum.at(result, owners, values)
+            else:
+                result = np.full(num_locations, np.inf)
+                np.minimum.at(result, owners, values)
+            features[key] = result
+
+        return features
+
+    def evaluate(self, current, forecast_arrays, num_locations, month=None):
+        """
+        Evaluate the rules for a batch of locations.
+
+        Args:
+            current (dict): Arrays of current 'temp', 'humidity' and 'wind' per location
+            forecast_arrays (dict): Column arrays from forecast.forecast_to_arrays or stack_forecasts
+            num_locations (int): Number of locations
+            month (int, optional): Month to evaluate seasonal rules for (defaults to now)
+
+        Returns:
+            list: One list of recommendation messages per location
+        """
+        features = self.features(current, forecast_arrays, num_locations, month)
+        fired = np.stack([
+            np.asarray(_COMPARISONS[op](features[key], value), dtype=bool)
+            for key, op, value, _ in self.rules
+        ], axis=1) if self.rules else np.zeros((num_locations, 0), dtype=bool)
+
+        messages = [message for _, _, _, message in self.rules]
+        return [
+            [messages[rule] for rule in np.flatnonzero(row)]
+            for row in fired
+        ]
+
+    def evaluate_one(self, current_data, forecast_columns, month=None):
+        """
+        Evaluate the rules for a single location without NumPy.
+
+        Args:
+            current_data (dict): Current weather data from the API
+            forecast_columns (dict): Column lists from forecast.forecast_columns
+            month (int, optional): Month to evaluate seasonal rules for (defaults to now)
+
+        Returns:
+            list: Recommendation messages, in rule order
+        """
+        features = {
+            "temp": current_data['main']['temp'],
+            "humidity": current_data['main']['humidity'],
+            "wind": current_data['wind']['speed'],
+            "month": month or datetime.now().month
+        }
+        for key in self.windows:
+            column, window, aggregate = key
+            values = forecast_columns[column][:window]
+            if aggregate == "sum":
+                features[key] = sum(values)
+            elif aggregate == "mean":
+                features[key] = sum(values) / len(values) if values else 0.0
+            elif aggregate == "max":
+                features[key] = max(values, default=-np.inf)
+            else:
+                features[key] = min(values, default=np.inf)
+
+        return [
+            message for key, op, value, message in self.rules
+            if _SCALAR_COMPARISONS[op](features[key], value)
+        ]
+
+def current_conditions(current_data_list):
+    """
+    Extract current temperature, humidity and wind arrays from API responses.
+
+    Args:
+        current_data_list (list): Current weather data dicts from the API
+
+    Returns:
+        dict: Arrays of 'temp', 'humidity' and 'wind' per location
+    """
+    return {
+        "temp": [data['main']['temp'] for data in current_data_list],
+        "humidity": [data['main']['humidity'] for data in current_data_list],
+        "wind": [data['wind']['speed'] for data in current_data_list]
+    }
+
+# Compiled once at import so request handling only runs the evaluator
+recommendation_evaluator = compile_rules(RECOMMENDATION_RULES)
+
+def recommend_batch(current_data_list, forecasts, month=None):
+    """
+    Generate recommendations for many locations in a single vectorized pass.
+
+    Args:
+        current_data_list (list): Current weather data dicts from the API
+        forecasts (list): Forecast weather data dicts from the API, in the same order
+        month (int, optional): Month to evaluate seasonal rules for (defaults to now)
+
+    Returns:
+        list: One list of recommendation messages per location
+    """
+    return recommendation_evaluator.evaluate(
+        current_conditions(current_data_list),
+        forecast.stack_forecasts(forecasts),
+        len(current_data_list),
+        month
+    )
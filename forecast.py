@@ -0,0 +1,239 @@
+"""Aggregation of 3-hourly OpenWeatherMap forecasts into daily summaries.
+
+One location is summarized with a plain loop over its slots, which is faster
+than NumPy at 40 slots; batches of locations are stacked and aggregated with
+NumPy in one pass.
+"""
+from datetime import date, timedelta
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# Number of daily summaries returned per location
+FORECAST_DAYS = 5
+
+_EPOCH = date(1970, 1, 1)
+
+def _slot_rows(forecast_data):
+    """Extract (local time, temp, humidity, rain, wind) tuples from a forecast response."""
+    tz_offset = forecast_data.get('city', {}).get('timezone', 0)
+    return [
+        (
+            item['dt'] + tz_offset,
+            item['main']['temp'],
+            item['main']['humidity'],
+            item['rain'].get('3h', 0.0) if 'rain' in item else 0.0,
+            item['wind']['speed'] if 'wind' in item else 0.0
+        )
+        for item in forecast_data.get('list', [])
+    ]
+
+def forecast_columns(forecast_data):
+    """
+    Convert an OpenWeatherMap forecast response into parallel lists.
+
+    Args:
+        forecast_data (dict): Forecast weather data from the API
+
+    Returns:
+        dict: Lists of local timestamps, temperature, humidity, rainfall and wind
+            speed, plus the weather condition dict of every slot
+    """
+    rows = _slot_rows(forecast_data)
+    columns = dict(zip(('time', 'temp', 'humidity', 'rain', 'wind'), map(list, zip(*rows)))) if rows else {
+        'time': [], 'temp': [], 'humidity': [], 'rain': [], 'wind': []
+    }
+    columns['conditions'] = [item['weather'][0] for item in forecast_data.get('list', [])]
+    return columns
+
+def _round(value):
+    # Same rounding as np.round(value, 1), so single and batched summaries agree
+    return round(value * 10) / 10
+
+def summarize_columns(columns, max_days=FORECAST_DAYS):
+    """
+    Aggregate one location's 3-hourly slots into per-day summaries.
+
+    Slots must be ordered by time, as returned by the API. The description
+    and icon of each day come from the slot closest to local noon.
+
+    Args:
+        columns (dict): Lists from forecast_columns
+        max_days (int): Maximum number of days to return
+
+    Returns:
+        list: Daily summary dicts
+    """
+    days = []
+    times = columns['time']
+    start = 0
+    while start < len(times) and len(days) < max_days:
+        day = times[start] // SECONDS_PER_DAY
+        end = start + 1
+        while end < len(times) and times[end] // SECONDS_PER_DAY == day:
+            end += 1
+        temps = columns['temp'][start:end]
+        slot = min(range(start, end), key=lambda i: abs(times[i] % SECONDS_PER_DAY - SECONDS_PER_DAY // 2))
+        condition = columns['conditions'][slot]
+        days.append({
+            'date': (_EPOCH + timedelta(days=int(day))).isoformat(),
+            'temp': _round(sum(temps) / len(temps)),
+            'temp_min': _round(min(temps)),
+            'temp_max': _round(max(temps)),
+            'humidity': _round(sum(columns['humidity'][start:end]) / len(temps)),
+            'rain_total': _round(sum(columns['rain'][start:end])),
+            'wind_max': _round(max(columns['wind'][start:end])),
+            'description': condition['description'],
+            'icon': condition['icon']
+        })
+        start = end
+    return days
+
+def _to_arrays(rows, conditions, location):
+    """Split extracted slot rows into named column arrays."""
+    table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    return {
+        'time': table[:, 0].astype(np.int64),
+        'temp': table[:, 1],
+        'humidity': table[:, 2],
+        'rain': table[:, 3],
+        'wind': table[:, 4],
+        'conditions': conditions,
+        'location': location
+    }
+
+def forecast_to_arrays(forecast_data):
+    """
+    Convert an OpenWeatherMap forecast response into parallel NumPy arrays.
+
+    Args:
+        forecast_data (dict): Forecast weather data from the API
+
+    Returns:
+        dict: Arrays of local timestamps, temperature, humidity, rainfall and wind
+            speed, plus the weather condition dict of every slot
+    """
+    rows = _slot_rows(forecast_data)
+    conditions = [item['weather'][0] for item in forecast_data.get('list', [])]
+    return _to_arrays(rows, conditions, np.zeros(len(rows), dtype=np.int64))
+
+def stack_forecasts(forecasts):
+    """
+    Concatenate the slots of several forecasts, tagging each slot with its location index.
+
+    Args:
+        forecasts (list): Forecast weather data dicts from the API
+
+    Returns:
+        dict: Column arrays as from forecast_to_arrays, with a 'location' index per slot
+    """
+    rows = []
+    conditions = []
+    sizes = []
+    for forecast_data in forecasts:
+        location_rows = _slot_rows(forecast_data)
+        rows.extend(location_rows)
+        conditions.extend(item['weather'][0] for item in forecast_data.get('list', []))
+        sizes.append(len(location_rows))
+    location = np.repeat(np.arange(len(forecasts), dtype=np.int64), sizes)
+    return _to_arrays(rows, conditions, location)
+
+def aggregate_daily(arrays, num_locations=1, max_days=FORECAST_DAYS):
+    """
+    Aggregate 3-hourly forecast slots into per-day summaries in one vectorized pass.
+
+    Slots must be ordered by time within each location, as returned by the API.
+    The description and icon of each day come from the slot closest to local noon.
+
+    Args:
+        arrays (dict): Arrays from forecast_to_arrays or stack_forecasts
+        num_locations (int): Number of locations stacked in the arrays
+        max_days (int): Maximum number of days to return per location
+
+    Returns:
+        list: One list of daily summary dicts per location
+    """
+    results = [[] for _ in range(num_locations)]
+    time = arrays['time']
+    if len(time) == 0:
+        return results
+
+    location = arrays['location']
+    day = time // SECONDS_PER_DAY
+
+    # Slots of one (location, day) group are contiguous, so groups start where the key changes
+    group_key = location * (day.max() + 1) + day
+    starts = np.flatnonzero(np.r_[True, group_key[1:] != group_key[:-1]])
+    counts = np.diff(np.r_[starts, len(time)])
+    group_of_slot = np.repeat(np.arange(len(starts)), counts)
+
+    temp_min = np.minimum.reduceat(arrays['temp'], starts)
+    temp_max = np.maximum.reduceat(arrays['temp'], starts)
+    temp_mean = np.add.reduceat(arrays['temp'], starts) / counts
+    humidity_mean = np.add.reduceat(arrays['humidity'], starts) / counts
+    rain_total = np.add.reduceat(arrays['rain'], starts)
+    wind_max = np.maximum.reduceat(arrays['wind'], starts)
+
+    # First slot in each group with the smallest distance from local noon
+    noon_distance = np.abs(time % SECONDS_PER_DAY - SECONDS_PER_DAY // 2)
+    closest = noon_distance == np.minimum.reduceat(noon_distance, starts)[group_of_slot]
+    candidate_slots = np.flatnonzero(closest)
+    _, first = np.unique(group_of_slot[candidate_slots], return_index=True)
+    representative = candidate_slots[first]
+
+    group_location = location[starts].tolist()
+    dates = np.datetime_as_string(day[starts].astype('datetime64[D]')).tolist()
+    columns = zip(
+        np.round(temp_mean, 1).tolist(),
+        np.round(temp_min, 1).tolist(),
+        np.round(temp_max, 1).tolist(),
+        np.round(humidity_mean, 1).tolist(),
+        np.round(rain_total, 1).tolist(),
+        np.round(wind_max, 1).tolist(),
+        representative.tolist()
+    )
+
+    for g, (mean, low, high, humidity, rain, wind, slot) in enumerate(columns):
+        days = results[group_location[g]]
+        if len(days) >= max_days:
+            continue
+        condition = arrays['conditions'][slot]
+        days.append({
+            'date': dates[g],
+            'temp': mean,
+            'temp_min': low,
+            'temp_max': high,
+            'humidity': humidity,
+            'rain_total': rain,
+            'wind_max': wind,
+            'description': condition['description'],
+            'icon': condition['icon']
+        })
+
+    return results
+
+def summarize_forecast(forecast_data, max_days=FORECAST_DAYS):
+    """
+    Summarize one location's forecast into daily aggregates.
+
+    Args:
+        forecast_data (dict): Forecast weather data from the API
+        max_days (int): Maximum number of days to return
+
+    Returns:
+        list: Daily summary dicts
+    """
+    return summarize_columns(forecast_columns(forecast_data), max_days)
+
+def summarize_forecasts(forecasts, max_days=FORECAST_DAYS):
+    """
+    Summarize a batch of forecasts into daily aggregates in a single pass.
+
+    Args:
+        forecasts (list): Forecast weather data dicts from the API
+        max_days (int): Maximum number of days to return per location
+
+    Returns:
+        list: One list of daily summary dicts per forecast
+    """
+    return aggregate_daily(stack_forecasts(forecasts), len(forecasts), max_days)
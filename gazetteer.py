@@ -0,0 +1,232 @@
+"""Offline gazetteer that resolves free-text place names to canonical IDs and coordinates."""
+import os
+import re
+import json
+import bisect
+import difflib
+import logging
+import threading
+from functools import lru_cache
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Bundled place list: JSON array of {"name", "state", "lat", "lon", "aliases"?, "id"?}
+GAZETTEER_PATH = os.environ.get(
+    "GAZETTEER_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer_in.json")
+)
+
+# Minimum similarity (0-1) for a misspelt name to resolve to a place
+FUZZY_CUTOFF = float(os.environ.get("GAZETTEER_FUZZY_CUTOFF", "0.85"))
+
+# Shortest input that may resolve through a unique prefix match
+MIN_PREFIX_LENGTH = 4
+
+# Share of a place name a prefix must cover to resolve to it, so "Mangal" is not taken for Mangaluru
+MIN_PREFIX_COVERAGE = 0.75
+
+# How a location was resolved: by name or alias, by a unique prefix, or as a misspelling
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_FUZZY = "fuzzy"
+
+# Trailing qualifiers that do not help identify a place
+_COUNTRY_QUALIFIERS = {"india", "in", "ind", "bharat"}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+def normalize_name(text):
+    """
+    Normalize a place name for index lookups.
+
+    Args:
+        text (str): A place name
+
+    Returns:
+        str: The case-folded name with punctuation removed and whitespace collapsed
+    """
+    return " ".join(_NON_WORD.sub(" ", str(text).casefold()).split())
+
+def _slug(text):
+    return normalize_name(text).replace(" ", "-")
+
+class Gazetteer:
+    """
+    In-memory index over a list of places.
+
+    Names and aliases are indexed for exact lookups, kept in sorted lists (all
+    places, and per state) for prefix completion, and matched with difflib for
+    misspellings.
+    """
+
+    def __init__(self, places):
+        """
+        Args:
+            places (list): Place dicts with 'name', 'state', 'lat' and 'lon', optional 'aliases' and 'id'
+        """
+        self.places = {}
+        self._by_name = {}
+        by_state = {}
+        for entry in places:
+            place = {
+                'id': entry.get('id') or f"in:{_slug(entry['state'])}:{_slug(entry['name'])}",
+                'name': entry['name'],
+                'state': entry['state'],
+                'lat': float(entry['lat']),
+                'lon': float(entry['lon'])
+            }
+            self.places[place['id']] = place
+            for name in [entry['name']] + entry.get('aliases', []):
+                matches = self._by_name.setdefault(normalize_name(name), [])
+                if place not in matches:
+                    matches.append(place)
+                by_state.setdefault(normalize_name(entry['state']), set()).add(normalize_name(name))
+        self._names = sorted(self._by_name)
+        self._names_by_state = {state: sorted(names) for state, names in by_state.items()}
+
+    def complete(self, prefix, limit=10):
+        """
+        Find places whose name or alias starts with a prefix.
+
+        Args:
+            prefix (str): The typed prefix
+            limit (int): Maximum number of places to return
+
+        Returns:
+            list: Matching place dicts, in name order
+        """
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        start = bisect.bisect_left(self._names, prefix)
+        for name in self._names[start:]:
+            if not name.startswith(prefix):
+                break
+            for place in self._by_name[name]:
+                if place['id'] not in seen:
+                    seen.add(place['id'])
+                    results.append(place)
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def resolve(self, location):
+        """
+        Resolve free text such as "new delhi", "Pune, Maharashtra" or "Banglore" to a place.
+
+        Tries an exact name or alias match, then a unique prefix match covering
+        most of the name, then a fuzzy match on names with the same first
+        letter. A state after a comma limits every step to places in that
+        state, so a place the gazetteer lacks is not taken for a namesake or a
+        similar name elsewhere.
+
+        Args:
+            location (str): The location as entered by the user
+
+        Returns:
+            dict: A copy of the place ('id', 'name', 'state', 'lat', 'lon') with 'match'
+                  set to MATCH_EXACT, MATCH_PREFIX or MATCH_FUZZY, or None if unknown
+        """
+        parts = [normalize_name(part) for part in str(location).split(",")]
+        parts = [part for part in parts if part]
+        while len(parts) > 1 and parts[-1] in _COUNTRY_QUALIFIERS:
+            parts.pop()
+        if not parts:
+            return None
+
+        name = parts[0]
+        state = parts[1] if len(parts) > 1 else None
+        names = self._names_by_state.get(state, []) if state else self._names
+
+        def in_state(places):
+            return [place for place in places if not state or normalize_name(place['state']) == state]
+
+        match = MATCH_EXACT
+        candidates = in_state(self._by_name.get(name, []))
+        if not candidates and len(name) >= MIN_PREFIX_LENGTH:
+            match = MATCH_PREFIX
+            candidates = self._prefix_match(name, names, in_state)
+        if not candidates:
+            match = MATCH_FUZZY
+            pool = [other for other in names if other[0] == name[0]]
+            close = difflib.get_close_matches(name, pool, n=1, cutoff=FUZZY_CUTOFF)
+            candidates = in_state(self._by_name[close[0]]) if close else []
+        if not candidates:
+            return None
+        return dict(candidates[0], match=match)
+
+    def _prefix_match(self, prefix, names, in_state):
+        """Return the places of the one name in ``names`` that ``prefix`` covers enough of, else []."""
+        found = []
+        start = bisect.bisect_left(names, prefix)
+        for name in names[start:]:
+            if not name.startswith(prefix):
+                break
+            places = in_state(self._by_name[name])
+            if places and places[0] not in found:
+                found.append(places[0])
+                if len(found) > 1 or len(prefix) < MIN_PREFIX_COVERAGE * len(name):
+                    return []
+        return found
+
+def load_gazetteer(path=GAZETTEER_PATH):
+    """
+    Load a gazetteer from a JSON file.
+
+    Args:
+        path (str): Path to the place list
+
+    Returns:
+        Gazetteer: The loaded index (empty if the file cannot be read)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            places = json.load(f)
+        logger.info(f"Loaded {len(places)} places from gazetteer {path}")
+        return Gazetteer(places)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Error loading gazetteer {path}: {e}")
+        return Gazetteer([])
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+def get_gazetteer():
+    """Return the shared gazetteer, loading it on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = load_gazetteer()
+    return _gazetteer
+
+@lru_cache(maxsize=8192)
+def resolve(location):
+    """
+    Resolve a location name with the shared gazetteer (results are memoized).
+
+    Args:
+        location (str): The location as entered by the user
+
+    Returns:
+        dict: The place ('id', 'name', 'state', 'lat', 'lon'), or None if unknown
+    """
+    return get_gazetteer().resolve(location)
+
+def complete(prefix, limit=10):
+    """
+    Suggest places for a typed prefix using the shared gazetteer.
+
+    Args:
+        prefix (str): The typed prefix
+        limit (int): Maximum number of places to return
+
+    Returns:
+        list: Matching place dicts
+    """
+    return get_gazetteer().complete(prefix, limit)
@@ -0,0 +1,100 @@
+"""Single-pass keyword intent classifier for farmer messages."""
+import re
+import string
+from collections import namedtuple
+
+# Keywords per category, in tie-break priority order.
+# A trailing '*' matches any word starting with the keyword ("cultivat*" matches
+# "cultivation"); other keywords match whole words, optionally pluralised.
+INTENT_KEYWORDS = {
+    'weather': ['weather', 'rain*', 'forecast*', 'temperature*', 'climate*', 'monsoon*', 'humid*'],
+    'crops': ['crop*', 'plant*', 'seed*', 'harvest*', 'cultivat*', 'grow*', 'yield*', 'sow*'],
+    'schemes': ['scheme*', 'subsid*', 'government*', 'loan*', 'grant*', 'support*', 'polic*', 'program*'],
+    'laws': ['law', 'regulat*', 'legal*', 'act', 'rule*', 'complian*', 'guideline*'],
+    'techniques': ['techni*', 'farming method*', 'how to farm', 'agricultur*'],
+    'greeting': ['hello', 'hi', 'hey', 'greetings', 'namaste']
+}
+
+# Greetings only decide the category when no farming topic is mentioned
+GREETING = 'greeting'
+GENERAL = 'general'
+
+# Suffixes accepted after a whole-word keyword
+_PLURAL_SUFFIXES = ('', 's', 'es')
+
+# Punctuation and whitespace become single spaces so every word starts after a space
+_SEPARATORS = str.maketrans({char: ' ' for char in string.punctuation + string.whitespace})
+
+Intent = namedtuple('Intent', ['category', 'scores'])
+
+def _trie_pattern(words):
+    """Build a regex alternation that shares common prefixes between words."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        is_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if is_end else body
+
+    return build(trie)
+
+def compile_classifier(keywords):
+    """
+    Compile a keyword table into one regular expression and a stem lookup table.
+
+    The pattern starts with a literal space so the regex engine can jump
+    between word starts instead of trying every keyword at every character.
+
+    Args:
+        keywords (dict): Category name to keyword list, in priority order
+
+    Returns:
+        tuple: (pattern, stems) where stems maps each keyword stem to (category, is_prefix)
+    """
+    stems = {}
+    for category, category_keywords in keywords.items():
+        for keyword in category_keywords:
+            stems[keyword.rstrip('*')] = (category, keyword.endswith('*'))
+    pattern = re.compile(f" ({_trie_pattern(stems)})(\\w*)")
+    return pattern, stems
+
+_PATTERN, _STEMS = compile_classifier(INTENT_KEYWORDS)
+_PRIORITY = {category: index for index, category in enumerate(INTENT_KEYWORDS)}
+
+def classify(message):
+    """
+    Classify a message in a single pass over its text.
+
+    The category with the most keyword matches wins; ties go to the category
+    listed first in INTENT_KEYWORDS. Messages with no farming keywords are
+    'greeting' if they greet, otherwise 'general'.
+
+    Args:
+        message (str): The message from the user
+
+    Returns:
+        Intent: The winning category and the match count for every matched category
+    """
+    scores = {}
+    text = " " + message.lower().translate(_SEPARATORS)
+    for stem, rest in _PATTERN.findall(text):
+        category, is_prefix = _STEMS[stem]
+        if is_prefix or rest in _PLURAL_SUFFIXES:
+            scores[category] = scores.get(category, 0) + 1
+
+    topics = [category for category in scores if category != GREETING]
+    if topics:
+        category = max(topics, key=lambda c: (scores[c], -_PRIORITY[c]))
+    elif GREETING in scores:
+        category = GREETING
+    else:
+        category = GENERAL
+    return Intent(category, scores)
@@ -0,0 +1,259 @@
+"""Memory-mapped JSON-lines knowledge store, loaded lazily and reloaded when the file changes."""
+import os
+import json
+import math
+import mmap
+import time
+import logging
+import threading
+from cache import TTLCache
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _Snapshot:
+    """One generation of the store: the mapped file and the byte span of each entry."""
+
+    def __init__(self, path, generation):
+        self.generation = generation
+        self.spans = {}          # entry ID -> (start, end) byte offsets of its line
+        self.kinds = {}          # kind -> entry IDs in file order
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            # The map stays valid after the file is closed or replaced
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+        start, line_number = 0, 0
+        while start < len(self.data):
+            end = self.data.find(b"\n", start)
+            if end < 0:
+                end = len(self.data)
+            line_number += 1
+            if self.data[start:end].strip():
+                try:
+                    record = json.loads(self.data[start:end])
+                    entry_id, kind = record['id'], record['kind']
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"invalid entry on line {line_number}: {e!r}") from e
+                if entry_id in self.spans:
+                    raise ValueError(f"duplicate entry ID '{entry_id}' on line {line_number}")
+                self.spans[entry_id] = (start, end)
+                self.kinds.setdefault(kind, []).append(entry_id)
+            start = end + 1
+
+    @classmethod
+    def empty(cls, generation):
+        snapshot = cls.__new__(cls)
+        snapshot.generation = generation
+        snapshot.spans, snapshot.kinds = {}, {}
+        snapshot.signature = None
+        snapshot.data = b""
+        return snapshot
+
+    def decode(self, entry_id):
+        start, end = self.spans[entry_id]
+        return json.loads(self.data[start:end])['item']
+
+class KnowledgeStore:
+    """
+    Read-only entries from a JSON-lines file, decoded on demand by ID or kind.
+
+    Each line holds one entry: {"id": ..., "kind": ..., "item": {...}}. Loading
+    the file maps it into memory and records only where each line is, so the
+    entries themselves stay in the page cache (shared by every worker) and are
+    decoded when asked for; single lookups are kept in a bounded LRU cache.
+    Only the raw entries are shared: the line offsets, the LRU cache and every
+    value built through ``derived`` live in each worker's own memory.
+
+    The file is checked for changes at most every ``reload_interval`` seconds.
+    A changed file is indexed in full and then swapped in at once, raising the
+    generation number; a file that fails to load leaves the current generation
+    in place. Values built through ``derived`` are rebuilt on first use after a
+    reload. Update the file by writing a new one and renaming it over the old,
+    so the generation being read is never modified underneath its readers.
+    """
+
+    def __init__(self, path, reload_interval=5.0, cache_entries=512):
+        """
+        Args:
+            path (str): Path of the JSON-lines file
+            reload_interval (float): Seconds between checks for changes (0 disables reloading)
+            cache_entries (int): Decoded entries kept for lookups by ID
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._cache = TTLCache(max_entries=cache_entries, ttl=math.inf)
+        self._lock = threading.Lock()
+        self._derived_lock = threading.RLock()
+        self._derived = {}       # name -> (generation, value)
+        self._next_check = 0.0
+        self._seen = None
+        self.reloads = 0
+        self.reload_errors = 0
+        self._snapshot = _Snapshot.empty(0)
+        self.reload()
+
+    def reload(self):
+        """
+        Load the file now and swap it in as a new generation.
+
+        Returns:
+            bool: True if the new generation was loaded, False if the file could not be read
+        """
+        with self._lock:
+            return self._reload()
+
+    def _reload(self):
+        self._next_check = time.monotonic() + self.reload_interval
+        try:
+            snapshot = _Snapshot(self.path, self._snapshot.generation + 1)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.reload_errors += 1
+            try:
+                self._seen = self._signature()
+            except OSError:
+                self._seen = None
+            logger.error(f"Error loading knowledge store {self.path}: {e}")
+            return False
+        self._seen = snapshot.signature
+        self._snapshot = snapshot
+        self.reloads += 1
+        logger.info(f"Loaded {len(snapshot.spans)} entries from {self.path} (generation {snapshot.generation})")
+        return True
+
+    def _signature(self):
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _current(self):
+        """Return the current snapshot, reloading first if the file has changed."""
+        if self.reload_interval > 0 and time.monotonic() >= self._next_check:
+            # One thread checks; the others keep reading the current generation
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._next_check = time.monotonic() + self.reload_interval
+                    try:
+                        changed = self._signature() != self._seen
+                    except OSError as e:
+                        logger.warning(f"Cannot check knowledge store {self.path}: {e}")
+                        changed = False
+                    if changed:
+                        self._reload()
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    @property
+    def generation(self):
+        """The generation number, raised by every successful reload."""
+        return self._current().generation
+
+    def kinds(self):
+        """
+        List the entry kinds.
+
+        Returns:
+            list: Kinds in the order they first appear in the file
+        """
+        return list(self._current().kinds)
+
+    def ids(self, kind=None):
+        """
+        List entry IDs.
+
+        Args:
+            kind (str): Only list entries of this kind
+
+        Returns:
+            list: Entry IDs in file order
+        """
+        snapshot = self._current()
+        if kind is None:
+            return list(snapshot.spans)
+        return list(snapshot.kinds.get(kind, []))
+
+    def get(self, entry_id):
+        """
+        Look up an entry by ID.
+
+        Args:
+            entry_id (str): The entry ID
+
+        Returns:
+            dict: The entry (shared; do not modify), or None if there is no such entry
+        """
+        snapshot = self._current()
+        if entry_id not in snapshot.spans:
+            return None
+        key = (snapshot.generation, entry_id)
+        item, _ = self._cache.get(key)
+        if item is None:
+            item = snapshot.decode(entry_id)
+            self._cache.set(key, item)
+        return item
+
+    def entries(self, kind):
+        """
+        Decode every entry of a kind, bypassing the lookup cache.
+
+        Args:
+            kind (str): The entry kind
+
+        Returns:
+            list: The entries in file order (empty for an unknown kind)
+        """
+        snapshot = self._current()
+        return [snapshot.decode(entry_id) for entry_id in snapshot.kinds.get(kind, [])]
+
+    def scan(self):
+        """
+        Iterate over all entries of one generation, bypassing the lookup cache.
+
+        Yields:
+            tuple: (entry ID, kind, entry) in file order
+        """
+        snapshot = self._current()
+        for kind, entry_ids in snapshot.kinds.items():
+            for entry_id in entry_ids:
+                yield entry_id, kind, snapshot.decode(entry_id)
+
+    def derived(self, name, builder):
+        """
+        Get a value computed from the store, rebuilding it once per generation.
+
+        Args:
+            name (str): Name the value is kept under
+            builder (callable): Builds the value from the store's current contents
+
+        Returns:
+            The value built for the current generation
+        """
+        generation = self._current().generation
+        with self._derived_lock:
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == generation:
+                return cached[1]
+            started = time.perf_counter()
+            value = builder()
+            self._derived[name] = (generation, value)
+        logger.info(f"Built '{name}' for generation {generation} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return value
+
+    def stats(self):
+        """
+        Get store counters.
+
+        Returns:
+            dict: Generation, entry count, mapped bytes, reload counts and lookup cache stats
+        """
+        snapshot = self._snapshot
+        return {
+            'generation': snapshot.generation,
+            'entries': len(snapshot.spans),
+            'bytes': len(snapshot.data),
+            'reloads': self.reloads,
+            'reload_errors': self.reload_errors,
+            'cache': self._cache.stats()
+        }
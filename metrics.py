@@ -0,0 +1,192 @@
+"""In-process metrics exposed in the Prometheus text exposition format."""
+import math
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        """
+        Args:
+            name (str): Metric name
+            help_text (str): One-line description shown in the exposition
+            labels (tuple): Label names; every update must give a value for each
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+class Counter(_Metric):
+    """A value that only goes up, per label combination."""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        """
+        Increase the counter.
+
+        Args:
+            amount (float): Amount to add
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Return the current value for a label combination."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                    for key, value in sorted(self._values.items())]
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, per label combination."""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}        # key -> [bucket counts, sum, count]
+
+    def observe(self, value, **labels):
+        """
+        Record an observation.
+
+        Args:
+            value (float): The observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self):
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labels, key, ("le", _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class CallbackGauge(_Metric):
+    """A gauge whose values are read from a function at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, callback, labels=()):
+        """
+        Args:
+            name (str): Metric name
+            help_text (str): One-line description shown in the exposition
+            callback (callable): Returns a dict of label-value tuple (in label order) to value
+            labels (tuple): Label names
+        """
+        super().__init__(name, help_text, labels)
+        self.callback = callback
+
+    def _samples(self):
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.error(f"Error collecting metric {self.name}: {e}")
+            return []
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+def _flatten_stats(stats, prefix=""):
+    values = {}
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(_flatten_stats(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            values[(name,)] = int(value) if isinstance(value, bool) else value
+    return values
+
+def register_stats(name, help_text, stats_fn):
+    """
+    Expose a component's stats() dict as a gauge with one 'stat' label per numeric value.
+
+    Nested dicts are flattened with dotted names; non-numeric values are skipped.
+
+    Args:
+        name (str): Metric name
+        help_text (str): One-line description shown in the exposition
+        stats_fn (callable): Returns the stats dict
+
+    Returns:
+        CallbackGauge: The registered gauge
+    """
+    return CallbackGauge(name, help_text, lambda: _flatten_stats(stats_fn()), labels=("stat",))
+
+def render():
+    """
+    Render every registered metric.
+
+    Returns:
+        str: The Prometheus text exposition
+    """
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
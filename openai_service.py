@@ -1,7 +1,18 @@
 import os
 import json
+import time
+import random
+import asyncio
 import logging
-from openai import OpenAI
+import openai
+import intent
+import metrics
+import retrieval
+import routing
+from openai import OpenAI, AsyncOpenAI, Timeout
+from circuit_breaker import CircuitBreaker
+from rate_limiter import RateLimiter, RequestShed, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from response_cache import response_cache, RESPONSE_CACHE_ENABLED
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -9,7 +20,80 @@ logger = logging.getLogger(__name__)
 
 # Initialize the OpenAI client
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+# Request timeouts (seconds), and retries of connection errors, timeouts and 5xx responses
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", "20"))
+OPENAI_CONNECT_TIMEOUT = float(os.environ.get("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "1"))
+
+client = OpenAI(
+    api_key=OPENAI_API_KEY,
+    timeout=Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+    # call_openai does the retrying, so every attempt goes through the rate limiter
+    max_retries=0
+)
+
+# Async client for the ASGI serving path (asgi.py)
+async_client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    timeout=Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+    # call_openai does the retrying, so every attempt goes through the rate limiter
+    max_retries=0
+)
+
+# Circuit breaker: stop calling OpenAI while it is failing and serve static fallbacks
+openai_breaker = CircuitBreaker(
+    "openai",
+    failure_rate=float(os.environ.get("OPENAI_CIRCUIT_FAILURE_RATE", "0.5")),
+    min_requests=int(os.environ.get("OPENAI_CIRCUIT_MIN_REQUESTS", "5")),
+    window=float(os.environ.get("OPENAI_CIRCUIT_WINDOW", "60")),
+    reset_timeout=float(os.environ.get("OPENAI_CIRCUIT_RESET_TIMEOUT", "30"))
+)
+
+# Errors that mean OpenAI itself is slow, unreachable, overloaded or failing
+UPSTREAM_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+# Shared limiter for all OpenAI calls: chat is served before background lookups,
+# and calls that cannot start within their deadline get a fallback instead
+openai_limiter = RateLimiter(
+    "openai",
+    rate=float(os.environ.get("OPENAI_RATE_LIMIT_RPS", "5")),
+    burst=int(os.environ.get("OPENAI_RATE_LIMIT_BURST", "10")),
+    max_concurrent=int(os.environ.get("OPENAI_MAX_CONCURRENT", "16")),
+    max_queue=int(os.environ.get("OPENAI_QUEUE_MAX", "100"))
+)
+
+# Longest time (seconds) a call may wait for the limiter, by priority
+QUEUE_DEADLINES = {
+    PRIORITY_INTERACTIVE: float(os.environ.get("OPENAI_QUEUE_DEADLINE", "5")),
+    PRIORITY_BACKGROUND: float(os.environ.get("OPENAI_BACKGROUND_QUEUE_DEADLINE", "30"))
+}
+
+# Retries of calls rejected with HTTP 429, with jittered exponential backoff
+OPENAI_RATE_LIMIT_RETRIES = int(os.environ.get("OPENAI_RATE_LIMIT_RETRIES", "2"))
+OPENAI_BACKOFF_BASE = float(os.environ.get("OPENAI_BACKOFF_BASE", "0.5"))
+OPENAI_BACKOFF_MAX = float(os.environ.get("OPENAI_BACKOFF_MAX", "8"))
+
+# Instrumentation exposed at /metrics
+OPENAI_REQUEST_SECONDS = metrics.Histogram(
+    "openai_request_duration_seconds", "Time until an OpenAI call returned its complete answer",
+    labels=("category", "model", "route")
+)
+OPENAI_TOKENS = metrics.Counter(
+    "openai_tokens_total", "Tokens used by OpenAI calls", labels=("category", "model", "type")
+)
+OPENAI_ERRORS = metrics.Counter("openai_errors_total", "Failed OpenAI calls by error type", labels=("error",))
+CHAT_RESPONSES = metrics.Counter(
+    "chat_responses_total", "Chat responses by source (model, cache, curated, fallback)", labels=("source",)
+)
+CHAT_FALLBACKS = metrics.Counter("chat_fallbacks_total", "Static fallback responses by reason", labels=("reason",))
+metrics.CallbackGauge(
+    "openai_circuit_open", "1 while the OpenAI circuit breaker is open or half-open",
+    lambda: {(): int(openai_breaker.state != "closed")}
+)
+metrics.register_stats("openai_circuit", "OpenAI circuit breaker counters", openai_breaker.stats)
+metrics.register_stats("openai_limiter", "OpenAI rate limiter counters and queue state", openai_limiter.stats)
+metrics.register_stats("chat_response_cache", "Chat response cache counters", response_cache.stats)
 
 # System message to guide the AI's responses
 SYSTEM_MESSAGE = """
@@ -25,92 +109,443 @@ Respond in a warm, supportive tone while maintaining accuracy and providing acti
 Keep responses concise yet comprehensive, focusing on practical information farmers can apply.
 """
 
-def generate_response(user_message):
+def build_prompt(user_message):
+    """
+    Detect the message category and build the user prompt for the model.
+    
+    Args:
+        user_message (str): The message from the user
+        
+    Returns:
+        tuple: (category, prompt content)
+    """
+    category = intent.classify(user_message).category
+    
+    # Add category-specific guidance to the prompt
+    additional_context = ""
+    if category == 'weather':
+        additional_context = "Focus on weather implications for farming and practical advice related to the current weather conditions."
+    elif category == 'crops':
+        additional_context = "Provide detailed, practical information about crop cultivation, care, and best practices."
+    elif category == 'schemes':
+        additional_context = "Explain relevant government schemes for farmers clearly, including eligibility criteria and application process."
+    elif category == 'laws':
+        additional_context = "Explain farming laws and regulations in simple, accessible language, focusing on practical implications."
+    elif category == 'techniques':
+        additional_context = "Describe suitable farming techniques step by step, with practical tips farmers can apply."
+    
+    # Ground the answer in matching curated entries
+    reference = retrieval.context_for(user_message)
+    if reference:
+        additional_context = f"{additional_context}\n\n{reference}".strip()
+    
+    # Create the complete prompt
+    content = f"{additional_context}\n\nFarmer's message: {user_message}"
+    return category, content
+
+def build_messages(content, history=None):
+    """
+    Build the chat messages sent to the model.
+    
+    Args:
+        content (str): The prompt built from the user's message
+        history (list): Earlier turns of the conversation as chat messages
+        
+    Returns:
+        list: System message, conversation history, then the new user message
+    """
+    return [{"role": "system", "content": SYSTEM_MESSAGE}, *(history or []), {"role": "user", "content": content}]
+
+def _retry_limit(error):
+    """Number of retries allowed for a failed call: 429s and transient errors are retried."""
+    if isinstance(error, openai.RateLimitError):
+        return OPENAI_RATE_LIMIT_RETRIES
+    if isinstance(error, (openai.APIConnectionError, openai.InternalServerError)):
+        return OPENAI_MAX_RETRIES
+    return 0
+
+def _backoff_delay(attempt, error):
+    """Seconds to wait before retrying a rate-limited call: Retry-After if given, else jittered exponential."""
+    delay = OPENAI_BACKOFF_BASE * 2 ** attempt
+    retry_after = getattr(getattr(error, 'response', None), 'headers', {}).get('retry-after')
+    try:
+        delay = max(delay, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    return min(OPENAI_BACKOFF_MAX, delay) * random.uniform(0.5, 1.5)
+
+def call_openai(create, priority=PRIORITY_INTERACTIVE, keep_slot=False, **kwargs):
+    """
+    Make an OpenAI API call through the shared rate limiter.
+    
+    Calls rejected with HTTP 429 are retried with jittered backoff, up to
+    OPENAI_RATE_LIMIT_RETRIES times; connection errors, timeouts and 5xx
+    responses up to OPENAI_MAX_RETRIES times. The clients themselves do not
+    retry, so each attempt takes a limiter slot and the limits do not multiply.
+    
+    Args:
+        create (callable): The client method to call, e.g. client.chat.completions.create
+        priority (int): Limiter priority (PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND)
+        keep_slot (bool): Keep the limiter slot after a successful call (for streams);
+            the caller must then call openai_limiter.release() when done
+        **kwargs: Arguments for the API call
+        
+    Returns:
+        The API response
+        
+    Raises:
+        RequestShed: If the call could not start within its queue deadline
+    """
+    attempt = 0
+    while True:
+        if not openai_limiter.acquire(priority, QUEUE_DEADLINES[priority]):
+            raise RequestShed("OpenAI request queue is saturated")
+        succeeded = False
+        try:
+            response = create(**kwargs)
+            succeeded = True
+            return response
+        except openai.OpenAIError as e:
+            if attempt >= _retry_limit(e):
+                raise
+            delay = _backoff_delay(attempt, e)
+        finally:
+            if not (keep_slot and succeeded):
+                openai_limiter.release()
+        attempt += 1
+        logger.warning(f"OpenAI call failed; retrying in {delay:.2f}s (attempt {attempt})")
+        time.sleep(delay)
+
+async def call_openai_async(create, priority=PRIORITY_INTERACTIVE, **kwargs):
+    """
+    Async variant of call_openai for AsyncOpenAI client methods.
+    
+    Args:
+        create (callable): The async client method to call
+        priority (int): Limiter priority (PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND)
+        **kwargs: Arguments for the API call
+        
+    Returns:
+        The API response
+        
+    Raises:
+        RequestShed: If the call could not start within its queue deadline
+    """
+    attempt = 0
+    while True:
+        if not await openai_limiter.acquire_async(priority, QUEUE_DEADLINES[priority]):
+            raise RequestShed("OpenAI request queue is saturated")
+        try:
+            return await create(**kwargs)
+        except openai.OpenAIError as e:
+            if attempt >= _retry_limit(e):
+                raise
+            delay = _backoff_delay(attempt, e)
+        finally:
+            openai_limiter.release()
+        attempt += 1
+        logger.warning(f"OpenAI call failed; retrying in {delay:.2f}s (attempt {attempt})")
+        await asyncio.sleep(delay)
+
+def _prepare_call(user_message, history):
+    """
+    Run the steps every chat entry point takes before calling the API.
+    
+    Curated answers, a missing API key, the response cache and an open circuit all
+    answer the message without the model. Otherwise the message is routed, its
+    prompt built and the call admitted by the circuit breaker, so the caller must
+    close it out with _finish_call or _call_failed.
+    
+    Args:
+        user_message (str): The message from the user
+        history (list): Earlier turns of the conversation as chat messages
+        
+    Returns:
+        tuple: (response, None) when answered without the model, otherwise
+            (None, (category, route, messages)) for the API call
+    """
+    # Questions that name a single curated entry are answered without the model
+    direct_response = retrieval.direct_answer(user_message)
+    if direct_response is not None:
+        CHAT_RESPONSES.inc(source="curated")
+        return direct_response, None
+    
+    # Check if the API key is available
+    if not OPENAI_API_KEY:
+        logger.error("OpenAI API key is not available.")
+        return get_fallback_response(user_message, reason="no_api_key"), None
+    
+    category, content = build_prompt(user_message)
+    
+    # Serve repeated and near-duplicate questions from the response cache; answers to
+    # follow-ups depend on the conversation, so those are neither served nor stored
+    if RESPONSE_CACHE_ENABLED and not history:
+        cached_response = response_cache.get(user_message, category)
+        if cached_response is not None:
+            CHAT_RESPONSES.inc(source="cache")
+            return cached_response, None
+    
+    route = routing.choose_route(category, user_message, history)
+    messages = build_messages(content, history)
+    
+    # Admit the call last, so nothing can fail between taking and closing out a half-open probe
+    if not openai_breaker.allow_request():
+        logger.warning("OpenAI circuit is open. Using fallback response.")
+        return get_fallback_response(user_message, reason="circuit_open"), None
+    return None, (category, route, messages)
+
+def _finish_call(user_message, history, category, route, started, response_text, usage):
+    """Record a successful API call and cache its answer."""
+    openai_breaker.record_success()
+    record_call(category, route, time.monotonic() - started, usage)
+    CHAT_RESPONSES.inc(source="model")
+    # Answers that depend on earlier turns are not reusable for other sessions
+    if RESPONSE_CACHE_ENABLED and response_text and not history:
+        response_cache.set(user_message, category, response_text)
+
+def _call_failed(user_message, api_error):
+    """Record a failed API call and return the fallback response for it."""
+    record_api_error(api_error)
+    logger.error(f"Error with OpenAI API: {api_error}")
+    return get_fallback_response(user_message, reason=fallback_reason(api_error))
+
+def generate_response(user_message, history=None):
     """
     Generate a response to the user's message using OpenAI's GPT model or fallback to static responses.
     
     Args:
         user_message (str): The message from the user
+        history (list): Earlier turns of the conversation as chat messages (see conversation.build_context)
         
     Returns:
         str: The generated response
     """
     try:
-        # Check if the API key is available
-        if not OPENAI_API_KEY:
-            logger.error("OpenAI API key is not available.")
-            return get_fallback_response(user_message)
-        
-        # Detect if the user is asking about specific farming categories
-        farming_keywords = {
-            'weather': ['weather', 'rain', 'forecast', 'temperature', 'climate', 'monsoon', 'humidity'],
-            'crops': ['crop', 'plant', 'seed', 'harvest', 'cultivation', 'grow', 'yield'],
-            'schemes': ['scheme', 'subsidy', 'government', 'loan', 'grant', 'support', 'policy', 'program'],
-            'laws': ['law', 'regulation', 'legal', 'act', 'rule', 'compliance', 'guideline']
-        }
-        
-        category = 'general'
-        for key, keywords in farming_keywords.items():
-            if any(keyword in user_message.lower() for keyword in keywords):
-                category = key
-                break
-        
-        # Add category-specific guidance to the prompt
-        additional_context = ""
-        if category == 'weather':
-            additional_context = "Focus on weather implications for farming and practical advice related to the current weather conditions."
-        elif category == 'crops':
-            additional_context = "Provide detailed, practical information about crop cultivation, care, and best practices."
-        elif category == 'schemes':
-            additional_context = "Explain relevant government schemes for farmers clearly, including eligibility criteria and application process."
-        elif category == 'laws':
-            additional_context = "Explain farming laws and regulations in simple, accessible language, focusing on practical implications."
-        
-        # Create the complete prompt
-        content = f"{additional_context}\n\nFarmer's message: {user_message}"
+        response_text, call = _prepare_call(user_message, history)
+        if call is None:
+            return response_text
         
+        category, route, messages = call
+        started = time.monotonic()
         try:
-            # Try with gpt-4o first
-            # The newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": SYSTEM_MESSAGE},
-                    {"role": "user", "content": content}
-                ],
-                temperature=0.7,
-                max_tokens=800
+            response = call_openai(
+                client.chat.completions.create,
+                model=route.model,
+                messages=messages,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens
             )
-            
-            return response.choices[0].message.content.strip()
         except Exception as api_error:
-            logger.error(f"Error with OpenAI API: {api_error}")
             # Fall back to static responses
-            return get_fallback_response(user_message)
+            return _call_failed(user_message, api_error)
+        
+        response_text = response.choices[0].message.content.strip()
+        _finish_call(user_message, history, category, route, started, response_text, response.usage)
+        return response_text
     
     except Exception as e:
         logger.error(f"Error generating response: {e}")
         return get_fallback_response(user_message)
 
-def get_fallback_response(user_message):
+async def generate_response_async(user_message, history=None):
+    """
+    Async variant of generate_response for the ASGI serving path.
+    
+    Takes the same steps as generate_response but awaits the API call instead of
+    blocking a thread.
+    
+    Args:
+        user_message (str): The message from the user
+        history (list): Earlier turns of the conversation as chat messages (see conversation.build_context)
+        
+    Returns:
+        str: The generated response
+    """
+    try:
+        response_text, call = _prepare_call(user_message, history)
+        if call is None:
+            return response_text
+        
+        category, route, messages = call
+        started = time.monotonic()
+        try:
+            response = await call_openai_async(
+                async_client.chat.completions.create,
+                model=route.model,
+                messages=messages,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens
+            )
+        except Exception as api_error:
+            return _call_failed(user_message, api_error)
+        
+        response_text = response.choices[0].message.content.strip()
+        _finish_call(user_message, history, category, route, started, response_text, response.usage)
+        return response_text
+    
+    except Exception as e:
+        logger.error(f"Error generating response: {e}")
+        return get_fallback_response(user_message)
+
+def generate_response_stream(user_message, history=None):
+    """
+    Generate a response to the user's message, yielding text as the model produces it.
+    
+    Curated, cached and fallback responses are yielded as a single chunk. If the
+    API fails before any text is produced, the fallback response is yielded instead.
+    
+    Args:
+        user_message (str): The message from the user
+        history (list): Earlier turns of the conversation as chat messages (see conversation.build_context)
+        
+    Yields:
+        str: Successive pieces of the response
+    """
+    try:
+        response_text, call = _prepare_call(user_message, history)
+    except Exception as e:
+        logger.error(f"Error generating response: {e}")
+        yield get_fallback_response(user_message)
+        return
+    if call is None:
+        yield response_text
+        return
+    
+    category, route, messages = call
+    parts = []
+    usage = None
+    started = time.monotonic()
+    outcome_recorded = False
+    try:
+        try:
+            # The limiter slot is held until the stream has been read
+            stream = call_openai(
+                client.chat.completions.create,
+                keep_slot=True,
+                model=route.model,
+                messages=messages,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            try:
+                for chunk in stream:
+                    # The final chunk carries token usage and no choices
+                    if getattr(chunk, 'usage', None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        if not parts:
+                            text = text.lstrip()
+                        parts.append(text)
+                        yield text
+            finally:
+                openai_limiter.release()
+        except Exception as api_error:
+            outcome_recorded = True
+            fallback_response = _call_failed(user_message, api_error)
+            if not parts:
+                yield fallback_response
+            return
+        
+        outcome_recorded = True
+        _finish_call(user_message, history, category, route, started, "".join(parts).strip(), usage)
+    finally:
+        # A client that disconnects closes the generator at a yield (GeneratorExit, not an
+        # Exception); the breaker call must still be closed out or a half-open probe never ends
+        if not outcome_recorded:
+            if parts:
+                openai_breaker.record_success()
+            else:
+                openai_breaker.cancel()
+
+def record_call(category, route, seconds, usage=None):
+    """
+    Record latency and token usage of a successful OpenAI call.
+    
+    Args:
+        category (str): The message category (or farming information topic)
+        route (routing.Route): The route used for the call
+        seconds (float): Time from sending the request to the complete answer
+        usage: The usage object of the API response, if any
+    """
+    logger.info(f"OpenAI route '{route.name}' ({route.model}) answered in {seconds:.2f}s")
+    OPENAI_REQUEST_SECONDS.observe(seconds, category=category, model=route.model, route=route.name)
+    if usage is not None:
+        OPENAI_TOKENS.inc(usage.prompt_tokens or 0, category=category, model=route.model, type="prompt")
+        OPENAI_TOKENS.inc(usage.completion_tokens or 0, category=category, model=route.model, type="completion")
+
+def fallback_reason(error):
+    """
+    Name the reason a failed OpenAI call was answered with a fallback.
+    
+    Args:
+        error (Exception): The exception raised by the call
+        
+    Returns:
+        str: shed, timeout, rate_limited, upstream_error or api_error
+    """
+    if isinstance(error, RequestShed):
+        return "shed"
+    if isinstance(error, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(error, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(error, UPSTREAM_ERRORS):
+        return "upstream_error"
+    return "api_error"
+
+def get_response_cache_stats():
+    """
+    Get hit-rate statistics for the chat response cache.
+    
+    Returns:
+        dict: Response cache statistics
+    """
+    return response_cache.stats()
+
+def record_api_error(error):
+    """
+    Record a failed OpenAI call with the circuit breaker and in openai_errors_total.
+    
+    Only upstream problems (timeouts, connection errors, rate limits, 5XX) count
+    as failures; other errors mean the API answered and the circuit stays healthy.
+    Calls shed by the rate limiter never reached the API and count as neither.
+    
+    Args:
+        error (Exception): The exception raised by the OpenAI client
+    """
+    if isinstance(error, RequestShed):
+        openai_breaker.cancel()
+        return
+    OPENAI_ERRORS.inc(error=type(error).__name__)
+    if isinstance(error, UPSTREAM_ERRORS):
+        openai_breaker.record_failure()
+    else:
+        openai_breaker.record_success()
+
+def get_fallback_response(user_message, reason="error"):
     """
     Provide a fallback response when OpenAI API is unavailable.
     
     Args:
         user_message (str): The message from the user
+        reason (str): Why the fallback is served (counted in chat_fallbacks_total)
         
     Returns:
         str: A relevant fallback response based on the message content
     """
-    user_message = user_message.lower()
+    CHAT_FALLBACKS.inc(reason=reason)
+    CHAT_RESPONSES.inc(source="fallback")
+    category = intent.classify(user_message).category
     
-    # Check for common greeting patterns
-    if any(greeting in user_message for greeting in ['hello', 'hi', 'hey', 'greetings', 'namaste']):
+    if category == 'greeting':
         return "Hello! I'm your farming assistant. I can provide information about farming techniques, crops, government schemes, and weather-related advice. How can I help you today?"
     
-    # Check for farming techniques related queries
-    if any(keyword in user_message for keyword in ['technique', 'farming method', 'how to farm', 'cultivat', 'agriculture']):
+    if category == 'techniques':
         return """Here are some common farming techniques:
 
 1. **Organic Farming**: Uses natural methods without synthetic chemicals, focusing on soil health and biodiversity.
@@ -125,8 +560,7 @@ def get_fallback_response(user_message):
 
 Would you like more specific information about any of these techniques?"""
     
-    # Check for crop related queries
-    if any(keyword in user_message for keyword in ['crop', 'plant', 'seed', 'harvest', 'grow']):
+    if category == 'crops':
         return """Common crops and growing tips:
 
 1. **Rice**: Requires flooded conditions, transplanting in puddled soil, and proper water management.
@@ -139,8 +573,7 @@ Would you like more specific information about any of these techniques?"""
 
 For specific crop advice, please provide more details about your region and growing conditions."""
     
-    # Check for government scheme related queries
-    if any(keyword in user_message for keyword in ['scheme', 'subsidy', 'government', 'loan', 'support']):
+    if category == 'schemes':
         return """Key government schemes for farmers:
 
 1. **PM-KISAN**: Provides income support of ₹6,000 per year to eligible farmer families.
@@ -155,8 +588,7 @@ For specific crop advice, please provide more details about your region and grow
 
 For application procedures and eligibility criteria, please contact your local agriculture office."""
     
-    # Check for weather related queries
-    if any(keyword in user_message for keyword in ['weather', 'rain', 'climate', 'monsoon']):
+    if category == 'weather':
         return """Weather plays a crucial role in farming. Here are some general weather-related farming tips:
 
 1. Keep track of local weather forecasts to plan field operations.
@@ -171,7 +603,7 @@ For application procedures and eligibility criteria, please contact your local a
 
 For location-specific weather information, please use the weather widget in the sidebar."""
     
-    # Default response if no specific topic is detected
+    # Default response for laws and general questions
     return """I'm here to help with farming-related questions. I can provide information about:
 
 • Farming techniques and crop information
@@ -210,16 +642,35 @@ def get_farming_information(topic, query):
         
         user_prompt = f"Provide detailed information about: {query}\n\nRespond with a JSON object with the following structure: {{\"title\": \"...\", \"summary\": \"...\", \"details\": \"...\", \"recommendation\": \"...\"}}"
         
-        # The newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-        # do not change this unless explicitly requested by the user
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
+        if not openai_breaker.allow_request():
+            logger.warning("OpenAI circuit is open. Skipping farming information request.")
+            return {"error": "Service temporarily unavailable. Please try again later."}
+        
+        route = routing.ROUTES['information']
+        started = time.monotonic()
+        try:
+            # Background lookups queue behind interactive chat
+            response = call_openai(
+                client.chat.completions.create,
+                priority=PRIORITY_BACKGROUND,
+                model=route.model,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+        except RequestShed as shed_error:
+            record_api_error(shed_error)
+            logger.warning("OpenAI request queue is saturated. Skipping farming information request.")
+            return {"error": "Service is busy. Please try again shortly."}
+        except Exception as api_error:
+            record_api_error(api_error)
+            raise
+        openai_breaker.record_success()
+        record_call(topic, route, time.monotonic() - started, response.usage)
         
         return json.loads(response.choices[0].message.content)
     
@@ -0,0 +1,99 @@
+"""Pre-serialized, pre-compressed JSON responses with strong ETags for constant API payloads."""
+import os
+import gzip
+import json
+import hashlib
+import logging
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Seconds browsers may reuse a payload before revalidating it
+PAYLOAD_MAX_AGE = int(os.environ.get("PAYLOAD_MAX_AGE", "3600"))
+
+# Smaller bodies are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+# Content codings in order of preference
+_ENCODERS = [('br', lambda body: brotli.compress(body, quality=11))] if brotli else []
+_ENCODERS.append(('gzip', lambda body: gzip.compress(body, compresslevel=9, mtime=0)))
+
+class PreparedResponse:
+    """
+    A JSON payload serialized once, with compressed variants and strong ETags.
+
+    Each representation (identity, gzip, br) has its own ETag, as strong
+    validators must identify the exact bytes sent; they share the content hash
+    so a client holding any variant gets a 304.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data: The JSON-serializable payload
+        """
+        self.body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.variants = {'identity': self.body}
+        if len(self.body) >= MIN_COMPRESS_BYTES:
+            for encoding, compress in _ENCODERS:
+                compressed = compress(self.body)
+                if len(compressed) < len(self.body):
+                    self.variants[encoding] = compressed
+        self.etags = {encoding: self._etag(encoding) for encoding in self.variants}
+
+    def _etag(self, encoding):
+        return self.digest if encoding == 'identity' else f"{self.digest}-{encoding}"
+
+    def choose_encoding(self, accept_encodings):
+        """
+        Pick the best variant the client accepts.
+
+        Args:
+            accept_encodings: The request's parsed Accept-Encoding header
+
+        Returns:
+            str: 'br', 'gzip' or 'identity'
+        """
+        for encoding, _ in _ENCODERS:
+            if encoding in self.variants and accept_encodings[encoding]:
+                return encoding
+        return 'identity'
+
+    def send(self):
+        """
+        Build the response for the current request.
+
+        Returns:
+            Response: 304 if the client's copy is current, otherwise the best encoded variant
+        """
+        encoding = self.choose_encoding(request.accept_encodings)
+        headers = {
+            'ETag': f'"{self.etags[encoding]}"',
+            'Cache-Control': f"public, max-age={PAYLOAD_MAX_AGE}",
+            'Vary': 'Accept-Encoding'
+        }
+        # If-None-Match uses the weak comparison, so W/"<etag>" from a client or proxy also matches
+        if any(request.if_none_match.contains_weak(etag) for etag in self.etags.values()):
+            return Response(status=304, headers=headers)
+
+        body = self.variants[encoding]
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(body, content_type="application/json", headers=headers)
+
+    def stats(self):
+        """
+        Get payload sizes.
+
+        Returns:
+            dict: Size in bytes of each variant
+        """
+        return {encoding: len(body) for encoding, body in self.variants.items()}
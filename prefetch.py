@@ -0,0 +1,198 @@
+"""Background cache warming for the most requested weather locations."""
+import os
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func
+import weather
+from database import db, WeatherRequest
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Prefetch configuration
+PREFETCH_ENABLED = os.environ.get("WEATHER_PREFETCH_ENABLED", "false").lower() in ("1", "true", "yes")
+PREFETCH_TOP_N = int(os.environ.get("WEATHER_PREFETCH_TOP_N", "50"))
+PREFETCH_LOOKBACK_HOURS = float(os.environ.get("WEATHER_PREFETCH_LOOKBACK_HOURS", "72"))
+# Lock file that picks the one process on the host that prefetches
+PREFETCH_LOCK_PATH = os.environ.get(
+    "WEATHER_PREFETCH_LOCK_PATH",
+    os.path.join(tempfile.gettempdir(), "kissan-weather-prefetch.lock")
+)
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows): every process prefetches
+    fcntl = None
+
+def get_top_locations(limit=PREFETCH_TOP_N, lookback_hours=PREFETCH_LOOKBACK_HOURS):
+    """
+    Get the most requested locations from the weather request history.
+    
+    Location spellings that resolve to the same place are counted together.
+    Must be called inside an application context.
+    
+    Args:
+        limit (int): Maximum number of locations to return
+        lookback_hours (float): Only count requests made within this many hours
+        
+    Returns:
+        list: Location names, most requested first
+    """
+    since = datetime.utcnow() - timedelta(hours=lookback_hours)
+    rows = (
+        db.session.query(WeatherRequest.location, func.count(WeatherRequest.id).label('requests'))
+        .filter(WeatherRequest.timestamp >= since)
+        .group_by(WeatherRequest.location)
+        .order_by(func.count(WeatherRequest.id).desc())
+        .limit(limit * 4)
+        .all()
+    )
+    
+    counts = {}
+    names = {}
+    for location, requests_count in rows:
+        key, _ = weather.resolve_location(location)
+        counts[key] = counts.get(key, 0) + requests_count
+        names.setdefault(key, location)  # most requested spelling comes first
+    
+    ranked = sorted(counts, key=counts.get, reverse=True)[:limit]
+    return [names[key] for key in ranked]
+
+class PrefetchScheduler:
+    """
+    Periodically refresh the weather cache for the hottest locations.
+    
+    Each cycle computes the top-N locations and refreshes them one at a time,
+    spaced evenly across the cache TTL, so upstream quota use stays flat and
+    every popular location is refreshed before its entry expires.
+    
+    Every worker process may start a scheduler, but only the one holding an
+    exclusive lock on ``lock_path`` runs cycles; the others retry the lock
+    once per cycle, so a replacement takes over when the holder exits.
+    """
+    
+    def __init__(self, app, top_n=PREFETCH_TOP_N, cycle_seconds=None, lock_path=PREFETCH_LOCK_PATH):
+        """
+        Args:
+            app (Flask): The application, used for database access
+            top_n (int): Number of locations to keep warm
+            cycle_seconds (float, optional): Length of one refresh cycle (defaults to the cache TTL)
+            lock_path (str): Lock file shared by the processes on this host
+        """
+        self.app = app
+        self.top_n = top_n
+        self.cycle_seconds = cycle_seconds or weather.WEATHER_CACHE_TTL
+        self.lock_path = lock_path
+        self._lock_file = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start the scheduler thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weather-prefetch", daemon=True)
+        self._thread.start()
+        logger.info(f"Weather prefetch scheduler started for top {self.top_n} locations")
+    
+    def stop(self):
+        """Ask the scheduler thread to stop after its current refresh."""
+        self._stop.set()
+    
+    def run_cycle(self):
+        """
+        Refresh the current top locations once, spread across one cycle.
+        
+        Returns:
+            int: Number of locations refreshed
+        """
+        try:
+            with self.app.app_context():
+                locations = get_top_locations(self.top_n)
+        except Exception as e:
+            logger.error(f"Error loading top weather locations: {e}")
+            locations = []
+        
+        if not locations:
+            self._stop.wait(self.cycle_seconds)
+            return 0
+        
+        interval = self.cycle_seconds / len(locations)
+        refreshed = 0
+        for location in locations:
+            if self._stop.is_set():
+                break
+            try:
+                weather.refresh_weather_data(location)
+                refreshed += 1
+            except Exception as e:
+                logger.error(f"Error prefetching weather data for {location}: {e}")
+            self._stop.wait(interval)
+        
+        logger.debug(f"Prefetched weather data for {refreshed} locations")
+        return refreshed
+    
+    def holds_lock(self):
+        """
+        Take the host-wide prefetch lock if no other process holds it.
+        
+        Returns:
+            bool: True if this process holds the lock
+        """
+        if self._lock_file is not None or fcntl is None:
+            return True
+        try:
+            lock_file = open(self.lock_path, 'a')
+        except OSError as e:
+            logger.error(f"Cannot open prefetch lock {self.lock_path}: {e}")
+            return False
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info(f"Process {os.getpid()} holds the weather prefetch lock")
+        return True
+    
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                if self.holds_lock():
+                    self.run_cycle()
+                else:
+                    self._stop.wait(self.cycle_seconds)
+        finally:
+            if self._lock_file is not None:
+                self._lock_file.close()  # Releases the lock
+                self._lock_file = None
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def start_prefetch_scheduler(app):
+    """
+    Start this process's prefetch scheduler when enabled by configuration.
+    
+    Safe to call on every request: the scheduler is created once per process.
+    
+    Args:
+        app (Flask): The application
+        
+    Returns:
+        PrefetchScheduler: The running scheduler, or None if prefetching is disabled
+    """
+    global _scheduler
+    if not PREFETCH_ENABLED:
+        return None
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                scheduler = PrefetchScheduler(app)
+                scheduler.start()
+                _scheduler = scheduler
+    return _scheduler
@@ -0,0 +1,186 @@
+"""Token-bucket rate limiter with a bounded priority queue for calls to external services."""
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Longest sleep between checks for async waiters (they are not woken by release)
+ASYNC_POLL_INTERVAL = 0.05
+
+class RequestShed(Exception):
+    """Raised when a call is dropped because the queue is full or its wait deadline passed."""
+
+class RateLimiter:
+    """
+    Admit calls at a sustained rate, with bursts, a concurrency cap and a bounded wait queue.
+
+    Callers wait in a priority queue: a call may only take a token when no
+    higher-priority (or earlier, equal-priority) call is waiting. Calls that
+    cannot join the queue because it is full, or that wait longer than their
+    timeout, are refused so the caller can serve a fallback at once.
+
+    Every successful ``acquire`` must be followed by exactly one ``release``.
+    """
+
+    def __init__(self, name, rate=10.0, burst=20, max_concurrent=32, max_queue=200):
+        """
+        Args:
+            name (str): Name used in logs and stats
+            rate (float): Tokens added per second (sustained calls per second)
+            burst (int): Bucket size (calls that may start back to back)
+            max_concurrent (int): Calls allowed in flight at once
+            max_queue (int): Calls allowed to wait; further calls are refused
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._waiters = []               # heap of [priority, sequence, done]; done entries are skipped
+        self._waiting = 0
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """
+        Wait for permission to make a call.
+
+        Args:
+            priority (int): Queue priority (PRIORITY_INTERACTIVE before PRIORITY_BACKGROUND)
+            timeout (float): Longest time to wait in seconds, or None to wait indefinitely
+
+        Returns:
+            bool: True if the call may proceed, False if it was shed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            entry = self._enqueue(priority)
+            if entry is None:
+                return False
+            while True:
+                wait = self._try_take(entry)
+                if wait is None:
+                    return True
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._cancel(entry)
+                        return False
+                    wait = remaining if wait < 0 else min(wait, remaining)
+                self._cond.wait(None if wait < 0 else wait)
+
+    async def acquire_async(self, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """
+        Async variant of acquire that waits without blocking the event loop.
+
+        Args:
+            priority (int): Queue priority (PRIORITY_INTERACTIVE before PRIORITY_BACKGROUND)
+            timeout (float): Longest time to wait in seconds, or None to wait indefinitely
+
+        Returns:
+            bool: True if the call may proceed, False if it was shed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            entry = self._enqueue(priority)
+        if entry is None:
+            return False
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(entry)
+                    if wait is None:
+                        return True
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._cancel(entry)
+                        return False
+                await asyncio.sleep(ASYNC_POLL_INTERVAL if wait < 0 else min(wait, ASYNC_POLL_INTERVAL))
+        except asyncio.CancelledError:
+            with self._cond:
+                if not entry[2]:
+                    self._cancel(entry)
+            raise
+
+    def release(self):
+        """Mark an admitted call as finished."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Get limiter counters.
+
+        Returns:
+            dict: Calls admitted and shed, calls in flight and waiting, and available tokens
+        """
+        with self._cond:
+            self._refill()
+            return {
+                'admitted': self.admitted,
+                'shed_queue_full': self.shed_queue_full,
+                'shed_deadline': self.shed_deadline,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'tokens': round(self._tokens, 2)
+            }
+
+    def _enqueue(self, priority):
+        self._refill()
+        # A call that can start at once never counts against the queue bound
+        can_start = not self._waiting and self._tokens >= 1 and self._in_flight < self.max_concurrent
+        if self._waiting >= self.max_queue and not can_start:
+            self.shed_queue_full += 1
+            logger.warning(f"Rate limiter '{self.name}' queue is full; shedding call")
+            return None
+        entry = [priority, next(self._sequence), False]
+        heapq.heappush(self._waiters, entry)
+        self._waiting += 1
+        return entry
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, entry):
+        """Grant the entry a token if it heads the queue; otherwise return seconds to wait (-1 = until notified)."""
+        while self._waiters and self._waiters[0][2]:
+            heapq.heappop(self._waiters)
+        if self._waiters[0] is not entry or self._in_flight >= self.max_concurrent:
+            return -1
+        self._refill()
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        heapq.heappop(self._waiters)
+        entry[2] = True
+        self._waiting -= 1
+        self._tokens -= 1
+        self._in_flight += 1
+        self.admitted += 1
+        # The next waiter may be able to go as well
+        self._cond.notify_all()
+        return None
+
+    def _cancel(self, entry):
+        entry[2] = True
+        self._waiting -= 1
+        self.shed_deadline += 1
+        logger.warning(f"Rate limiter '{self.name}' wait deadline passed; shedding call")
+        self._cond.notify_all()
@@ -0,0 +1,219 @@
+"""Chat response cache that also serves near-duplicate questions using TF-IDF similarity."""
+import os
+import re
+import math
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Response cache configuration
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "86400"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+RESPONSE_CACHE_SIMILARITY = float(os.environ.get("RESPONSE_CACHE_SIMILARITY", "0.85"))
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words that carry no meaning for matching farmer questions
+STOPWORDS = frozenset("""
+a an and are as at be can could do does for from how i in is it me my of on or please
+should tell the to what when where which who why will with would you your about
+""".split())
+
+def normalize_message(message):
+    """
+    Normalize a chat message for exact cache lookups.
+
+    Args:
+        message (str): The message from the user
+
+    Returns:
+        str: The case-folded message with punctuation removed and whitespace collapsed
+    """
+    return " ".join(_TOKEN.findall(message.casefold()))
+
+def tokenize(message):
+    """
+    Split a message into content terms for similarity matching.
+
+    Args:
+        message (str): The message (raw or normalized)
+
+    Returns:
+        list: Terms with stopwords removed and a plural 's' stripped
+    """
+    terms = []
+    for token in _TOKEN.findall(message.casefold()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+class ResponseCache:
+    """
+    LRU cache of chat responses with TTL expiry and near-duplicate lookup.
+
+    Entries are keyed on (category, normalized message). A lookup that misses
+    the exact key searches same-category entries sharing at least one term and
+    returns the most similar one if its TF-IDF cosine similarity reaches
+    ``threshold``.
+    """
+
+    def __init__(self, max_entries=1000, ttl=86400, threshold=0.85):
+        """
+        Args:
+            max_entries (int): Maximum number of cached responses
+            ttl (float): Seconds a response stays valid
+            threshold (float): Minimum cosine similarity (0-1) for a near-duplicate hit
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries = OrderedDict()    # key -> (response, term counts, expires_at)
+        self._postings = {}              # (category, term) -> set of keys
+        self._doc_freq = Counter()       # term -> number of entries containing it
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, message, category):
+        """
+        Find a cached response for a message or a near-duplicate of it.
+
+        Args:
+            message (str): The message from the user
+            category (str): The detected message category
+
+        Returns:
+            str: The cached response, or None on a miss
+        """
+        key = (category, normalize_message(message))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+
+            best_key, best_score = self._most_similar(category, Counter(tokenize(message)), now)
+            if best_key is not None and best_score >= self.threshold:
+                self._entries.move_to_end(best_key)
+                self.similar_hits += 1
+                logger.debug(f"Response cache near-duplicate hit (similarity {best_score:.2f})")
+                return self._entries[best_key][0]
+
+            self.misses += 1
+            return None
+
+    def set(self, message, category, response):
+        """
+        Cache a response for a message.
+
+        Args:
+            message (str): The message from the user
+            category (str): The detected message category
+            response (str): The response to cache
+        """
+        key = (category, normalize_message(message))
+        terms = Counter(tokenize(message))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, terms, time.monotonic() + self.ttl)
+            for term in terms:
+                self._postings.setdefault((category, term), set()).add(key)
+                self._doc_freq[term] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._doc_freq.clear()
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Exact hits, near-duplicate hits, misses, evictions, size and hit rate
+        """
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0
+            }
+
+    def _remove(self, key):
+        _, terms, _ = self._entries.pop(key)
+        category = key[0]
+        for term in terms:
+            postings = self._postings.get((category, term))
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[(category, term)]
+            self._doc_freq[term] -= 1
+            if self._doc_freq[term] <= 0:
+                del self._doc_freq[term]
+
+    def _idf(self, term):
+        return math.log((1 + len(self._entries)) / (1 + self._doc_freq.get(term, 0))) + 1
+
+    def _vector(self, terms):
+        vector = {term: count * self._idf(term) for term, count in terms.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return vector, norm
+
+    def _most_similar(self, category, terms, now):
+        """Return the live same-category entry most similar to the terms, with its score."""
+        if not terms:
+            return None, 0.0
+
+        candidates = set()
+        for term in terms:
+            candidates.update(self._postings.get((category, term), ()))
+        if not candidates:
+            return None, 0.0
+
+        query, query_norm = self._vector(terms)
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            _, entry_terms, expires_at = self._entries[key]
+            if expires_at <= now:
+                continue
+            vector, norm = self._vector(entry_terms)
+            if not norm:
+                continue
+            score = sum(weight * vector.get(term, 0.0) for term, weight in query.items()) / (query_norm * norm)
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+# Shared cache used by openai_service.generate_response
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=RESPONSE_CACHE_TTL,
+    threshold=RESPONSE_CACHE_SIMILARITY
+)
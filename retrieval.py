@@ -0,0 +1,154 @@
+"""Retrieval over the curated farming data for grounding and answering chat questions."""
+import os
+import logging
+import farming_data
+from response_cache import tokenize
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Retrieval configuration
+RETRIEVAL_ENABLED = os.environ.get("RETRIEVAL_ENABLED", "true").lower() in ("1", "true", "yes")
+RETRIEVAL_TOP_K = int(os.environ.get("RETRIEVAL_TOP_K", "3"))
+RETRIEVAL_MIN_SCORE = float(os.environ.get("RETRIEVAL_MIN_SCORE", "1.0"))
+RETRIEVAL_SNIPPET_CHARS = int(os.environ.get("RETRIEVAL_SNIPPET_CHARS", "400"))
+# Answer straight from a curated entry when a short query names exactly one entry
+RETRIEVAL_DIRECT_ANSWERS = os.environ.get("RETRIEVAL_DIRECT_ANSWERS", "true").lower() in ("1", "true", "yes")
+RETRIEVAL_DIRECT_MAX_TERMS = int(os.environ.get("RETRIEVAL_DIRECT_MAX_TERMS", "4"))
+
+# Query words that say what kind of entry is wanted rather than which one
+_GENERIC_TERMS = frozenset(tokenize("""
+scheme law act rule regulation crop technique practice method information info detail
+explain know meaning define definition
+"""))
+
+_KIND_LABELS = {
+    'crops': 'Crop',
+    'techniques': 'Farming technique',
+    'soil_management': 'Soil management',
+    'schemes': 'Government scheme',
+    'laws': 'Farming law'
+}
+
+def _title_index(documents):
+    """Map each term in an entry name to the IDs of the entries it names."""
+    index = {}
+    for document in documents:
+        for term in document['title_terms']:
+            index.setdefault(term, set()).add(document['id'])
+    return index
+
+def _names_by_term():
+    """Return the title index for the current generation of the farming data."""
+    return farming_data.knowledge.derived(
+        'title_index', lambda: _title_index(farming_data.get_search_index().documents)
+    )
+
+def retrieve(query, k=RETRIEVAL_TOP_K):
+    """
+    Find the curated entries most relevant to a query.
+
+    Args:
+        query (str): The message from the user
+        k (int): Maximum number of entries
+
+    Returns:
+        list: (score, document) tuples scoring at least RETRIEVAL_MIN_SCORE, best first
+    """
+    return [(score, doc) for score, doc in farming_data.get_search_index().search(query, limit=k) if score >= RETRIEVAL_MIN_SCORE]
+
+def snippet(document, max_chars=RETRIEVAL_SNIPPET_CHARS):
+    """
+    Summarize an entry in one line for the prompt.
+
+    Args:
+        document (dict): A search document
+        max_chars (int): Maximum snippet length
+
+    Returns:
+        str: "Kind - Name: details", truncated to max_chars ("" if the entry was removed by a reload)
+    """
+    item = farming_data.get_entry(document['id'])
+    if item is None:
+        return ""
+    fields = farming_data.search_fields(item)
+    text = f"{_KIND_LABELS.get(document['kind'], document['kind'])} - {fields['name']}: {fields['description']} {fields['details']}"
+    if len(text) > max_chars:
+        text = text[:max_chars - 3].rstrip() + "..."
+    return text
+
+def context_for(query):
+    """
+    Build the reference block injected into the model prompt.
+
+    Args:
+        query (str): The message from the user
+
+    Returns:
+        str: Bulleted snippets of the top matching entries, or "" if nothing matches
+    """
+    if not RETRIEVAL_ENABLED:
+        return ""
+    hits = retrieve(query)
+    if not hits:
+        return ""
+    snippets = [text for text in (snippet(doc) for _, doc in hits) if text]
+    if not snippets:
+        return ""
+    lines = "\n".join(f"- {text}" for text in snippets)
+    return f"Reference information (use it if relevant):\n{lines}"
+
+def format_entry(item):
+    """
+    Render a curated entry as a chat answer.
+
+    Args:
+        item (dict): A crop, technique, scheme or law entry
+
+    Returns:
+        str: Markdown text with the entry name as heading and one section per field
+    """
+    parts = [f"**{item['name']}**"]
+    for key, value in item.items():
+        if key == 'name':
+            continue
+        label = key.replace('_', ' ').capitalize()
+        if key == 'description':
+            parts.append(str(value))
+        elif isinstance(value, list):
+            parts.append(f"**{label}:**\n" + "\n".join(f"• {entry}" for entry in value))
+        else:
+            parts.append(f"**{label}:** {value}")
+    return "\n\n".join(parts)
+
+def direct_answer(query):
+    """
+    Answer a simple question straight from the curated data.
+
+    A query qualifies when it has at most RETRIEVAL_DIRECT_MAX_TERMS specific
+    terms and exactly one entry name contains all of them ("what is PM-KISAN",
+    "tell me about rice").
+
+    Args:
+        query (str): The message from the user
+
+    Returns:
+        str: The formatted entry, or None if the query should go to the model
+    """
+    if not (RETRIEVAL_ENABLED and RETRIEVAL_DIRECT_ANSWERS):
+        return None
+    terms = set(tokenize(query)) - _GENERIC_TERMS
+    if not terms or len(terms) > RETRIEVAL_DIRECT_MAX_TERMS:
+        return None
+
+    names_by_term = _names_by_term()
+    named = set.intersection(*(names_by_term.get(term, set()) for term in terms))
+    if len(named) != 1:
+        return None
+    entry_id = named.pop()
+    item = farming_data.get_entry(entry_id)
+    if item is None:
+        return None
+    logger.debug(f"Answering from curated entry {entry_id}")
+    return format_entry(item)
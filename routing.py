@@ -0,0 +1,81 @@
+"""Model routing: pick the OpenAI model and output budget for each chat request."""
+import os
+import json
+import logging
+from collections import namedtuple
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+Route = namedtuple('Route', ['name', 'model', 'max_tokens', 'temperature'])
+
+# Default policy, keyed by route name. Category routes use the intent category
+# (see intent.py); 'simple' serves short standalone questions of any topic, and
+# 'information' serves get_farming_information lookups.
+DEFAULT_ROUTES = {
+    'greeting': {'model': 'gpt-4o-mini', 'max_tokens': 150, 'temperature': 0.7},
+    'simple': {'model': 'gpt-4o-mini', 'max_tokens': 350, 'temperature': 0.5},
+    'weather': {'model': 'gpt-4o', 'max_tokens': 600, 'temperature': 0.7},
+    'crops': {'model': 'gpt-4o', 'max_tokens': 800, 'temperature': 0.7},
+    'techniques': {'model': 'gpt-4o', 'max_tokens': 800, 'temperature': 0.7},
+    'schemes': {'model': 'gpt-4o-mini', 'max_tokens': 600, 'temperature': 0.3},
+    'laws': {'model': 'gpt-4o-mini', 'max_tokens': 600, 'temperature': 0.3},
+    'general': {'model': 'gpt-4o', 'max_tokens': 800, 'temperature': 0.7},
+    'information': {'model': 'gpt-4o', 'max_tokens': 1500, 'temperature': 0.5}
+}
+
+# Questions of at most this many words, asked without earlier turns, take the 'simple' route
+ROUTING_SIMPLE_MAX_WORDS = int(os.environ.get("ROUTING_SIMPLE_MAX_WORDS", "10"))
+
+# Categories whose own route is already cheaper than 'simple'
+_KEEP_CATEGORY_ROUTE = {'greeting'}
+
+def load_routes(overrides=None):
+    """
+    Build the routing table from the defaults and JSON overrides.
+
+    Args:
+        overrides (str): JSON object mapping route names to partial route settings,
+            e.g. '{"simple": {"model": "gpt-4o"}, "laws": {"max_tokens": 400}}'
+
+    Returns:
+        dict: Route name to Route
+    """
+    table = {name: dict(settings) for name, settings in DEFAULT_ROUTES.items()}
+    if overrides:
+        try:
+            for name, settings in json.loads(overrides).items():
+                table.setdefault(name, dict(DEFAULT_ROUTES['general'])).update(settings)
+            return _to_routes(table)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            logger.error(f"Ignoring invalid OPENAI_ROUTES: {e}")
+    return _to_routes(DEFAULT_ROUTES)
+
+def _to_routes(table):
+    return {
+        name: Route(name, str(settings['model']), int(settings['max_tokens']), float(settings['temperature']))
+        for name, settings in table.items()
+    }
+
+ROUTES = load_routes(os.environ.get("OPENAI_ROUTES"))
+
+def choose_route(category, user_message, history=None):
+    """
+    Pick the route for a chat message.
+
+    Args:
+        category (str): The detected message category
+        user_message (str): The message from the user
+        history (list): Earlier turns sent with the message, if any
+
+    Returns:
+        Route: The model, max_tokens and temperature to use
+    """
+    if (category not in _KEEP_CATEGORY_ROUTE and not history
+            and len(user_message.split()) <= ROUTING_SIMPLE_MAX_WORDS):
+        route = ROUTES['simple']
+    else:
+        route = ROUTES.get(category, ROUTES['general'])
+    logger.info(f"Routing {category} message to '{route.name}' ({route.model}, max_tokens={route.max_tokens})")
+    return route
@@ -0,0 +1,126 @@
+"""In-memory BM25 search index over short text documents."""
+import math
+import bisect
+import heapq
+import logging
+from collections import Counter
+from response_cache import tokenize
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking over documents made of named text fields.
+
+    Term frequencies are weighted per field (BM25F-style), so a match in a
+    document's title can count for more than a match in its body. A query only
+    visits the postings of its own terms (and, with prefix matching, of the
+    indexed terms they are a prefix of), so its cost grows with the number of
+    matches rather than with the number of documents.
+    """
+
+    # Shortest query term expanded to the indexed terms it is a prefix of
+    MIN_PREFIX_LENGTH = 3
+    # Most indexed terms one query term may expand to
+    MAX_PREFIX_EXPANSIONS = 50
+    # Score factor for a prefix match relative to an exact match
+    PREFIX_WEIGHT = 0.7
+
+    def __init__(self, documents, field_weights=None, k1=1.2, b=0.75):
+        """
+        Args:
+            documents (list): Dicts with an 'id' and a 'fields' dict of field name to text;
+                the other keys are kept and returned with search results ('fields' is not kept)
+            field_weights (dict): Weight per field name (fields not listed weigh 1.0)
+            k1 (float): BM25 term-frequency saturation
+            b (float): BM25 length normalization (0-1)
+        """
+        self.field_weights = field_weights or {}
+        self.k1 = k1
+        self.b = b
+        self.documents = []
+        self._postings = {}      # term -> {doc index: weighted term frequency}
+        self._lengths = []       # weighted document lengths
+        for document in documents:
+            self._add(document)
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        self._idf = {
+            term: math.log(1 + (len(self.documents) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        self._terms = sorted(self._postings)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _add(self, document):
+        index = len(self.documents)
+        self.documents.append({key: value for key, value in document.items() if key != 'fields'})
+        frequencies = Counter()
+        length = 0.0
+        for field, text in document['fields'].items():
+            weight = self.field_weights.get(field, 1.0)
+            terms = tokenize(text)
+            length += weight * len(terms)
+            for term in terms:
+                frequencies[term] += weight
+        self._lengths.append(length)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[index] = frequency
+
+    def search(self, query, limit=10, prefix=False):
+        """
+        Rank documents against a query.
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results
+            prefix (bool): Also match indexed terms that start with a query term
+
+        Returns:
+            list: (score, document) tuples, best first
+        """
+        return self.search_page(query, limit=limit, prefix=prefix)[1]
+
+    def search_page(self, query, limit=10, offset=0, prefix=False):
+        """
+        Rank documents against a query and return one page of results.
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results
+            offset (int): Number of top results to skip
+            prefix (bool): Also match indexed terms that start with a query term
+
+        Returns:
+            tuple: (total number of matching documents, list of (score, document) tuples, best first)
+        """
+        scores = {}
+        for term in set(tokenize(query)):
+            # Per document, a query term counts once: its best exact or prefix match
+            best = {}
+            for indexed_term, weight in self._expand(term, prefix):
+                idf = self._idf[indexed_term] * weight
+                for index, frequency in self._postings[indexed_term].items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / self._avg_length)
+                    score = idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    if score > best.get(index, 0.0):
+                        best[index] = score
+            for index, score in best.items():
+                scores[index] = scores.get(index, 0.0) + score
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])[offset:]
+        return len(scores), [(score, self.documents[index]) for index, score in top]
+
+    def _expand(self, term, prefix):
+        """Return (indexed term, weight) pairs a query term matches."""
+        matches = [(term, 1.0)] if term in self._postings else []
+        if prefix and len(term) >= self.MIN_PREFIX_LENGTH:
+            start = bisect.bisect_right(self._terms, term)
+            for indexed_term in self._terms[start:start + self.MAX_PREFIX_EXPANSIONS]:
+                if not indexed_term.startswith(term):
+                    break
+                matches.append((indexed_term, self.PREFIX_WEIGHT))
+        return matches
@@ -121,10 +121,153 @@ function processQuickCommands(message) {
 }
 
 /**
- * Send a message to the backend for processing
+ * Send a message to the backend for processing, streaming the response when supported
  * @param {string} message - The user's message
  */
 function sendMessageToBackend(message) {
+    if (!window.ReadableStream || !window.TextDecoder) {
+        sendMessageToBackendJSON(message);
+        return;
+    }
+    
+    let botMessage = null;
+    
+    streamMessageFromBackend(message, (token) => {
+        if (!botMessage) {
+            // Replace the typing indicator with the message as soon as text arrives
+            hideTypingIndicator();
+            isTyping = true;
+            botMessage = createStreamingBotMessage();
+        }
+        botMessage.append(token);
+    })
+    .then(() => {
+        isTyping = false;
+        if (botMessage) {
+            botMessage.finish();
+        } else {
+            hideTypingIndicator();
+            addBotMessage("I'm sorry, I couldn't process your request. Please try again.");
+        }
+    })
+    .catch(error => {
+        console.error('Streaming error:', error);
+        isTyping = false;
+        if (botMessage) {
+            botMessage.finish();
+        } else {
+            // Nothing was shown yet, so retry without streaming
+            sendMessageToBackendJSON(message);
+        }
+    });
+}
+
+/**
+ * Post a message to the streaming endpoint and pass each token to a callback
+ * @param {string} message - The user's message
+ * @param {function} onToken - Called with each piece of response text
+ * @returns {Promise} - Resolves when the stream is complete
+ */
+async function streamMessageFromBackend(message, onToken) {
+    const response = await fetch('/api/chat/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream'
+        },
+        body: JSON.stringify({ message })
+    });
+    
+    if (!response.ok || !response.body) {
+        throw new Error('Network response was not ok');
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            return;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        
+        // Server-sent events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let eventName = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    eventName = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    data += line.slice(5).trim();
+                }
+            });
+            
+            if (eventName === 'done') {
+                return;
+            }
+            if (data) {
+                const payload = JSON.parse(data);
+                if (payload.token) {
+                    onToken(payload.token);
+                }
+            }
+        }
+    }
+}
+
+/**
+ * Create a bot message that is filled in as response text streams in
+ * @returns {object} - Handle with append(text) and finish() methods
+ */
+function createStreamingBotMessage() {
+    const messageElement = document.createElement('div');
+    messageElement.className = 'message bot-message';
+    messageElement.innerHTML = `
+        <div class="bot-avatar">
+            <i class="fas fa-robot"></i>
+        </div>
+        <div class="message-content"></div>
+    `;
+    chatMessages.appendChild(messageElement);
+    
+    const content = messageElement.querySelector('.message-content');
+    let text = '';
+    let renderPending = false;
+    
+    // Re-render at most once per animation frame
+    const render = () => {
+        renderPending = false;
+        content.innerHTML = formatMessage(text);
+        scrollToBottom();
+    };
+    
+    return {
+        append(token) {
+            text += token;
+            if (!renderPending) {
+                renderPending = true;
+                window.requestAnimationFrame(render);
+            }
+        },
+        finish() {
+            render();
+            conversationHistory.push({ role: 'assistant', content: text });
+        }
+    };
+}
+
+/**
+ * Send a message to the backend and wait for the complete response
+ * @param {string} message - The user's message
+ */
+function sendMessageToBackendJSON(message) {
     fetch('/api/chat', {
         method: 'POST',
         headers: {
@@ -332,6 +475,7 @@ function updateWeatherWidget() {
     weatherWidget.innerHTML = `
         <div class="weather-header">
             <h3>Weather: ${weatherData.location}</h3>
+            ${weatherData.match ? `<p class="weather-match">Showing ${weatherData.location}, the closest match to your search</p>` : ''}
         </div>
         <div class="weather-current">
             <div class="weather-icon">
@@ -0,0 +1,12 @@
+"""Shared pytest setup: import modules from the repository root and keep test data out of it."""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Modules read their configuration at import, so set it before any test imports them
+_scratch = tempfile.mkdtemp(prefix="kissan-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_scratch, 'test.db')}")
+os.environ.setdefault("WEATHER_PREFETCH_ENABLED", "false")
@@ -0,0 +1,154 @@
+"""Tests for the Flask API routes."""
+import pytest
+
+import app as app_module
+import farming_data
+from database import WeatherRequest, db
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize("query", [
+    "limit=0", "limit=51", "limit=-3", "limit=ten", "offset=-1", "offset=1.5",
+])
+def test_search_rejects_bad_paging(client, query):
+    response = client.get(f"/api/farming/search?q=rice&{query}")
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_search_pages(client):
+    response = client.get(f"/api/farming/search?q=rice&limit={app_module.FARMING_SEARCH_MAX_LIMIT}&offset=0")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['limit'] == app_module.FARMING_SEARCH_MAX_LIMIT
+    assert body['results']
+
+
+def test_search_error_is_500(client, monkeypatch):
+    monkeypatch.setattr(farming_data, "search_farming_data", lambda *args, **kwargs: {"error": "boom"})
+    assert client.get("/api/farming/search?q=rice").status_code == 500
+
+
+def test_search_needs_a_query(client):
+    assert client.get("/api/farming/search?q=%20").status_code == 400
+
+
+@pytest.mark.parametrize("query", ["limit=ten", "limit=1.5", "limit=0", "limit=-3", "limit=101", "limit=&fields=name"])
+def test_farming_list_rejects_bad_limit(client, query):
+    response = client.get(f"/api/farming/laws?{query}")
+    assert response.status_code == 400
+    assert 'limit' in response.get_json()['error']
+
+
+def test_farming_list_pages(client):
+    first = client.get("/api/farming/laws?limit=2&fields=name").get_json()
+    assert len(first['items']) == 2 and first['items'][0].keys() == {'name'}
+    second = client.get(f"/api/farming/laws?limit=2&fields=name&cursor={first['next_cursor']}").get_json()
+    assert second['items'] and second['items'][0] not in first['items']
+    assert client.get("/api/farming/laws?limit=100").status_code == 200
+
+
+def test_stream_answers_without_history_when_context_fails(client, monkeypatch):
+    def broken_execute(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    seen = []
+
+    def stream(user_message, history=None):
+        seen.append(history)
+        yield "Sow after the first rains."
+
+    # build_context reports a failed history query as no history
+    monkeypatch.setattr(db.session, "execute", broken_execute)
+    monkeypatch.setattr(app_module.openai_service, "generate_response_stream", stream)
+
+    response = client.post("/api/chat/stream", json={"message": "When should I sow maize?"})
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "Sow after the first rains." in body
+    assert "event: done" in body
+    assert seen == [[]]
+
+
+def _weather(location, temperature):
+    return {'location': location, 'current': {'temperature': temperature, 'humidity': 55, 'description': 'haze'}}
+
+
+def _weather_rows(session_id):
+    with app_module.app.app_context():
+        rows = db.session.query(WeatherRequest).filter_by(session_id=session_id).order_by(WeatherRequest.id)
+        return [(row.location, row.temperature, row.humidity, row.description) for row in rows]
+
+
+def _session_id(client):
+    with client.session_transaction() as session:
+        return session['session_id']
+
+
+def test_weather_batch_saves_one_row_per_location(client, monkeypatch):
+    requested = []
+
+    def get_weather_batch(locations):
+        requested.append(locations)
+        return {location: _weather(location, 20 + i) for i, location in enumerate(locations)}
+
+    monkeypatch.setattr(app_module.weather, "get_weather_batch", get_weather_batch)
+    response = client.post("/api/weather/batch", json={"locations": ["Pune", "Nashik", "Nagpur"]})
+    assert response.status_code == 200
+    assert response.get_json()["Nashik"]['current']['temperature'] == 21
+    assert requested == [["Pune", "Nashik", "Nagpur"]]
+    assert _weather_rows(_session_id(client)) == [
+        ("Pune", 20, 55, 'haze'), ("Nashik", 21, 55, 'haze'), ("Nagpur", 22, 55, 'haze')
+    ]
+
+
+def test_weather_batch_returns_fallback_for_failed_locations(client, monkeypatch):
+    monkeypatch.setattr(app_module.weather, "get_weather_batch", lambda locations: {
+        "Pune": _weather("Pune", 31), "Atlantis": app_module.weather.get_fallback_weather_data("Atlantis")
+    })
+    response = client.post("/api/weather/batch", json={"locations": ["Pune", "Atlantis"]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'error' not in body["Pune"]
+    assert 'error' in body["Atlantis"]
+    # The fallback's 'N/A' readings are stored as NULL
+    assert _weather_rows(_session_id(client)) == [
+        ("Pune", 31, 55, 'haze'), ("Atlantis", None, None, 'Weather data unavailable')
+    ]
+
+
+def test_weather_batch_answers_when_saving_fails(client, monkeypatch):
+    monkeypatch.setattr(app_module.weather, "get_weather_batch",
+                        lambda locations: {location: _weather(location, 25) for location in locations})
+
+    def broken_execute(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(db.session, "execute", broken_execute)
+    response = client.post("/api/weather/batch", json={"locations": ["Pune"]})
+    assert response.status_code == 200
+    assert response.get_json()["Pune"]['current']['temperature'] == 25
+
+
+@pytest.mark.parametrize("payload", [
+    {}, {"locations": []}, {"locations": "Pune"}, {"locations": ["Pune", " "]}, {"locations": ["Pune", 7]},
+])
+def test_weather_batch_rejects_bad_locations(client, payload):
+    response = client.post("/api/weather/batch", json=payload)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_weather_batch_size_limit(client, monkeypatch):
+    monkeypatch.setattr(app_module, "WEATHER_BATCH_MAX_LOCATIONS", 3)
+    monkeypatch.setattr(app_module.weather, "get_weather_batch",
+                        lambda locations: {location: _weather(location, 25) for location in locations})
+    assert client.post("/api/weather/batch", json={"locations": ["A", "B", "C"]}).status_code == 200
+    response = client.post("/api/weather/batch", json={"locations": ["A", "B", "C", "D"]})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "At most 3 locations per request"
@@ -0,0 +1,107 @@
+"""Tests for the ASGI chat route and its sharing of the Flask session cookie."""
+import asyncio
+import json
+from http.cookies import SimpleCookie
+
+import pytest
+
+import app as app_module
+import asgi
+import openai_service
+from database import ChatMessage, db
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Answer chats without OpenAI; records the history each call was given."""
+    histories = []
+
+    def generate_response(user_message, history=None):
+        histories.append(history)
+        return f"answer to {user_message}"
+
+    async def generate_response_async(user_message, history=None):
+        return generate_response(user_message, history)
+
+    monkeypatch.setattr(openai_service, "generate_response", generate_response)
+    monkeypatch.setattr(openai_service, "generate_response_async", generate_response_async)
+    return histories
+
+
+def _asgi_chat(message, cookie=None):
+    """Post a message to the ASGI chat route; returns (status, headers, JSON body)."""
+    headers = [(b'content-type', b'application/json')]
+    if cookie:
+        headers.append((b'cookie', cookie.encode('latin-1')))
+    scope = {'type': 'http', 'method': 'POST', 'path': '/api/chat', 'headers': headers, 'query_string': b''}
+    body = json.dumps({'message': message}).encode('utf-8')
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(event):
+        sent.append(event)
+
+    asyncio.run(asgi.application(scope, receive, send))
+    start, content = sent
+    return start['status'], start['headers'], json.loads(content['body'])
+
+
+def _session_cookie(set_cookie):
+    """Return 'name=value' for the Flask session cookie in a Set-Cookie header value."""
+    name = app_module.app.config['SESSION_COOKIE_NAME']
+    return f"{name}={SimpleCookie(set_cookie)[name].value}"
+
+
+def _session_ids(message):
+    with app_module.app.app_context():
+        return [row.session_id for row in db.session.query(ChatMessage).filter_by(user_message=message)]
+
+
+def test_flask_session_is_used_by_asgi_chat(client, answers):
+    assert client.post('/api/chat', json={'message': 'flask first'}).status_code == 200
+    cookie = client.get_cookie(app_module.app.config['SESSION_COOKIE_NAME'])
+
+    status, headers, body = _asgi_chat('asgi second', f"{cookie.key}={cookie.value}")
+    assert status == 200
+    assert body == {'response': 'answer to asgi second'}
+    # The session already exists, so no new cookie is set
+    assert not [value for name, value in headers if name == b'set-cookie']
+    assert _session_ids('asgi second') == _session_ids('flask first')
+    # The earlier Flask turn is part of the history sent with the ASGI turn
+    assert answers[-1][0] == {'role': 'user', 'content': 'flask first'}
+
+
+def test_asgi_session_cookie_is_read_by_flask(client, answers):
+    status, headers, _ = _asgi_chat('asgi first')
+    assert status == 200
+    set_cookies = [value.decode('latin-1') for name, value in headers if name == b'set-cookie']
+    assert len(set_cookies) == 1
+    assert 'HttpOnly' in set_cookies[0]
+
+    name, value = _session_cookie(set_cookies[0]).split('=', 1)
+    client.set_cookie(name, value)
+    assert client.post('/api/chat', json={'message': 'flask second'}).status_code == 200
+    assert _session_ids('flask second') == _session_ids('asgi first')
+
+
+def test_tampered_session_cookie_starts_a_new_session(answers):
+    _, headers, _ = _asgi_chat('original session')
+    cookie = _session_cookie([value for name, value in headers if name == b'set-cookie'][0].decode('latin-1'))
+
+    _, headers, _ = _asgi_chat('tampered session', cookie[:-2] + ('A' if cookie[-2] != 'A' else 'B') + cookie[-1])
+    assert [value for name, value in headers if name == b'set-cookie']
+    assert _session_ids('tampered session') != _session_ids('original session')
+
+
+def test_asgi_chat_needs_a_message(answers):
+    status, _, body = _asgi_chat('')
+    assert status == 400
+    assert 'error' in body
@@ -0,0 +1,152 @@
+"""Tests for the TTL/LRU cache, the shared SQLite cache and request coalescing."""
+import threading
+import time
+
+import pytest
+
+import cache
+from cache import CACHE_HIT, CACHE_MISS, CACHE_STALE, SingleFlight, SQLiteCache, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control time.monotonic and time.time as seen by cache.py."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_ttl_expiry(clock):
+    entries = TTLCache(max_entries=4, ttl=10)
+    entries.set("a", 1)
+    assert entries.get("a") == (1, CACHE_HIT)
+    clock[0] += 10
+    assert entries.get("a") == (None, CACHE_MISS)
+    assert len(entries) == 0
+    assert entries.stats()['expirations'] == 1
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    entries = TTLCache(ttl=10)
+    entries.set("short", 1, ttl=2)
+    entries.set("long", 2)
+    clock[0] += 5
+    assert entries.get("short") == (None, CACHE_MISS)
+    assert entries.get("long") == (2, CACHE_HIT)
+
+
+def test_stale_while_revalidate(clock):
+    entries = TTLCache(ttl=10, stale_ttl=20)
+    entries.set("a", 1)
+    clock[0] += 15
+    assert entries.get("a") == (1, CACHE_STALE)
+    clock[0] += 15
+    assert entries.get("a") == (None, CACHE_MISS)
+    stats = entries.stats()
+    assert (stats['stale_hits'], stats['misses']) == (1, 1)
+
+
+def test_lru_eviction(clock):
+    entries = TTLCache(max_entries=2, ttl=10)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    entries.get("a")          # "b" is now least recently used
+    entries.set("c", 3)
+    assert entries.get("b") == (None, CACHE_MISS)
+    assert entries.get("a") == (1, CACHE_HIT)
+    assert entries.get("c") == (3, CACHE_HIT)
+    assert entries.stats()['evictions'] == 1
+
+
+def test_single_flight_collapses_concurrent_callers():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"temp": 30}
+
+    callers = 8
+    results = [None] * callers
+
+    def caller(index):
+        results[index] = flights.do("pune", fetch)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: flights.stats()['shared'] == callers - 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert flights.stats() == {'executions': 1, 'shared': callers - 1, 'in_flight': 0}
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ConnectionError("upstream down")
+
+    errors = []
+
+    def caller():
+        try:
+            flights.do("pune", fetch)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: flights.stats()['shared'] == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert errors[0] is errors[1] is errors[2]
+    assert not flights.in_flight("pune")
+    # A later call runs again instead of reusing the failure
+    assert flights.do("pune", lambda: "ok") == "ok"
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "shared" / "weather.db")
+    writer = SQLiteCache(path, ttl=60)
+    writer.set("in:maharashtra:pune", {"current": {"temp": 31.5}})
+
+    reader = SQLiteCache(path, ttl=60)
+    value, status, remaining = reader.lookup("in:maharashtra:pune")
+    assert (value, status) == ({"current": {"temp": 31.5}}, CACHE_HIT)
+    assert 0 < remaining <= 60
+    assert len(reader) == 1
+    mode = reader._connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_sqlite_cache_stale_window_and_purge(tmp_path, clock):
+    entries = SQLiteCache(str(tmp_path / "weather.db"), ttl=10, stale_ttl=20)
+    entries.set("a", [1])
+    entries.set("b", [2], ttl=100)
+    clock[0] += 15
+    assert entries.get("a") == ([1], CACHE_STALE)
+    clock[0] += 20
+    assert entries.get("a") == (None, CACHE_MISS)
+    assert entries.purge_expired() == 1
+    assert entries.get("b") == ([2], CACHE_HIT)
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
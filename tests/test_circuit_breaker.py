@@ -0,0 +1,75 @@
+"""Tests for the circuit breaker state machine."""
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def half_open():
+    """A breaker that has opened and is ready to let one probe through."""
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=2, window=60, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_opens_only_after_min_requests_at_failure_rate():
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=4, window=60, reset_timeout=30)
+    for ok in (True, True, False):
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_half_open_admits_a_single_probe(half_open):
+    assert half_open.allow_request()
+    assert half_open.state == HALF_OPEN
+    assert not half_open.allow_request()
+    assert not half_open.allow_request()
+
+
+def test_probe_success_closes(half_open):
+    assert half_open.allow_request()
+    half_open.record_success()
+    assert half_open.state == CLOSED
+    assert half_open.stats()['window_requests'] == 0
+    assert half_open.allow_request() and half_open.allow_request()
+
+
+def test_probe_failure_reopens(half_open):
+    assert half_open.allow_request()
+    half_open.record_failure()
+    assert half_open.state == OPEN
+    assert half_open.stats()['times_opened'] == 2
+
+
+def test_cancel_frees_the_probe(half_open):
+    assert half_open.allow_request()
+    half_open.cancel()
+    assert half_open.state == HALF_OPEN
+    assert half_open.allow_request()
+    assert not half_open.allow_request()
+
+
+def test_cancel_when_closed_records_nothing():
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=1, window=60, reset_timeout=30)
+    assert breaker.allow_request()
+    breaker.cancel()
+    assert breaker.stats()['window_requests'] == 0
+    assert breaker.state == CLOSED
+
+
+def test_outcomes_leave_the_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=2, window=10, reset_timeout=30)
+    breaker.record_failure()
+    now[0] += 11
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.stats()['window_failures'] == 1
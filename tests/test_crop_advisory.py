@@ -0,0 +1,122 @@
+"""Parity tests for the crop advisory index, and its handling of unusual weather values."""
+import math
+import os
+import sys
+
+import pytest
+
+import crop_advisory
+import farming_data
+import forecast
+import weather
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from bench_crop_advisory import make_conditions, make_crops  # noqa: E402
+from bench_forecast import make_forecast  # noqa: E402
+
+
+def band(dimension, value):
+    """Name the band a value falls in by walking the edges, as the rule table describes."""
+    edges, names = crop_advisory.CONDITION_BANDS[dimension]
+    for edge, name in zip(edges, names):
+        if value <= edge:
+            return name
+    return names[-1]
+
+
+def direct_advice(crops, conditions, limit=None):
+    """Evaluate every rule for every crop without the index."""
+    results = []
+    for entry_id, item in crops:
+        profile = crop_advisory.crop_profile(item)
+        advice = []
+        for rule in crop_advisory.CROP_ADVISORY_RULES:
+            if rule.get("requires") and not profile[rule["requires"]]:
+                continue
+            fires = all(
+                conditions["month"] in profile[f"{allowed}_months"] if dimension == "month"
+                else band(dimension, conditions[dimension]) in allowed
+                for dimension, allowed in rule["when"].items()
+            )
+            if fires:
+                advice.append(rule["message"].format(**profile))
+        if advice:
+            results.append({'id': entry_id, 'crop': profile["name"], 'advice': advice})
+    return results[:limit]
+
+
+def _edge_conditions():
+    """Conditions exactly on, and just past, every band edge."""
+    base = {'temp': 25, 'humidity': 50, 'rain_24h': 0, 'rain_72h': 0, 'wind': 2, 'month': 7}
+    for dimension, (edges, _) in crop_advisory.CONDITION_BANDS.items():
+        for edge in edges:
+            for value in (edge, edge + 0.01):
+                yield dict(base, **{dimension: value})
+
+
+def test_index_matches_direct_evaluation():
+    crops = make_crops(30)
+    index = crop_advisory.CropAdvisoryIndex(crops)
+    for conditions in [*make_conditions(400, seed=3), *_edge_conditions()]:
+        assert index.lookup(index.bucket(conditions)) == direct_advice(crops, conditions), conditions
+
+
+def test_lookup_limit_keeps_catalogue_order():
+    crops = make_crops(30)
+    index = crop_advisory.CropAdvisoryIndex(crops)
+    conditions = {'temp': 38, 'humidity': 50, 'rain_24h': 0, 'rain_72h': 0, 'wind': 2, 'month': 7}
+    assert index.lookup(index.bucket(conditions), 3) == direct_advice(crops, conditions, 3)
+    assert len(index.lookup(index.bucket(conditions), 3)) == 3
+
+
+def test_describe_names_the_bands():
+    index = crop_advisory.get_index()
+    conditions = {'temp': 35, 'humidity': 80.5, 'rain_24h': 0.2, 'rain_72h': 30, 'wind': 10, 'month': 12}
+    assert index.describe(index.bucket(conditions)) == {
+        'temp': 'warm', 'humidity': 'humid', 'rain_24h': 'light', 'rain_72h': 'heavy', 'wind': 'windy', 'month': 12
+    }
+
+
+@pytest.mark.parametrize("dimension, value, expected", [
+    ("temp", -60, "frost"), ("temp", 65, "hot"), ("temp", -math.inf, "frost"),
+    ("humidity", 0, "dry"), ("humidity", 140, "humid"),
+    ("rain_24h", -1, "none"), ("rain_72h", 900, "heavy"),
+    ("wind", 0, "calm"), ("wind", 80, "strong"),
+])
+def test_out_of_range_values_fall_in_the_outer_bands(dimension, value, expected):
+    index = crop_advisory.get_index()
+    conditions = dict({'temp': 25, 'humidity': 50, 'rain_24h': 0, 'rain_72h': 0, 'wind': 2, 'month': 7},
+                      **{dimension: value})
+    assert index.describe(index.bucket(conditions))[dimension] == expected
+
+
+@pytest.mark.parametrize("change", [
+    {'temp': None}, {'humidity': math.nan}, {'wind': "N/A"}, {'rain_72h': None}, {'month': 0}, {'month': 13}, {'month': 6.5},
+])
+def test_missing_or_invalid_values_are_rejected(change):
+    conditions = dict({'temp': 25, 'humidity': 50, 'rain_24h': 0, 'rain_72h': 0, 'wind': 2, 'month': 7}, **change)
+    with pytest.raises(ValueError):
+        crop_advisory.get_index().bucket(conditions)
+
+
+def test_missing_condition_key_is_rejected():
+    with pytest.raises(ValueError):
+        crop_advisory.get_index().bucket({'temp': 25, 'humidity': 50, 'rain_24h': 0, 'rain_72h': 0, 'month': 7})
+
+
+def test_advise_matches_direct_evaluation_of_weather():
+    crops = list(zip(farming_data.knowledge.ids("crops"), farming_data.knowledge.entries("crops")))
+    current = {'main': {'temp': 36, 'humidity': 85}, 'wind': {'speed': 3}}
+    columns = forecast.forecast_columns(make_forecast(4))
+    for month in range(1, 13):
+        conditions = crop_advisory.conditions_for(current, columns, month)
+        assert conditions['rain_24h'] == pytest.approx(sum(columns['rain'][:8]))
+        assert conditions['rain_72h'] == pytest.approx(sum(columns['rain'][:24]))
+        assert crop_advisory.advise(current, columns, month) == \
+            direct_advice(crops, conditions, crop_advisory.CROP_ADVISORIES_MAX_CROPS)
+
+
+def test_weather_without_a_reading_gets_no_crop_advice():
+    columns = forecast.forecast_columns(make_forecast(4))
+    assert weather.generate_crop_advisories({'main': {'temp': None, 'humidity': 60}, 'wind': {'speed': 2}}, columns) == []
+    assert weather.generate_crop_advisories({'main': {'temp': 30, 'humidity': 60}}, columns) == []
@@ -0,0 +1,21 @@
+"""Tests for database setup on databases created by older versions."""
+import sqlalchemy
+
+from database import create_missing_indexes
+
+
+def test_missing_session_index_is_added(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text(
+            "CREATE TABLE chat_messages (id INTEGER PRIMARY KEY, session_id VARCHAR(100) NOT NULL, "
+            "user_message TEXT NOT NULL, bot_response TEXT NOT NULL, timestamp DATETIME)"
+        ))
+
+    create_missing_indexes(engine)
+    create_missing_indexes(engine)  # Safe to run on every start
+
+    indexes = sqlalchemy.inspect(engine).get_indexes("chat_messages")
+    assert [(index['name'], index['column_names']) for index in indexes] == [
+        ("ix_chat_messages_session_id", ["session_id"])
+    ]
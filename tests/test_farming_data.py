@@ -0,0 +1,55 @@
+"""Tests for the /api/farming/* list helpers: projection and cursor pagination."""
+import farming_data
+
+
+def _walk(limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = farming_data.get_farming_techniques(limit=limit, cursor=cursor, **kwargs)
+        pages.append(page)
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_the_full_list_in_order():
+    full = farming_data.get_farming_techniques()
+    for limit in (1, 2, 5, 1000):
+        pages = _walk(limit)
+        merged = {kind: [] for kind in full}
+        for page in pages:
+            assert sum(len(items) for items in page['items'].values()) <= limit
+            assert page['total'] == sum(len(items) for items in full.values())
+            for kind, items in page['items'].items():
+                merged[kind].extend(items)
+        assert merged == full
+
+
+def test_projection_keeps_only_requested_fields():
+    page = farming_data.get_government_schemes(fields=("name",), limit=3)
+    assert page['items'] and all(set(item) == {"name"} for item in page['items'])
+
+
+def test_unknown_field_and_bad_cursor_are_errors():
+    assert "Unknown field" in farming_data.get_farming_laws(fields=("colour",))['error']
+    assert farming_data.get_farming_laws(limit=2, cursor="not-a-cursor")['error'] == "Invalid or expired cursor"
+    assert farming_data.get_farming_laws(limit=2, cursor="ü")['error'] == "Invalid or expired cursor"
+    # A cursor from another list does not name an entry in this one
+    law_cursor = farming_data.get_farming_laws(limit=1)['next_cursor']
+    assert "error" in farming_data.get_government_schemes(limit=1, cursor=law_cursor)
+
+
+def test_listing_order_is_built_once_per_generation(monkeypatch):
+    built = []
+    real_ids = farming_data.knowledge.ids
+
+    def counting_ids(kind=None):
+        built.append(kind)
+        return real_ids(kind)
+
+    kinds = ('laws',)
+    farming_data._list_order(kinds)
+    monkeypatch.setattr(farming_data.knowledge, "ids", counting_ids)
+    cursor = farming_data.get_farming_laws(limit=1)['next_cursor']
+    farming_data.get_farming_laws(limit=1, cursor=cursor)
+    assert built == []
@@ -0,0 +1,91 @@
+"""Parity tests for the farming recommendation rule table."""
+import os
+import random
+import sys
+from datetime import datetime
+
+import farming_rules
+import forecast
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from bench_forecast import make_forecast  # noqa: E402
+
+
+def legacy_recommendations(current_data, forecast_data, month):
+    """The original scalar generate_farming_recommendations, with the month passed in."""
+    recommendations = []
+    current_temp = current_data['main']['temp']
+    if current_temp > 35:
+        recommendations.append("High temperature alert! Ensure crops have adequate water. Consider overhead sprinkling for cooling effect.")
+    elif current_temp < 10:
+        recommendations.append("Low temperature alert! Protect sensitive crops from frost. Use covers or heaters if available.")
+    current_humidity = current_data['main']['humidity']
+    if current_humidity > 80:
+        recommendations.append("High humidity detected. Monitor for fungal diseases and mildew. Apply fungicides if necessary.")
+    elif current_humidity < 30:
+        recommendations.append("Low humidity detected. Increase irrigation and consider mulching to retain soil moisture.")
+    rain_expected = any('rain' in item for item in forecast_data['list'][:8])
+    if rain_expected:
+        recommendations.append("Rain expected in the next 24 hours. Hold off on applying fertilizers or pesticides.")
+    else:
+        recommendations.append("No significant rain expected in the next 24 hours. Good opportunity for field operations.")
+    if current_data['wind']['speed'] > 5:
+        recommendations.append("Moderate to high winds expected. Avoid spraying operations and secure young plants.")
+    if 3 <= month <= 5:
+        recommendations.append("Spring season: Good time for planting summer crops. Prepare fields and ensure adequate nutrition.")
+    elif 6 <= month <= 8:
+        recommendations.append("Summer season: Monitor irrigation needs carefully. Consider shade for sensitive crops.")
+    elif 9 <= month <= 11:
+        recommendations.append("Fall season: Prepare for harvest operations. Monitor storage conditions for harvested crops.")
+    else:
+        recommendations.append("Winter season: Focus on winter crops and preparation for spring planting. Protect soil from erosion.")
+    return recommendations
+
+
+def test_rule_table_matches_scalar_recommendations():
+    rng = random.Random(7)
+    currents, forecasts = [], []
+    for seed in range(300):
+        currents.append({
+            'main': {'temp': rng.choice([rng.uniform(-5, 45), 35, 10]),
+                     'humidity': rng.choice([rng.uniform(5, 100), 80, 30])},
+            'wind': {'speed': rng.choice([rng.uniform(0, 12), 5])}
+        })
+        data = make_forecast(seed)
+        if seed % 3 == 0:
+            for item in data['list']:
+                item.pop('rain', None)
+        forecasts.append(data)
+
+    for month in range(1, 13):
+        batch = farming_rules.recommend_batch(currents, forecasts, month=month)
+        assert batch == [legacy_recommendations(c, f, month) for c, f in zip(currents, forecasts)]
+        assert batch == [
+            farming_rules.recommendation_evaluator.evaluate_one(c, forecast.forecast_columns(f), month)
+            for c, f in zip(currents, forecasts)
+        ]
+
+
+def test_single_location_path_matches_batch_for_every_aggregate():
+    evaluator = farming_rules.compile_rules([
+        {"feature": column, "window": window, "aggregate": aggregate, "op": op, "value": value, "message": f"{column}-{aggregate}-{window}"}
+        for column, value in (("temp", 25), ("humidity", 60), ("rain", 1), ("wind", 6))
+        for aggregate in ("sum", "max", "min", "mean")
+        for window in (1, 8, 40)
+        for op in (">", "<=")
+    ] + [{"feature": "month", "op": "in", "value": [1, 2], "message": "winter"}])
+    current = {'main': {'temp': 25, 'humidity': 50}, 'wind': {'speed': 2}}
+    # The last forecast has no slots, so every window is empty
+    forecasts = [make_forecast(seed) for seed in range(20)] + [{'list': []}]
+    for month in (1, 6):
+        batch = evaluator.evaluate(farming_rules.current_conditions([current] * len(forecasts)),
+                                   forecast.stack_forecasts(forecasts), len(forecasts), month)
+        assert batch == [evaluator.evaluate_one(current, forecast.forecast_columns(f), month) for f in forecasts]
+
+
+def test_rules_default_to_current_month():
+    data = make_forecast(1)
+    current = {'main': {'temp': 25, 'humidity': 50}, 'wind': {'speed': 2}}
+    assert farming_rules.recommend_batch([current], [data]) == [
+        legacy_recommendations(current, data, datetime.now().month)
+    ]
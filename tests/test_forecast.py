@@ -0,0 +1,36 @@
+"""Parity tests for the array-based daily forecast summaries."""
+import os
+import sys
+
+import pytest
+
+import forecast
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from bench_forecast import legacy_full_daily, make_forecast  # noqa: E402
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_daily_summaries_match_per_slot_loop(seed):
+    data = make_forecast(seed, start=1760745600 + seed * 3600)
+    expected = legacy_full_daily(data)
+    days = forecast.summarize_forecast(data)
+
+    assert len(days) == len(expected) == forecast.FORECAST_DAYS
+    for day, reference in zip(days, expected):
+        for field in ('temp', 'temp_min', 'temp_max', 'humidity', 'rain_total', 'wind_max'):
+            assert day[field] == pytest.approx(round(reference[field], 1), abs=0.051), field
+
+
+def test_batched_summaries_match_single_summaries():
+    batch = [make_forecast(seed) for seed in range(10)]
+    assert forecast.summarize_forecasts(batch) == [forecast.summarize_forecast(data) for data in batch]
+
+
+def test_daily_summary_uses_slot_nearest_noon():
+    data = make_forecast(0, start=0, slots=8)
+    for index, item in enumerate(data['list']):
+        item['weather'] = [{'description': f"slot {index}", 'icon': '01d'}]
+    data['city']['timezone'] = 0
+    # Slots are at 00:00, 03:00, ... 21:00, so 12:00 is slot 4
+    assert forecast.summarize_forecast(data)[0]['description'] == "slot 4"
@@ -0,0 +1,63 @@
+"""Tests for place-name resolution."""
+import pytest
+
+import gazetteer
+import weather
+
+
+@pytest.fixture(scope="module")
+def places():
+    return gazetteer.load_gazetteer()
+
+
+@pytest.mark.parametrize("location, name, state, match", [
+    ("new delhi", "Delhi", "Delhi", gazetteer.MATCH_EXACT),
+    ("Pune, Maharashtra", "Pune", "Maharashtra", gazetteer.MATCH_EXACT),
+    ("Pune, India", "Pune", "Maharashtra", gazetteer.MATCH_EXACT),
+    ("Aurangabad, Maharashtra", "Aurangabad", "Maharashtra", gazetteer.MATCH_EXACT),
+    ("Mangalor", "Mangaluru", "Karnataka", gazetteer.MATCH_PREFIX),
+    ("Banglore", "Bengaluru", "Karnataka", gazetteer.MATCH_FUZZY),
+    ("Banglore, Karnataka", "Bengaluru", "Karnataka", gazetteer.MATCH_FUZZY),
+])
+def test_resolves_known_places(places, location, name, state, match):
+    place = places.resolve(location)
+    assert (place['name'], place['state'], place['match']) == (name, state, match)
+
+
+@pytest.mark.parametrize("location", [
+    "Raigarh",            # not Aligarh: misspellings keep the first letter
+    "Mangal",             # not Mangaluru: too short a share of the name
+    "Aurangabad, Bihar",  # not the Aurangabad in Maharashtra
+    "Banglore, Kerala",   # the spelling match is in another state
+    "Atlantis",
+    " , India",
+])
+def test_unknown_places_are_not_remapped(places, location):
+    assert places.resolve(location) is None
+
+
+def test_state_narrows_prefix_matches():
+    places = gazetteer.Gazetteer([
+        {"name": "Chandrapur", "state": "Maharashtra", "lat": 19.96, "lon": 79.3},
+        {"name": "Chandrapura", "state": "Jharkhand", "lat": 23.74, "lon": 86.11},
+    ])
+    # Two names share the prefix, so only the closer spelling matches
+    assert places.resolve("Chandrapu")['name'] == "Chandrapur"
+    # Chandrapura is the only place in Jharkhand with this prefix
+    assert places.resolve("Chandrapu, Jharkhand")['name'] == "Chandrapura"
+    assert places.resolve("Chandrapu, Jharkhand")['match'] == gazetteer.MATCH_PREFIX
+
+
+def test_resolve_does_not_modify_the_index(places):
+    place = places.resolve("Banglore")
+    assert 'match' not in places.places[place['id']]
+
+
+def test_weather_reports_inexact_match():
+    place = dict(gazetteer.get_gazetteer().resolve("Banglore"))
+    cached = {'location': place['name'], 'place_id': place['id'], 'current': {}}
+
+    shown = weather._for_place(cached, place)
+    assert shown['match'] == gazetteer.MATCH_FUZZY
+    assert 'match' not in cached
+    assert 'match' not in weather._for_place(cached, dict(place, match=gazetteer.MATCH_EXACT))
@@ -0,0 +1,60 @@
+"""Tests for the keyword intent classifier."""
+import pytest
+
+import intent
+
+
+@pytest.mark.parametrize("message, category", [
+    ("Will it rain in Pune tomorrow?", "weather"),
+    ("What is the forecast for the monsoon", "weather"),
+    ("When should I sow wheat seeds", "crops"),
+    ("Best yield for cultivation of cotton", "crops"),
+    ("Is there a subsidy for drip irrigation", "schemes"),
+    ("How do I apply for a government loan?", "schemes"),
+    ("What does the act say about labels", "laws"),
+    ("Which regulations cover pesticide use", "laws"),
+    ("Tell me about organic farming methods", "techniques"),
+    ("how to farm on a slope", "techniques"),
+    ("Namaste!", "greeting"),
+    ("hey there", "greeting"),
+    ("What is the price of tractors", "general"),
+    ("", "general"),
+])
+def test_documented_intents(message, category):
+    assert intent.classify(message).category == category
+
+
+def test_prefix_keywords_match_longer_words():
+    assert intent.classify("cultivating")[1] == {"crops": 1}
+    assert intent.classify("Humidity and temperatures")[1] == {"weather": 2}
+
+
+def test_whole_word_keywords_only_take_plural_endings():
+    assert intent.classify("laws")[1] == {"laws": 1}
+    assert intent.classify("acts")[1] == {"laws": 1}
+    # "actually", "higher" and "lawn" start with keywords but are other words
+    assert intent.classify("actually the higher lawn").category == "general"
+
+
+def test_keywords_must_start_a_word():
+    # "rain" inside "terrain" and "train" does not count
+    assert intent.classify("terrain train").category == "general"
+    assert intent.classify("(rain)")[1] == {"weather": 1}
+
+
+def test_most_matches_win_and_ties_follow_table_order():
+    assert intent.classify("rain on my crops and seeds").category == "crops"
+    assert intent.classify("rain on my crops").category == "weather"
+    assert intent.classify("loan rules").category == "schemes"
+
+
+def test_greeting_only_decides_without_a_topic():
+    result = intent.classify("Hello, hello! Is rain coming?")
+    assert result.category == "weather"
+    assert result.scores == {"greeting": 2, "weather": 1}
+
+
+def test_custom_table_compiles_to_one_pattern():
+    pattern, stems = intent.compile_classifier({"pests": ["aphid*", "borer"], "soil": ["soil", "ph"]})
+    assert stems == {"aphid": ("pests", True), "borer": ("pests", False), "soil": ("soil", False), "ph": ("soil", False)}
+    assert [stem for stem, _ in pattern.findall(" aphids on soil with ph ")] == ["aphid", "soil", "ph"]
@@ -0,0 +1,114 @@
+"""Tests for the memory-mapped knowledge store and its hot reload."""
+import json
+import os
+
+import pytest
+
+import knowledge_store
+from knowledge_store import KnowledgeStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control time.monotonic as seen by knowledge_store.py."""
+    now = [1000.0]
+    monkeypatch.setattr(knowledge_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _write(path, entries):
+    """Write entries to a new file and rename it over path, as the README says to update the store."""
+    new_path = f"{path}.new"
+    with open(new_path, "w") as f:
+        for entry_id, kind, item in entries:
+            f.write(json.dumps({"id": entry_id, "kind": kind, "item": item}) + "\n")
+    os.replace(new_path, path)
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    path = str(tmp_path / "knowledge.jsonl")
+    _write(path, [("rice", "crop", {"name": "Rice"}), ("wheat", "crop", {"name": "Wheat"})])
+    return KnowledgeStore(path, reload_interval=5)
+
+
+def test_lookups_by_id_and_kind(store):
+    assert store.get("rice") == {"name": "Rice"}
+    assert store.get("maize") is None
+    assert store.ids("crop") == ["rice", "wheat"]
+    assert store.entries("crop") == [{"name": "Rice"}, {"name": "Wheat"}]
+    assert store.entries("law") == []
+    assert store.generation == 1
+
+
+def test_renamed_file_is_swapped_in_after_the_interval(store, clock):
+    readers_snapshot = store._current()
+    _write(store.path, [("rice", "crop", {"name": "Paddy"}), ("pmkisan", "scheme", {"name": "PM-KISAN"})])
+
+    # Changes are only looked for once per interval
+    assert store.get("rice") == {"name": "Rice"}
+    clock[0] += 5
+    assert store.get("rice") == {"name": "Paddy"}
+    assert store.generation == 2
+    assert store.kinds() == ["crop", "scheme"]
+    assert store.get("wheat") is None
+    # A reader still holding the old generation reads it unchanged
+    assert readers_snapshot.decode("wheat") == {"name": "Wheat"}
+
+
+def test_bad_file_keeps_the_current_generation(store, clock):
+    with open(f"{store.path}.new", "w") as f:
+        f.write('{"id": "rice", "kind": "crop", "item": {}}\nnot json\n')
+    os.replace(f"{store.path}.new", store.path)
+    clock[0] += 5
+
+    assert store.get("wheat") == {"name": "Wheat"}
+    assert store.generation == 1
+    assert store.stats()['reload_errors'] == 1
+    # The bad file is not retried until it changes again
+    clock[0] += 5
+    store.get("wheat")
+    assert store.stats()['reload_errors'] == 1
+
+    _write(store.path, [("maize", "crop", {"name": "Maize"})])
+    clock[0] += 5
+    assert store.ids() == ["maize"]
+    assert store.generation == 2
+
+
+@pytest.mark.parametrize("lines", [
+    ['{"id": "rice", "kind": "crop", "item": {}}', '{"id": "rice", "kind": "crop", "item": {}}'],
+    ['{"kind": "crop", "item": {}}'],
+])
+def test_duplicate_or_missing_ids_fail_the_load(tmp_path, lines):
+    path = tmp_path / "knowledge.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    store = KnowledgeStore(str(path), reload_interval=0)
+    assert store.generation == 0
+    assert store.ids() == []
+
+
+def test_missing_file_keeps_the_current_generation(store, clock):
+    os.remove(store.path)
+    clock[0] += 5
+    assert store.get("rice") == {"name": "Rice"}
+    assert store.reload() is False
+    assert store.generation == 1
+
+
+def test_derived_values_are_rebuilt_after_a_reload(store, clock):
+    builds = []
+
+    def names():
+        builds.append(store.generation)
+        return [item["name"] for item in store.entries("crop")]
+
+    assert store.derived("names", names) == ["Rice", "Wheat"]
+    assert store.derived("names", names) == ["Rice", "Wheat"]
+    assert builds == [1]
+
+    _write(store.path, [("maize", "crop", {"name": "Maize"})])
+    clock[0] += 5
+    assert store.derived("names", names) == ["Maize"]
+    assert store.derived("names", names) == ["Maize"]
+    assert builds == [1, 2]
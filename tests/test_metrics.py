@@ -0,0 +1,95 @@
+"""Tests for the Prometheus text output of the in-process metrics."""
+from types import SimpleNamespace
+
+import pytest
+
+import app as app_module
+import metrics
+import openai_service
+import routing
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty metrics registry, so metrics made by a test are not exported by the app."""
+    monkeypatch.setattr(metrics, "_registry", [])
+
+
+def test_counter_output(registry):
+    counter = metrics.Counter("requests_total", "Requests by route", labels=("route", "status"))
+    counter.inc(route="/api/chat", status=200)
+    counter.inc(2, route="/api/chat", status=200)
+    counter.inc(0.5, route="/api/weather", status=500)
+    assert counter.value(route="/api/chat", status=200) == 3
+    assert metrics.render() == (
+        "# HELP requests_total Requests by route\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/api/chat",status="200"} 3\n'
+        'requests_total{route="/api/weather",status="500"} 0.5\n'
+    )
+
+
+def test_label_values_are_escaped(registry):
+    counter = metrics.Counter("errors_total", "Errors", labels=("error",))
+    counter.inc(error='bad "quote"\\path\nnext line')
+    assert metrics.render().splitlines()[-1] == 'errors_total{error="bad \\"quote\\"\\\\path\\nnext line"} 1'
+
+
+def test_unlabelled_and_missing_labels(registry):
+    metrics.Counter("ticks_total", "Ticks").inc()
+    metrics.Counter("hits_total", "Hits", labels=("source",)).inc()
+    assert metrics.render().splitlines()[2] == "ticks_total 1"
+    assert metrics.render().splitlines()[-1] == 'hits_total{source=""} 1'
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = metrics.Histogram("latency_seconds", "Latency", labels=("model",), buckets=(1, 0.5))
+    for seconds in (0.2, 0.7, 3):
+        histogram.observe(seconds, model="gpt-4o")
+    assert metrics.render().splitlines()[2:] == [
+        'latency_seconds_bucket{model="gpt-4o",le="0.5"} 1',
+        'latency_seconds_bucket{model="gpt-4o",le="1"} 2',
+        'latency_seconds_bucket{model="gpt-4o",le="+Inf"} 3',
+        'latency_seconds_sum{model="gpt-4o"} 3.9',
+        'latency_seconds_count{model="gpt-4o"} 3',
+    ]
+
+
+def test_registered_stats_are_flattened(registry):
+    metrics.register_stats("cache", "Cache counters", lambda: {
+        'hits': 4, 'hit_rate': 0.8, 'enabled': True, 'state': "closed", 'shared': {'size': 2}
+    })
+    assert metrics.render().splitlines()[2:] == [
+        'cache{stat="enabled"} 1',
+        'cache{stat="hit_rate"} 0.8',
+        'cache{stat="hits"} 4',
+        'cache{stat="shared.size"} 2',
+    ]
+
+
+def test_failing_callback_exports_no_samples(registry):
+    def broken():
+        raise RuntimeError("store closed")
+
+    metrics.CallbackGauge("store_size", "Store size", broken)
+    metrics.Counter("after_total", "Rendered after the broken gauge").inc()
+    assert metrics.render().splitlines() == [
+        "# HELP store_size Store size", "# TYPE store_size gauge",
+        "# HELP after_total Rendered after the broken gauge", "# TYPE after_total counter", "after_total 1",
+    ]
+
+
+def test_metrics_route_exports_openai_calls():
+    route = routing.Route("laws", "test-model", 600, 0.3)
+    openai_service.record_call("laws", route, 0.3, SimpleNamespace(prompt_tokens=120, completion_tokens=80))
+
+    response = app_module.app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == metrics.CONTENT_TYPE
+    lines = response.get_data(as_text=True).splitlines()
+    assert "# TYPE openai_request_duration_seconds histogram" in lines
+    assert 'openai_request_duration_seconds_bucket{category="laws",model="test-model",route="laws",le="0.5"} 1' in lines
+    assert 'openai_tokens_total{category="laws",model="test-model",type="completion"} 80' in lines
+    # Breaker stats are exported, except the non-numeric state
+    assert any(line.startswith('openai_circuit{stat="times_opened"} ') for line in lines)
+    assert not any(line.startswith('openai_circuit{stat="state"}') for line in lines)
@@ -0,0 +1,269 @@
+"""Tests for the OpenAI call path: streaming, breaker bookkeeping and rate-limit retries."""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+import openai_service
+from circuit_breaker import CircuitBreaker
+from rate_limiter import RateLimiter
+
+# Matches no curated entry, so it is not answered directly
+QUESTION = "what should farmers in my village plan for next season"
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """openai_service with an API key, no response cache and a fresh half-open breaker."""
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=1, window=60, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    monkeypatch.setattr(openai_service, "openai_breaker", breaker)
+    monkeypatch.setattr(openai_service, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(openai_service, "RESPONSE_CACHE_ENABLED", False)
+    return openai_service
+
+
+def _client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_stream_closed_after_first_token_closes_out_probe(service, monkeypatch):
+    monkeypatch.setattr(service, "client", _client(lambda **kwargs: iter([_chunk("Plan "), _chunk("early.")])))
+
+    stream = service.generate_response_stream(QUESTION)
+    assert next(stream) == "Plan "
+    assert service.openai_breaker.state == "half_open"
+    stream.close()
+
+    # Tokens arrived, so the probe counts as a success and the circuit closes
+    assert service.openai_breaker.state == "closed"
+    assert service.openai_breaker.allow_request()
+    assert service.openai_limiter.stats()["in_flight"] == 0
+
+
+def test_stream_closed_during_fallback_releases_probe(service, monkeypatch):
+    def create(**kwargs):
+        raise ValueError("bad request")
+
+    monkeypatch.setattr(service, "client", _client(create))
+
+    stream = service.generate_response_stream(QUESTION)
+    next(stream)
+    stream.close()
+
+    # A non-upstream error means the API answered, which also ends the probe
+    assert service.openai_breaker.state == "closed"
+
+
+def test_stream_shed_before_start_gives_probe_back(service, monkeypatch):
+    def create(**kwargs):
+        raise service.RequestShed("queue full")
+
+    monkeypatch.setattr(service, "client", _client(create))
+
+    assert "".join(service.generate_response_stream(QUESTION))
+    assert service.openai_breaker.state == "half_open"
+    assert service.openai_breaker.allow_request()
+
+
+class _FakeCache:
+    """Stands in for response_cache: has an answer for everything and records stores."""
+
+    def __init__(self):
+        self.stored = []
+
+    def get(self, user_message, category):
+        return "cached answer"
+
+    def set(self, user_message, category, response):
+        self.stored.append(user_message)
+
+
+def test_follow_up_bypasses_response_cache(service, monkeypatch):
+    cache = _FakeCache()
+    monkeypatch.setattr(service, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(service, "response_cache", cache)
+    reply = SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content="Fresh answer"))])
+    monkeypatch.setattr(service, "client", _client(lambda **kwargs: reply))
+    history = [{"role": "user", "content": "I grow wheat"}, {"role": "assistant", "content": "Noted."}]
+
+    assert service.generate_response(QUESTION, history=history) == "Fresh answer"
+    monkeypatch.setattr(service, "client", _client(lambda **kwargs: iter([_chunk("Fresh "), _chunk("stream")])))
+    assert "".join(service.generate_response_stream(QUESTION, history=history)) == "Fresh stream"
+    assert cache.stored == []
+    assert service.generate_response(QUESTION) == "cached answer"
+
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(cls, status, headers=None):
+    return cls("error", response=httpx.Response(status, headers=headers, request=_REQUEST), body=None)
+
+
+@pytest.fixture
+def retrying(monkeypatch):
+    """openai_service with a roomy limiter and sleeps recorded instead of taken."""
+    sleeps = []
+    monkeypatch.setattr(openai_service, "openai_limiter", RateLimiter("test", rate=1000, burst=1000))
+    monkeypatch.setattr(openai_service.time, "sleep", sleeps.append)
+    monkeypatch.setattr(openai_service, "OPENAI_RATE_LIMIT_RETRIES", 2)
+    monkeypatch.setattr(openai_service, "OPENAI_MAX_RETRIES", 1)
+    return sleeps
+
+
+def _failing(*errors, result="ok"):
+    """A create() that raises the given errors in turn, then returns result; calls are counted."""
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return create, calls
+
+
+def test_clients_leave_retries_to_call_openai():
+    assert openai_service.client.max_retries == 0
+    assert openai_service.async_client.max_retries == 0
+
+
+def test_rate_limited_call_is_retried_with_backoff(retrying):
+    create, calls = _failing(*[_status_error(openai.RateLimitError, 429)] * 2)
+    assert openai_service.call_openai(create) == "ok"
+    assert len(calls) == 3
+    assert len(retrying) == 2
+    assert openai_service.openai_limiter.stats()['in_flight'] == 0
+
+
+def test_retries_stop_at_the_limit(retrying):
+    create, calls = _failing(*[_status_error(openai.RateLimitError, 429)] * 5)
+    with pytest.raises(openai.RateLimitError):
+        openai_service.call_openai(create)
+    assert len(calls) == 1 + openai_service.OPENAI_RATE_LIMIT_RETRIES
+    assert openai_service.openai_limiter.stats()['in_flight'] == 0
+
+
+def test_transient_errors_use_their_own_limit(retrying):
+    create, calls = _failing(openai.APITimeoutError(_REQUEST), _status_error(openai.InternalServerError, 503))
+    with pytest.raises(openai.InternalServerError):
+        openai_service.call_openai(create)
+    assert len(calls) == 1 + openai_service.OPENAI_MAX_RETRIES
+
+
+def test_client_errors_are_not_retried(retrying):
+    create, calls = _failing(_status_error(openai.BadRequestError, 400))
+    with pytest.raises(openai.BadRequestError):
+        openai_service.call_openai(create)
+    assert len(calls) == 1
+    assert retrying == []
+
+
+def test_keep_slot_holds_the_limiter_after_success(retrying):
+    create, _ = _failing(_status_error(openai.RateLimitError, 429))
+    openai_service.call_openai(create, keep_slot=True)
+    assert openai_service.openai_limiter.stats()['in_flight'] == 1
+    openai_service.openai_limiter.release()
+
+
+def test_backoff_grows_exponentially_with_jitter(monkeypatch):
+    monkeypatch.setattr(openai_service, "OPENAI_BACKOFF_BASE", 0.5)
+    monkeypatch.setattr(openai_service, "OPENAI_BACKOFF_MAX", 8)
+    error = _status_error(openai.RateLimitError, 429)
+    monkeypatch.setattr(openai_service.random, "uniform", lambda low, high: 1.0)
+    assert [openai_service._backoff_delay(attempt, error) for attempt in range(6)] == [0.5, 1, 2, 4, 8, 8]
+    monkeypatch.setattr(openai_service.random, "uniform", lambda low, high: low)
+    assert openai_service._backoff_delay(2, error) == 1.0
+    monkeypatch.setattr(openai_service.random, "uniform", lambda low, high: high)
+    assert openai_service._backoff_delay(2, error) == 3.0
+
+
+def test_backoff_honours_retry_after(monkeypatch):
+    monkeypatch.setattr(openai_service, "OPENAI_BACKOFF_MAX", 8)
+    monkeypatch.setattr(openai_service.random, "uniform", lambda low, high: 1.0)
+    assert openai_service._backoff_delay(0, _status_error(openai.RateLimitError, 429, {"retry-after": "3"})) == 3.0
+    assert openai_service._backoff_delay(0, _status_error(openai.RateLimitError, 429, {"retry-after": "60"})) == 8
+    assert openai_service._backoff_delay(0, openai.APIConnectionError(request=_REQUEST)) <= 8
+
+
+@pytest.fixture
+def closed_breaker(monkeypatch, retrying):
+    """openai_service with a fresh closed breaker, no retries and no response cache."""
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=2, window=60, reset_timeout=60)
+    monkeypatch.setattr(openai_service, "openai_breaker", breaker)
+    monkeypatch.setattr(openai_service, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(openai_service, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(openai_service, "OPENAI_MAX_RETRIES", 0)
+    monkeypatch.setattr(openai_service, "OPENAI_RATE_LIMIT_RETRIES", 0)
+    return breaker
+
+
+def test_openai_breaker_opens_and_serves_fallback(closed_breaker, monkeypatch):
+    create, calls = _failing(*[openai.APIConnectionError(request=_REQUEST)] * 5)
+    monkeypatch.setattr(openai_service, "client", _client(create))
+
+    for _ in range(2):
+        assert openai_service.generate_response(QUESTION)
+    assert closed_breaker.state == "open"
+
+    # While open, answers come from the fallbacks without calling the API
+    assert openai_service.generate_response(QUESTION)
+    assert "".join(openai_service.generate_response_stream(QUESTION))
+    assert len(calls) == 2
+    assert closed_breaker.stats()['rejected'] == 2
+
+
+def test_openai_breaker_ignores_client_errors(closed_breaker, monkeypatch):
+    create, _ = _failing(*[_status_error(openai.BadRequestError, 400)] * 5)
+    monkeypatch.setattr(openai_service, "client", _client(create))
+
+    for _ in range(5):
+        assert openai_service.generate_response(QUESTION)
+    assert closed_breaker.stats()['window_failures'] == 0
+    assert closed_breaker.state == "closed"
+
+
+def test_openai_breaker_probe_success_closes(closed_breaker, monkeypatch):
+    reply = SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content="Recovered"))])
+    create, calls = _failing(*[_status_error(openai.InternalServerError, 500)] * 2, result=reply)
+    monkeypatch.setattr(openai_service, "client", _client(create))
+    for _ in range(2):
+        openai_service.generate_response(QUESTION)
+    assert closed_breaker.state == "open"
+
+    monkeypatch.setattr(closed_breaker, "reset_timeout", 0)
+    assert openai_service.generate_response(QUESTION) == "Recovered"
+    assert closed_breaker.state == "closed"
+    assert len(calls) == 3
+
+
+def test_async_response_shares_cache_and_breaker(closed_breaker, monkeypatch):
+    cache = _FakeCache()
+    cache.get = lambda user_message, category: None
+    monkeypatch.setattr(openai_service, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(openai_service, "response_cache", cache)
+    reply = SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=" Async answer "))])
+
+    async def create(**kwargs):
+        return reply
+
+    monkeypatch.setattr(openai_service, "async_client", _client(create))
+    assert asyncio.run(openai_service.generate_response_async(QUESTION)) == "Async answer"
+    assert cache.stored == [QUESTION]
+
+    async def failing(**kwargs):
+        raise openai.APIConnectionError(request=_REQUEST)
+
+    monkeypatch.setattr(openai_service, "async_client", _client(failing))
+    for _ in range(2):
+        assert asyncio.run(openai_service.generate_response_async(QUESTION))
+    assert closed_breaker.state == "open"
+    assert cache.stored == [QUESTION]
@@ -0,0 +1,89 @@
+"""Tests for prepared payloads: ETag revalidation and content negotiation."""
+import gzip
+import zlib
+
+import pytest
+from flask import Flask
+
+import payloads
+from payloads import PreparedResponse
+
+DATA = {"techniques": [{"name": f"Technique {i}", "description": "Rotate crops to keep the soil healthy. " * 3} for i in range(20)]}
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture
+def fake_brotli(monkeypatch):
+    """Register a stand-in 'br' coding, as if the optional brotli package were installed."""
+    monkeypatch.setattr(payloads, "_ENCODERS", [('br', zlib.compress)] + [
+        (encoding, compress) for encoding, compress in payloads._ENCODERS if encoding != 'br'
+    ])
+
+
+def _send(app, payload, **headers):
+    with app.test_request_context(headers=headers):
+        return payload.send()
+
+
+def test_gzip_when_accepted(app):
+    payload = PreparedResponse(DATA)
+    response = _send(app, payload, **{"Accept-Encoding": "gzip, deflate"})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(response.get_data()) == payload.body
+    assert response.headers['ETag'] == f'"{payload.digest}-gzip"'
+
+
+def test_identity_without_accept_encoding(app):
+    payload = PreparedResponse(DATA)
+    response = _send(app, payload)
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == payload.body
+    assert response.headers['ETag'] == f'"{payload.digest}"'
+
+
+def test_brotli_preferred_over_gzip(app, fake_brotli):
+    payload = PreparedResponse(DATA)
+    assert _send(app, payload, **{"Accept-Encoding": "gzip, br"}).headers['Content-Encoding'] == 'br'
+    assert _send(app, payload, **{"Accept-Encoding": "gzip, br;q=0"}).headers['Content-Encoding'] == 'gzip'
+
+
+def test_small_payloads_are_not_compressed(app):
+    payload = PreparedResponse({"laws": []})
+    assert payload.stats().keys() == {'identity'}
+    assert 'Content-Encoding' not in _send(app, payload, **{"Accept-Encoding": "gzip"}).headers
+
+
+def test_matching_etag_gets_304(app):
+    payload = PreparedResponse(DATA)
+    response = _send(app, payload, **{"Accept-Encoding": "gzip", "If-None-Match": f'"{payload.digest}-gzip"'})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers['ETag'] == f'"{payload.digest}-gzip"'
+
+
+def test_etag_of_another_variant_gets_304(app):
+    payload = PreparedResponse(DATA)
+    # The client cached the identity body but now accepts gzip; the content is the same
+    response = _send(app, payload, **{"Accept-Encoding": "gzip", "If-None-Match": f'"{payload.digest}"'})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("if_none_match", ['W/"{digest}-gzip"', '"other", W/"{digest}"', '*'])
+def test_weak_and_star_etags_get_304(app, if_none_match):
+    payload = PreparedResponse(DATA)
+    response = _send(app, payload, **{"Accept-Encoding": "gzip",
+                                      "If-None-Match": if_none_match.format(digest=payload.digest)})
+    assert response.status_code == 304
+
+
+def test_stale_etag_gets_the_body(app):
+    old = PreparedResponse({"laws": ["old"]})
+    payload = PreparedResponse(DATA)
+    response = _send(app, payload, **{"If-None-Match": f'"{old.digest}", W/"{old.digest}"'})
+    assert response.status_code == 200
+    assert response.get_data() == payload.body
@@ -0,0 +1,54 @@
+"""Tests for the weather prefetch scheduler's single-process election."""
+import os
+
+import pytest
+
+import prefetch
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return os.path.join(tmp_path, "prefetch.lock")
+
+
+@pytest.mark.skipif(prefetch.fcntl is None, reason="needs flock")
+def test_only_one_scheduler_holds_the_lock(lock_path):
+    first = prefetch.PrefetchScheduler(app=None, cycle_seconds=60, lock_path=lock_path)
+    second = prefetch.PrefetchScheduler(app=None, cycle_seconds=60, lock_path=lock_path)
+
+    assert first.holds_lock()
+    assert first.holds_lock()
+    assert not second.holds_lock()
+
+    first._lock_file.close()
+    first._lock_file = None
+    assert second.holds_lock()
+    second._lock_file.close()
+
+
+def test_scheduler_waits_without_the_lock(lock_path, monkeypatch):
+    scheduler = prefetch.PrefetchScheduler(app=None, cycle_seconds=60, lock_path=lock_path)
+    cycles = []
+    monkeypatch.setattr(scheduler, "holds_lock", lambda: False)
+    monkeypatch.setattr(scheduler, "run_cycle", lambda: cycles.append(1))
+    monkeypatch.setattr(scheduler._stop, "wait", lambda timeout: scheduler._stop.set())
+
+    scheduler._run()
+    assert cycles == []
+
+
+def test_start_is_once_per_process(monkeypatch):
+    started = []
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", True)
+    monkeypatch.setattr(prefetch, "_scheduler", None)
+    monkeypatch.setattr(prefetch.PrefetchScheduler, "start", lambda self: started.append(self))
+
+    scheduler = prefetch.start_prefetch_scheduler(app=None)
+    assert prefetch.start_prefetch_scheduler(app=None) is scheduler
+    assert started == [scheduler]
+
+
+def test_disabled_scheduler_does_not_start(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", False)
+    monkeypatch.setattr(prefetch, "_scheduler", None)
+    assert prefetch.start_prefetch_scheduler(app=None) is None
@@ -0,0 +1,87 @@
+"""Tests for the OpenAI rate limiter: priority ordering, queue bounds and deadline shedding."""
+import asyncio
+import threading
+import time
+
+from rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimiter
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_burst_then_rate():
+    limiter = RateLimiter("test", rate=1000, burst=2, max_concurrent=10)
+    assert limiter.acquire(timeout=0)
+    assert limiter.acquire(timeout=0)
+    assert limiter.stats()['in_flight'] == 2
+    # The bucket is empty but refills within the timeout
+    assert limiter.acquire(timeout=1)
+
+
+def test_interactive_calls_go_before_background_calls():
+    limiter = RateLimiter("test", rate=1000, burst=10, max_concurrent=1)
+    assert limiter.acquire()
+    order = []
+
+    def waiter(name, priority):
+        assert limiter.acquire(priority, timeout=5)
+        order.append(name)
+        limiter.release()
+
+    threads = []
+    for name, priority in [("background-1", PRIORITY_BACKGROUND), ("background-2", PRIORITY_BACKGROUND),
+                           ("interactive", PRIORITY_INTERACTIVE)]:
+        thread = threading.Thread(target=waiter, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        _wait_for(lambda: limiter.stats()['waiting'] == len(threads))
+
+    limiter.release()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["interactive", "background-1", "background-2"]
+
+
+def test_deadline_sheds_waiting_call():
+    limiter = RateLimiter("test", rate=1000, burst=10, max_concurrent=1)
+    assert limiter.acquire()
+    started = time.monotonic()
+    assert not limiter.acquire(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    stats = limiter.stats()
+    assert (stats['shed_deadline'], stats['waiting'], stats['in_flight']) == (1, 0, 1)
+
+    # The shed entry does not block the next caller
+    limiter.release()
+    assert limiter.acquire(timeout=0)
+
+
+def test_full_queue_sheds_immediately():
+    limiter = RateLimiter("test", rate=1000, burst=10, max_concurrent=1, max_queue=1)
+    assert limiter.acquire()
+    waiter = threading.Thread(target=limiter.acquire, kwargs={'timeout': 5})
+    waiter.start()
+    _wait_for(lambda: limiter.stats()['waiting'] == 1)
+
+    assert not limiter.acquire(timeout=5)
+    assert limiter.stats()['shed_queue_full'] == 1
+    limiter.release()
+    waiter.join(5)
+
+
+def test_async_acquire_sheds_on_deadline():
+    limiter = RateLimiter("test", rate=1000, burst=10, max_concurrent=1)
+    assert limiter.acquire()
+
+    async def scenario():
+        shed = await limiter.acquire_async(timeout=0.05)
+        limiter.release()
+        admitted = await limiter.acquire_async(timeout=1)
+        return shed, admitted
+
+    assert asyncio.run(scenario()) == (False, True)
+    assert limiter.stats()['shed_deadline'] == 1
@@ -0,0 +1,101 @@
+"""Tests for the chat response cache and its near-duplicate matching."""
+import pytest
+
+import response_cache
+from response_cache import ResponseCache
+
+QUESTION = "How much water does paddy need during the summer months in Punjab?"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control time.monotonic as seen by response_cache.py."""
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(clock):
+    entries = ResponseCache(max_entries=10, ttl=60, threshold=0.85)
+    entries.set(QUESTION, "crops", "About 1200 mm over the season.")
+    return entries
+
+
+def test_exact_hit_ignores_case_and_punctuation(cache):
+    assert cache.get("how much water does PADDY need during the summer months in punjab", "crops")
+    assert cache.stats()['exact_hits'] == 1
+
+
+@pytest.mark.parametrize("paraphrase", [
+    "In Punjab, how much water does paddy need during the summer month?",   # reordered, singular
+    "how much water does paddy need in summer months in Punjab",            # a content word dropped
+    "Please tell me: how much water would paddy need during summer months in Punjab",
+])
+def test_paraphrases_are_near_duplicate_hits(cache, paraphrase):
+    assert cache.get(paraphrase, "crops") == "About 1200 mm over the season."
+    assert cache.stats()['similar_hits'] == 1
+
+
+@pytest.mark.parametrize("question", [
+    "How much water does paddy need during the summer months in Bihar?",    # another state
+    "How much water does wheat need during the summer months in Punjab?",   # another crop
+    "How much fertilizer does paddy need during the summer months in Punjab?",
+])
+def test_other_location_or_entity_is_a_miss(cache, question):
+    assert cache.get(question, "crops") is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_similarity_threshold(clock):
+    # One extra term gives a similarity of about 0.858 against a single cached question
+    question = "How much water does paddy need during the summer months in Punjab district"
+    for threshold, hit in ((0.85, True), (0.86, False)):
+        entries = ResponseCache(threshold=threshold)
+        entries.set(QUESTION, "crops", "answer")
+        assert (entries.get(question, "crops") is not None) == hit
+
+
+def test_shared_cache_uses_the_configured_threshold():
+    assert response_cache.response_cache.threshold == response_cache.RESPONSE_CACHE_SIMILARITY == 0.85
+
+
+def test_near_duplicates_stay_within_a_category(cache):
+    assert cache.get(QUESTION, "weather") is None
+    assert cache.get("paddy water summer months Punjab during need much", "schemes") is None
+
+
+def test_only_stopwords_never_match(cache):
+    assert cache.get("how do i do it", "crops") is None
+
+
+def test_most_similar_entry_wins(cache):
+    cache.set("How much water does paddy need during the summer months in Bihar?", "crops", "Bihar answer")
+    assert cache.get("how much water does paddy need in the summer months in Bihar", "crops") == "Bihar answer"
+
+
+def test_expired_entries_are_not_served(cache, clock):
+    clock[0] += 60
+    assert cache.get(QUESTION, "crops") is None
+    assert cache.get("In Punjab, how much water does paddy need during the summer months", "crops") is None
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    entries = ResponseCache(max_entries=2)
+    entries.set("rice sowing", "crops", "rice")
+    entries.set("wheat sowing", "crops", "wheat")
+    assert entries.get("rice sowing", "crops") == "rice"
+    entries.set("maize sowing", "crops", "maize")
+    assert entries.get("wheat sowing", "crops") is None
+    assert entries.get("rice sowing", "crops") == "rice"
+    assert entries.stats()['evictions'] == 1
+
+
+def test_replacing_an_entry_keeps_the_index_consistent(cache):
+    cache.set(QUESTION, "crops", "Updated answer.")
+    cache.set("Best time to sow paddy in Punjab", "crops", "June.")
+    assert cache.get("how much water does paddy need in summer months in Punjab", "crops") == "Updated answer."
+    assert cache.stats()['size'] == 2
+    cache.clear()
+    assert cache.get(QUESTION, "crops") is None
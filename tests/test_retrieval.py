@@ -0,0 +1,68 @@
+"""Tests for retrieval over the curated farming data: direct answers and prompt context."""
+import pytest
+
+import retrieval
+
+
+@pytest.mark.parametrize("query, name", [
+    ("tell me about rice", "Rice"),
+    ("Rice?", "Rice"),
+    ("what is PM-KISAN", "Pradhan Mantri Kisan Samman Nidhi (PM-KISAN)"),
+    ("explain the wheat crop", "Wheat"),
+    ("organic farming", "Organic Farming"),
+])
+def test_direct_answer_when_one_entry_is_named(query, name):
+    answer = retrieval.direct_answer(query)
+    assert answer.startswith(f"**{name}**\n\n")
+
+
+@pytest.mark.parametrize("query", [
+    "tell me about rice and wheat",                   # names two entries
+    "kisan",                                          # in two scheme names
+    "pradhan mantri yojana",                          # in two scheme names
+    "what is a scheme",                               # only generic terms
+    "drip irrigation",                                # names no entry
+    "how much rice should I plant per acre here",     # too many specific terms
+])
+def test_no_direct_answer_without_a_single_confident_match(query):
+    assert retrieval.direct_answer(query) is None
+
+
+def test_direct_answers_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(retrieval, "RETRIEVAL_DIRECT_ANSWERS", False)
+    assert retrieval.direct_answer("tell me about rice") is None
+
+
+def test_direct_answer_term_limit(monkeypatch):
+    monkeypatch.setattr(retrieval, "RETRIEVAL_DIRECT_MAX_TERMS", 1)
+    assert retrieval.direct_answer("rice") is not None
+    assert retrieval.direct_answer("pradhan mantri kisan samman") is None
+
+
+def test_retrieve_keeps_only_hits_above_the_minimum_score(monkeypatch):
+    hits = retrieval.retrieve("rice blast disease", k=5)
+    assert hits[0][1]['id'] == "crops:rice"
+    assert all(score >= retrieval.RETRIEVAL_MIN_SCORE for score, _ in hits)
+    assert [score for score, _ in hits] == sorted((score for score, _ in hits), reverse=True)
+
+    monkeypatch.setattr(retrieval, "RETRIEVAL_MIN_SCORE", hits[0][0])
+    assert [doc['id'] for _, doc in retrieval.retrieve("rice blast disease", k=5)] == ["crops:rice"]
+    monkeypatch.setattr(retrieval, "RETRIEVAL_MIN_SCORE", hits[0][0] + 0.01)
+    assert retrieval.retrieve("rice blast disease", k=5) == []
+    assert retrieval.context_for("rice blast disease") == ""
+
+
+def test_context_lists_top_entries():
+    context = retrieval.context_for("rice blast disease")
+    lines = context.splitlines()
+    assert lines[0] == "Reference information (use it if relevant):"
+    assert lines[1].startswith("- Crop - Rice: ")
+    assert 1 < len(lines) <= 1 + retrieval.RETRIEVAL_TOP_K
+    assert all(len(line) <= len("- ") + retrieval.RETRIEVAL_SNIPPET_CHARS for line in lines[1:])
+    assert retrieval.context_for("zzzz qqqq") == ""
+
+
+def test_retrieval_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(retrieval, "RETRIEVAL_ENABLED", False)
+    assert retrieval.context_for("rice blast disease") == ""
+    assert retrieval.direct_answer("tell me about rice") is None
@@ -0,0 +1,50 @@
+"""Tests for choosing the model and output budget of chat requests."""
+import pytest
+
+import routing
+
+LONG_QUESTION = "which fertilizer schedule gives the best yield for irrigated wheat on black cotton soil"
+HISTORY = [{"role": "user", "content": "I grow wheat"}, {"role": "assistant", "content": "Noted."}]
+
+
+@pytest.mark.parametrize("category", ["weather", "crops", "techniques", "schemes", "laws", "general"])
+def test_long_questions_take_their_category_route(category):
+    route = routing.choose_route(category, LONG_QUESTION)
+    assert route.name == category
+    assert route.model == routing.DEFAULT_ROUTES[category]['model']
+    assert route.max_tokens == routing.DEFAULT_ROUTES[category]['max_tokens']
+
+
+def test_short_standalone_questions_take_the_simple_route():
+    route = routing.choose_route("crops", "when to sow wheat")
+    assert (route.name, route.model) == ("simple", "gpt-4o-mini")
+    # Follow-ups depend on earlier turns, so they keep the category route
+    assert routing.choose_route("crops", "and after that?", HISTORY).name == "crops"
+
+
+def test_greetings_keep_their_own_route():
+    assert routing.choose_route("greeting", "hello").name == "greeting"
+
+
+def test_simple_route_word_limit(monkeypatch):
+    monkeypatch.setattr(routing, "ROUTING_SIMPLE_MAX_WORDS", 3)
+    assert routing.choose_route("crops", "when to sow").name == "simple"
+    assert routing.choose_route("crops", "when to sow wheat").name == "crops"
+
+
+def test_unknown_category_falls_back_to_general():
+    assert routing.choose_route("pests", LONG_QUESTION).name == "general"
+
+
+def test_overrides_merge_into_the_defaults():
+    routes = routing.load_routes('{"simple": {"model": "gpt-4o"}, "laws": {"max_tokens": 400}, "pests": {"temperature": 0.2}}')
+    assert routes['simple'] == routing.Route("simple", "gpt-4o", 350, 0.5)
+    assert routes['laws'] == routing.Route("laws", "gpt-4o-mini", 400, 0.3)
+    # A new route starts from the 'general' settings
+    assert routes['pests'] == routing.Route("pests", "gpt-4o", 800, 0.2)
+    assert routes['crops'] == routing.load_routes()['crops']
+
+
+@pytest.mark.parametrize("overrides", ['not json', '["simple"]', '{"simple": "gpt-4o"}', '{"laws": {"max_tokens": "lots"}}'])
+def test_invalid_overrides_fall_back_to_the_defaults(overrides):
+    assert routing.load_routes(overrides) == routing.load_routes()
@@ -0,0 +1,279 @@
+"""Tests for weather lookups: request coalescing and the OpenWeatherMap circuit breaker."""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import weather
+from cache import SingleFlight, TTLCache
+from circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(weather, "weather_cache", TTLCache(ttl=60))
+    monkeypatch.setattr(weather, "shared_cache", None)
+    monkeypatch.setattr(weather, "_inflight", SingleFlight())
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_misses_share_one_fetch(empty_cache, monkeypatch):
+    release = threading.Event()
+    fetches = []
+
+    def fetch(location, place=None):
+        fetches.append(location)
+        release.wait(5)
+        return {'location': location, 'current': {'temperature': 30}}
+
+    monkeypatch.setattr(weather, "fetch_weather_data", fetch)
+    spellings = ["Pune", "pune", " Pune ", "Pune, Maharashtra"]
+    results = {}
+    threads = [
+        threading.Thread(target=lambda s=s: results.__setitem__(s, weather.get_weather_data(s)))
+        for s in spellings
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: weather._inflight.stats()['shared'] == len(spellings) - 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(fetches) == 1
+    assert {result['place_id'] for result in results.values()} == {"in:maharashtra:pune"}
+    # The shared result was cached, so the next lookup is a hit
+    weather.get_weather_data("pune")
+    assert len(fetches) == 1
+
+
+def test_failed_fetch_is_shared_but_not_cached(empty_cache, monkeypatch):
+    fetches = []
+    monkeypatch.setattr(weather, "fetch_weather_data",
+                        lambda location, place=None: fetches.append(location) or {'error': 'down'})
+    assert 'error' in weather.get_weather_data("Nashik")
+    assert 'error' in weather.get_weather_data("Nashik")
+    assert len(fetches) == 2
+
+
+def test_concurrent_async_misses_share_one_fetch(empty_cache, monkeypatch):
+    fetches = []
+
+    async def fetch(location, place=None):
+        fetches.append(location)
+        await asyncio.sleep(0.01)
+        return {'location': location, 'current': {'temperature': 30}}
+
+    monkeypatch.setattr(weather, "fetch_weather_data_async", fetch)
+
+    async def scenario():
+        return await asyncio.gather(*[weather.get_weather_data_async("Nagpur") for _ in range(5)])
+
+    results = asyncio.run(scenario())
+    assert len(fetches) == 1
+    assert all(result == results[0] for result in results)
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """A fresh weather breaker and a scripted _get_json that raises ``upstream.error`` if set."""
+    monkeypatch.setattr(weather, "WEATHER_API_KEY", "test-key")
+    monkeypatch.setattr(weather, "weather_breaker",
+                        CircuitBreaker("test", failure_rate=0.5, min_requests=2, window=60, reset_timeout=60))
+    monkeypatch.setattr(weather, "_finish_weather_data",
+                        lambda weather_data, forecast_data, place, cell_key: {'location': 'ok', 'current': {}})
+    state = SimpleNamespace(calls=[], error=None)
+
+    def get_json(url, params):
+        state.calls.append(url)
+        if state.error is not None:
+            raise state.error
+        return {}
+
+    monkeypatch.setattr(weather, "_get_json", get_json)
+    return state
+
+
+def test_weather_breaker_opens_and_serves_fallback(upstream):
+    upstream.error = requests.exceptions.ConnectTimeout("timed out")
+    for _ in range(2):
+        assert 'error' in weather.fetch_weather_data("Pune")
+    assert weather.weather_breaker.state == "open"
+
+    fetched = len(upstream.calls)
+    data = weather.fetch_weather_data("Pune")
+    assert 'error' in data and data['location'] == "Pune"
+    assert len(upstream.calls) == fetched
+    assert weather.weather_breaker.stats()['rejected'] == 1
+
+
+def test_weather_breaker_counts_server_errors_but_not_unknown_cities(upstream):
+    assert weather._is_upstream_failure(_http_error(503))
+    assert weather._is_upstream_failure(_http_error(429))
+    assert weather._is_upstream_failure(requests.exceptions.ConnectionError("refused"))
+    assert not weather._is_upstream_failure(_http_error(404))
+
+    upstream.error = _http_error(404)
+    for _ in range(5):
+        assert 'error' in weather.fetch_weather_data("Atlantis")
+    stats = weather.weather_breaker.stats()
+    assert (stats['state'], stats['window_failures']) == ("closed", 0)
+
+
+def test_weather_breaker_lets_one_probe_through_when_half_open(upstream, monkeypatch):
+    upstream.error = _http_error(502)
+    for _ in range(2):
+        weather.fetch_weather_data("Pune")
+    assert weather.weather_breaker.state == "open"
+    monkeypatch.setattr(weather.weather_breaker, "reset_timeout", 0)
+    upstream.error = None
+
+    during_probe = []
+    probe_get_json = weather._get_json
+
+    def get_json(url, params):
+        if not during_probe:
+            # A second request while the probe is in flight is not sent upstream
+            during_probe.append(weather.fetch_weather_data("Nashik"))
+        return probe_get_json(url, params)
+
+    monkeypatch.setattr(weather, "_get_json", get_json)
+    assert weather.fetch_weather_data("Pune") == {'location': 'ok', 'current': {}}
+    assert 'error' in during_probe[0]
+    assert weather.weather_breaker.state == "closed"
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """A scripted OpenWeatherMap: a different synthetic forecast for every coordinate."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+    from bench_forecast import make_forecast
+
+    monkeypatch.setattr(weather, "WEATHER_API_KEY", "test-key")
+    monkeypatch.setattr(weather, "weather_breaker", CircuitBreaker("test"))
+    calls = []
+
+    def get_json(url, params):
+        calls.append(url)
+        seed = hash((params.get('lat'), params.get('lon'), params.get('q'))) % 1000
+        if url == weather.FORECAST_API_URL:
+            return make_forecast(seed)
+        return {'name': 'Station', 'sys': {'country': 'IN'}, 'main': {'temp': 15 + seed % 25, 'humidity': 40 + seed % 50},
+                'wind': {'speed': seed % 12}, 'weather': [{'description': 'haze', 'icon': '50d'}]}
+
+    monkeypatch.setattr(weather, "_get_json", get_json)
+    return calls
+
+
+def test_batch_matches_single_lookups(empty_cache, api):
+    locations = ["Pune", "Nashik", "Nagpur", "pune", "Atlantis"]
+    batch = weather.get_weather_batch(locations)
+    # Duplicate spellings share one fetch of two API calls
+    assert len(api) == 2 * 4
+
+    weather.weather_cache.clear()
+    for location in locations:
+        single = weather.get_weather_data(location)
+        assert batch[location]['forecast'] == pytest.approx(single['forecast'])
+        assert {k: v for k, v in batch[location].items() if k != 'forecast'} == \
+            {k: v for k, v in single.items() if k != 'forecast'}
+
+
+def test_batch_falls_back_per_location(empty_cache, api, monkeypatch):
+    def process_weather_batch(responses):
+        raise ValueError("malformed forecast")
+
+    monkeypatch.setattr(weather, "process_weather_batch", process_weather_batch)
+    get_json = weather._get_json
+
+    def unknown_atlantis(url, params):
+        if params.get('q') == "Atlantis":
+            raise _http_error(404)
+        return get_json(url, params)
+
+    monkeypatch.setattr(weather, "_get_json", unknown_atlantis)
+    batch = weather.get_weather_batch(["Pune", "Atlantis"])
+    assert batch["Pune"]['location'] == "Pune"
+    assert 'error' not in batch["Pune"]
+    assert 'error' in batch["Atlantis"]
+
+
+@pytest.mark.parametrize("degrees", [0.1, 0.2, 0.25, 0.5])
+def test_points_on_a_cell_edge_start_that_cell(degrees):
+    for index in range(-50, 50):
+        edge = round(index * degrees, 4)
+        key, lat, lon = weather.grid_cell(edge, edge, degrees)
+        assert key == f"grid:{degrees:g}:{index}:{index}"
+        assert lat == lon == round((index + 0.5) * degrees, 4)
+        # Just below the edge is the previous cell
+        assert weather.grid_cell(edge - 1e-4, edge, degrees)[0] == f"grid:{degrees:g}:{index - 1}:{index}"
+
+
+def test_grid_cell_key_and_centre():
+    assert weather.grid_cell(28.6139, 77.209, 0.5) == ("grid:0.5:57:154", 28.75, 77.25)
+    assert weather.grid_cell(-33.87, -70.65, 0.25) == ("grid:0.25:-136:-283", -33.875, -70.625)
+
+
+@pytest.fixture
+def grid(empty_cache, monkeypatch):
+    """Half-degree grid cells and a scripted fetch that records the cell it was asked for."""
+    monkeypatch.setattr(weather, "WEATHER_GRID_DEGREES", 0.5)
+    fetches = []
+
+    def fetch(location, place=None):
+        params, cell_key = weather._request_params(location, place)
+        fetches.append((cell_key, params['lat'], params['lon']))
+        return weather._label_place({'location': 'Station', 'current': {'temperature': 30}}, place, cell_key)
+
+    monkeypatch.setattr(weather, "fetch_weather_data", fetch)
+    return fetches
+
+
+def test_nearby_places_share_a_cell(grid):
+    assert weather.resolve_location("Delhi")[0] == weather.resolve_location("Noida")[0] == "grid:0.5:57:154"
+    # Gurugram is south of the 28.5° edge
+    assert weather.resolve_location("Gurgaon")[0] == "grid:0.5:56:154"
+
+    delhi = weather.get_weather_data("Delhi")
+    noida = weather.get_weather_data("Noida")
+    assert grid == [("grid:0.5:57:154", 28.75, 77.25)]
+    # The shared entry is labelled with the place each caller asked for
+    assert (delhi['location'], delhi['place_id']) == ("Delhi", "in:delhi:delhi")
+    assert (noida['location'], noida['place_id']) == ("Noida", "in:uttar-pradesh:noida")
+    assert delhi['grid_cell'] == noida['grid_cell'] == "grid:0.5:57:154"
+
+    weather.get_weather_data("Gurgaon")
+    assert len(grid) == 2
+
+
+def test_without_grid_places_key_on_their_id(empty_cache):
+    assert weather.resolve_location("New Delhi")[0] == "in:delhi:delhi"
+    assert weather.resolve_location("Atlantis") == ("atlantis", None)
+
+
+def test_for_place_leaves_the_cached_entry_alone():
+    cached = {'location': 'Delhi', 'place_id': 'in:delhi:delhi', 'current': {}}
+    noida = {'id': 'in:uttar-pradesh:noida', 'name': 'Noida'}
+    labelled = weather._for_place(cached, noida)
+    assert labelled['location'] == "Noida" and 'match' not in labelled
+    assert cached['location'] == "Delhi"
+    assert weather._for_place(cached, {'id': 'in:delhi:delhi', 'name': 'Delhi'}) is cached
+    assert weather._for_place(cached, dict(noida, match="fuzzy"))['match'] == "fuzzy"
+    assert weather._for_place({'error': 'down'}, noida) == {'error': 'down'}
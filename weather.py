@@ -1,7 +1,19 @@
 import os
+import math
+import asyncio
+import threading
+import httpx
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import logging
-from datetime import datetime
+import forecast
+import farming_rules
+import crop_advisory
+import gazetteer
+import metrics
+from circuit_breaker import CircuitBreaker
+from cache import TTLCache, SQLiteCache, SingleFlight, CACHE_HIT, CACHE_STALE
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -12,9 +24,161 @@ WEATHER_API_KEY = os.environ.get("WEATHER_API_KEY", "")
 WEATHER_API_URL = "https://api.openweathermap.org/data/2.5/weather"
 FORECAST_API_URL = "https://api.openweathermap.org/data/2.5/forecast"
 
+# HTTP client configuration (seconds / pooled connections)
+WEATHER_CONNECT_TIMEOUT = float(os.environ.get("WEATHER_CONNECT_TIMEOUT", "3.05"))
+WEATHER_READ_TIMEOUT = float(os.environ.get("WEATHER_READ_TIMEOUT", "10"))
+WEATHER_POOL_SIZE = int(os.environ.get("WEATHER_POOL_SIZE", "32"))
+
+# Shared keep-alive session so TLS connections are reused across requests
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=WEATHER_POOL_SIZE))
+
+# Worker pool used to run the current and forecast calls concurrently
+_fetch_executor = ThreadPoolExecutor(max_workers=WEATHER_POOL_SIZE, thread_name_prefix="weather-fetch")
+
+# Async HTTP client used by the ASGI serving path (created in the running event loop)
+WEATHER_ASYNC_MAX_CONNECTIONS = int(os.environ.get("WEATHER_ASYNC_MAX_CONNECTIONS", "200"))
+_async_http = None
+
+# In-flight async fetches by cache key, so concurrent coroutines share one fetch
+_async_inflight = {}
+
+# Circuit breaker: stop calling OpenWeatherMap while it is failing and serve fallback data
+weather_breaker = CircuitBreaker(
+    "openweathermap",
+    failure_rate=float(os.environ.get("WEATHER_CIRCUIT_FAILURE_RATE", "0.5")),
+    min_requests=int(os.environ.get("WEATHER_CIRCUIT_MIN_REQUESTS", "10")),
+    window=float(os.environ.get("WEATHER_CIRCUIT_WINDOW", "60")),
+    reset_timeout=float(os.environ.get("WEATHER_CIRCUIT_RESET_TIMEOUT", "30"))
+)
+
+# Batch lookups fan out over their own bounded pool so they never starve the fetch pool
+WEATHER_BATCH_WORKERS = int(os.environ.get("WEATHER_BATCH_WORKERS", "16"))
+_batch_executor = ThreadPoolExecutor(max_workers=WEATHER_BATCH_WORKERS, thread_name_prefix="weather-batch")
+
+# Weather cache configuration (seconds / number of locations)
+WEATHER_CACHE_TTL = float(os.environ.get("WEATHER_CACHE_TTL", "600"))
+WEATHER_CACHE_STALE_TTL = float(os.environ.get("WEATHER_CACHE_STALE_TTL", "1800"))
+WEATHER_CACHE_MAX_ENTRIES = int(os.environ.get("WEATHER_CACHE_MAX_ENTRIES", "2048"))
+
+weather_cache = TTLCache(
+    max_entries=WEATHER_CACHE_MAX_ENTRIES,
+    ttl=WEATHER_CACHE_TTL,
+    stale_ttl=WEATHER_CACHE_STALE_TTL
+)
+
+# Optional on-disk cache shared by all workers on the node and kept across restarts
+# ("memory" keeps only the in-process cache, "sqlite" adds the shared file behind it)
+WEATHER_CACHE_BACKEND = os.environ.get("WEATHER_CACHE_BACKEND", "memory").lower()
+WEATHER_CACHE_PATH = os.environ.get(
+    "WEATHER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "weather_cache.db")
+)
+
+shared_cache = None
+if WEATHER_CACHE_BACKEND == "sqlite":
+    try:
+        shared_cache = SQLiteCache(WEATHER_CACHE_PATH, ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_CACHE_STALE_TTL)
+        logger.info(f"Using shared weather cache at {WEATHER_CACHE_PATH}")
+    except Exception as e:
+        logger.error(f"Error opening shared weather cache {WEATHER_CACHE_PATH}: {e}")
+
+# Coalesces concurrent upstream fetches for the same location
+_inflight = SingleFlight()
+
+# Resolve free-text locations to canonical gazetteer places before fetching
+WEATHER_GAZETTEER_ENABLED = os.environ.get("WEATHER_GAZETTEER_ENABLED", "true").lower() in ("1", "true", "yes")
+# When strict, names missing from the gazetteer get fallback data without an upstream call
+WEATHER_GAZETTEER_STRICT = os.environ.get("WEATHER_GAZETTEER_STRICT", "false").lower() in ("1", "true", "yes")
+
+# Snap resolved places to grid cells of this many degrees so nearby villages share
+# one upstream fetch and cache entry (0 disables grid bucketing)
+WEATHER_GRID_DEGREES = float(os.environ.get("WEATHER_GRID_DEGREES", "0"))
+
+# Locations with a background refresh currently running
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def normalize_location(location):
+    """
+    Normalize a location name for use as a cache key.
+    
+    Args:
+        location (str): The location name as entered by the user
+        
+    Returns:
+        str: The case-folded location with collapsed whitespace
+    """
+    return " ".join(str(location).split()).casefold()
+
+def resolve_location(location):
+    """
+    Resolve a location to the key used for caching and fetching.
+    
+    Known places resolve to their canonical gazetteer ID, so spellings such as
+    "delhi", "Delhi " and "New Delhi" share one cache entry and upstream call.
+    With grid bucketing enabled, known places resolve to their grid cell instead.
+    
+    Args:
+        location (str): The location name as entered by the user
+        
+    Returns:
+        tuple: (key, place) where place is the gazetteer entry or None if unknown
+    """
+    place = gazetteer.resolve(location) if WEATHER_GAZETTEER_ENABLED else None
+    if place:
+        if WEATHER_GRID_DEGREES > 0:
+            return grid_cell(place['lat'], place['lon'])[0], place
+        return place['id'], place
+    return normalize_location(location), None
+
+def grid_cell(lat, lon, degrees=None):
+    """
+    Snap coordinates to a grid cell.
+    
+    Args:
+        lat (float): Latitude
+        lon (float): Longitude
+        degrees (float, optional): Cell size in degrees (defaults to WEATHER_GRID_DEGREES)
+        
+    Returns:
+        tuple: (cell key, cell centre latitude, cell centre longitude)
+    """
+    degrees = degrees or WEATHER_GRID_DEGREES
+    # Round away float error first, so a point on a cell edge (0.3 / 0.1 = 2.9999999999999996)
+    # falls in the cell that starts there
+    row = math.floor(round(lat / degrees, 9))
+    col = math.floor(round(lon / degrees, 9))
+    return (
+        f"grid:{degrees:g}:{row}:{col}",
+        round((row + 0.5) * degrees, 4),
+        round((col + 0.5) * degrees, 4)
+    )
+
+def _for_place(weather_data, place):
+    """
+    Label shared (grid cell) weather data with the requested place.
+    
+    Places resolved by prefix or spelling correction also get 'match' (the
+    gazetteer match type), so callers can say which place is being shown.
+    Returns a shallow copy so the cached entry is left untouched.
+    """
+    if not place or 'error' in weather_data:
+        return weather_data
+    inexact = place.get('match', gazetteer.MATCH_EXACT) != gazetteer.MATCH_EXACT
+    if weather_data.get('place_id') == place['id'] and not inexact:
+        return weather_data
+    labelled = dict(weather_data, location=place['name'], place_id=place['id'])
+    if inexact:
+        labelled['match'] = place['match']
+    return labelled
+
 def get_weather_data(location):
     """
-    Get current weather data for a specific location.
+    Get current weather data for a specific location, served from cache when possible.
+    
+    Fresh cache entries are returned directly. Expired entries still inside the
+    stale window are returned immediately while one background refresh runs.
     
     Args:
         location (str): The name of the location to get weather data for
@@ -22,43 +186,441 @@ def get_weather_data(location):
     Returns:
         dict: Weather data including current conditions and farming recommendations
     """
+    key, place = resolve_location(location)
+    cached_data, status = _cache_get(key)
+    
+    if status == CACHE_HIT:
+        return _for_place(cached_data, place)
+    
+    if status == CACHE_STALE:
+        _schedule_refresh(key, location, place)
+        return _for_place(cached_data, place)
+    
+    return _for_place(_load_weather_data(key, location, place), place)
+
+def refresh_weather_data(location):
+    """
+    Fetch fresh weather data for a location and store it in the cache.
+    
+    Used to warm the cache ahead of demand; concurrent lookups for the same
+    location share this fetch.
+    
+    Args:
+        location (str): The name of the location to refresh
+        
+    Returns:
+        dict: The freshly fetched weather data
+    """
+    key, place = resolve_location(location)
+    return _load_weather_data(key, location, place)
+
+def get_weather_batch(locations):
+    """
+    Get weather data for several locations, fetching them concurrently.
+    
+    Locations that resolve to the same key (place or grid cell) are fetched only
+    once. Cache misses are fetched in parallel and then processed together, so
+    their forecasts and recommendations are computed in one vectorized pass.
+    
+    Args:
+        locations (list): Location names to get weather data for
+        
+    Returns:
+        dict: Weather data keyed by each location name as given
+    """
+    resolved = {}
+    found = {}
+    misses = {}
+    for location in locations:
+        key, place = resolve_location(location)
+        resolved[location] = (key, place)
+        if key in found or key in misses:
+            continue
+        cached_data, status = _cache_get(key)
+        if status == CACHE_STALE:
+            _schedule_refresh(key, location, place)
+        if status in (CACHE_HIT, CACHE_STALE):
+            found[key] = cached_data
+        else:
+            misses[key] = (location, place)
+    found.update(_load_weather_batch(misses))
+    
+    results = {}
+    for location in locations:
+        key, place = resolved[location]
+        results[location] = _for_place(found[key], place)
+    return results
+
+def _load_weather_batch(misses):
+    """
+    Fetch weather data for cache misses in parallel and process the responses together.
+    
+    Keys already being fetched by another request join that fetch instead.
+    
+    Args:
+        misses (dict): (location, place) by cache key
+        
+    Returns:
+        dict: Weather data by cache key (fallback data for locations that failed)
+    """
+    joined = {}
+    fetching = {}
+    for key, (location, place) in misses.items():
+        if _inflight.in_flight(key):
+            joined[key] = _batch_executor.submit(get_weather_data, location)
+        else:
+            fetching[key] = _batch_executor.submit(_fetch_responses, location, place)
+    
+    loaded = {}
+    fetched = []
+    for key, future in fetching.items():
+        location, place = misses[key]
+        try:
+            responses = future.result()
+        except Exception as e:
+            logger.error(f"Error fetching weather data for {location}: {e}")
+            responses = get_fallback_weather_data(location)
+        if isinstance(responses, dict):
+            loaded[key] = responses
+        else:
+            fetched.append((key, location, place, responses))
+    
+    if fetched:
+        try:
+            processed = process_weather_batch([(current, forecast_data) for _, _, _, (current, forecast_data, _) in fetched])
+        except Exception as e:
+            # One malformed response should not fail the rest of the batch
+            logger.error(f"Error processing weather batch: {e}")
+            processed = [None] * len(fetched)
+        for (key, location, place, (current, forecast_data, cell_key)), weather_data in zip(fetched, processed):
+            try:
+                if weather_data is None:
+                    weather_data = process_weather_data(current, forecast_data)
+                weather_data = _label_place(weather_data, place, cell_key)
+                _cache_set(key, weather_data)
+            except Exception as e:
+                logger.error(f"Error processing weather data for {location}: {e}")
+                weather_data = get_fallback_weather_data(location)
+            loaded[key] = weather_data
+    
+    for key, future in joined.items():
+        location, _ = misses[key]
+        try:
+            loaded[key] = future.result()
+        except Exception as e:
+            logger.error(f"Error fetching weather data for {location}: {e}")
+            loaded[key] = get_fallback_weather_data(location)
+    return loaded
+
+def get_cache_stats():
+    """
+    Get hit, miss and eviction counters for the weather cache.
+    
+    Returns:
+        dict: Weather cache statistics, including request coalescing counters
+    """
+    stats = weather_cache.stats()
+    stats['coalescing'] = _inflight.stats()
+    if shared_cache is not None:
+        try:
+            stats['shared'] = shared_cache.stats()
+        except Exception as e:
+            logger.error(f"Error reading shared weather cache stats: {e}")
+    return stats
+
+metrics.register_stats("weather_cache", "Weather cache and request coalescing counters", get_cache_stats)
+metrics.register_stats("weather_circuit", "OpenWeatherMap circuit breaker counters", weather_breaker.stats)
+
+def _cache_get(key):
+    """
+    Look up a key in the in-process cache, then in the shared on-disk cache.
+    
+    Fresh shared entries are copied into the in-process cache for their remaining TTL.
+    """
+    cached_data, status = weather_cache.get(key)
+    if status == CACHE_HIT or shared_cache is None:
+        return cached_data, status
+    
     try:
-        # Check if the API key is available
-        if not WEATHER_API_KEY:
-            logger.warning("Weather API key is not available. Using mock data.")
-            return get_fallback_weather_data(location)
+        shared_data, shared_status, remaining = shared_cache.lookup(key)
+    except Exception as e:
+        logger.error(f"Error reading shared weather cache: {e}")
+        return cached_data, status
+    
+    if shared_status == CACHE_HIT:
+        weather_cache.set(key, shared_data, ttl=remaining)
+        return shared_data, CACHE_HIT
+    if status == CACHE_STALE:
+        return cached_data, status
+    return shared_data, shared_status
+
+def _cache_set(key, weather_data):
+    """Store weather data in the in-process cache and the shared cache if configured."""
+    weather_cache.set(key, weather_data)
+    if shared_cache is not None:
+        try:
+            shared_cache.set(key, weather_data)
+        except Exception as e:
+            logger.error(f"Error writing shared weather cache: {e}")
+
+def _load_weather_data(key, location, place=None):
+    """
+    Fetch weather data for a location, sharing one upstream fetch among concurrent callers.
+    
+    Successful results are written to the cache before waiting callers are released.
+    """
+    return _inflight.do(key, _fetch_and_cache, key, location, place)
+
+def _fetch_and_cache(key, location, place=None):
+    """Fetch weather data from the API and cache it if the fetch succeeded."""
+    weather_data = fetch_weather_data(location, place)
+    if 'error' not in weather_data:
+        _cache_set(key, weather_data)
+    return weather_data
+
+def _schedule_refresh(key, location, place=None):
+    """Start a background refresh for a stale entry unless one is already running."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    
+    def refresh():
+        try:
+            _load_weather_data(key, location, place)
+        except Exception as e:
+            logger.error(f"Error refreshing weather data for {location}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+    
+    threading.Thread(target=refresh, name=f"weather-refresh-{key}", daemon=True).start()
+
+def _get_json(url, params):
+    """Issue a GET over the shared session with connect/read timeouts and decode the JSON body."""
+    response = http_session.get(url, params=params, timeout=(WEATHER_CONNECT_TIMEOUT, WEATHER_READ_TIMEOUT))
+    response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+    return response.json()
+
+def _is_upstream_failure(error):
+    """
+    Decide whether a request error means the upstream is unhealthy.
+    
+    Timeouts, connection errors, rate limiting and 5XX responses count; client
+    errors such as an unknown city (404) mean the service is answering normally.
+    """
+    if isinstance(error, (requests.exceptions.HTTPError, httpx.HTTPStatusError)) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return True
+
+def _request_params(location, place):
+    """
+    Build the query parameters for a location.
+    
+    Returns:
+        tuple: (params, grid cell key or None)
+    """
+    params = {
+        'appid': WEATHER_API_KEY,
+        'units': 'metric'  # Use metric units (Celsius)
+    }
+    cell_key = None
+    if place and WEATHER_GRID_DEGREES > 0:
+        cell_key, cell_lat, cell_lon = grid_cell(place['lat'], place['lon'])
+        params.update(lat=cell_lat, lon=cell_lon)
+    elif place:
+        params.update(lat=place['lat'], lon=place['lon'])
+    else:
+        params['q'] = location
+    return params, cell_key
+
+def _skip_fetch(location, place):
+    """Return fallback data if the location should not be fetched right now, otherwise None."""
+    # Check if the API key is available
+    if not WEATHER_API_KEY:
+        logger.warning("Weather API key is not available. Using mock data.")
+        return get_fallback_weather_data(location)
+    
+    if WEATHER_GAZETTEER_STRICT and not place:
+        logger.warning(f"Location not found in gazetteer: {location}")
+        return get_fallback_weather_data(location)
+    
+    if not weather_breaker.allow_request():
+        logger.warning("Weather API circuit is open. Using fallback data.")
+        return get_fallback_weather_data(location)
+    
+    return None
+
+def _finish_weather_data(weather_data, forecast_data, place, cell_key):
+    """Process raw API responses and label them with the resolved place."""
+    return _label_place(process_weather_data(weather_data, forecast_data), place, cell_key)
+
+def _label_place(processed_data, place, cell_key):
+    """Label processed weather data with the resolved place and grid cell."""
+    if place:
+        # Coordinate lookups report the nearest station; show the canonical place name
+        processed_data['location'] = place['name']
+        processed_data['place_id'] = place['id']
+        if cell_key:
+            processed_data['grid_cell'] = cell_key
+    return processed_data
+
+def _record_fetch_error(error):
+    """Record a failed fetch with the circuit breaker."""
+    if isinstance(error, (requests.exceptions.RequestException, httpx.HTTPError)) and not _is_upstream_failure(error):
+        weather_breaker.record_success()
+    else:
+        weather_breaker.record_failure()
+
+def fetch_weather_data(location, place=None):
+    """
+    Fetch current weather and forecast data from the API, bypassing the cache.
+    
+    Args:
+        location (str): The name of the location to get weather data for
+        place (dict, optional): Gazetteer entry for the location; its coordinates are
+            queried instead of the free-text name
         
-        # Get current weather
-        params = {
-            'q': location,
-            'appid': WEATHER_API_KEY,
-            'units': 'metric'  # Use metric units (Celsius)
-        }
+    Returns:
+        dict: Weather data including current conditions and farming recommendations
+    """
+    responses = _fetch_responses(location, place)
+    if isinstance(responses, dict):
+        return responses
+    
+    # Process and extract relevant weather information
+    return _finish_weather_data(*responses, place)
+
+def _fetch_responses(location, place=None):
+    """
+    Fetch the raw current weather and forecast responses for a location.
+    
+    Returns:
+        tuple: (current data, forecast data, grid cell key or None), or a fallback
+        data dict if the fetch was skipped or failed
+    """
+    try:
+        fallback_data = _skip_fetch(location, place)
+        if fallback_data is not None:
+            return fallback_data
         
-        response = requests.get(WEATHER_API_URL, params=params)
-        response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+        params, cell_key = _request_params(location, place)
+        forecast_params = dict(params, cnt=40)  # 40 data points (5 days, every 3 hours)
         
-        weather_data = response.json()
+        # Get 5-day forecast on the pool while the current weather is fetched here
+        try:
+            forecast_future = _fetch_executor.submit(_get_json, FORECAST_API_URL, forecast_params)
+            try:
+                weather_data = _get_json(WEATHER_API_URL, params)
+            finally:
+                forecast_data = forecast_future.result()
+        except Exception as e:
+            _record_fetch_error(e)
+            raise
+        weather_breaker.record_success()
+        return weather_data, forecast_data, cell_key
+    
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching weather data: {e}")
+        return get_fallback_weather_data(location)
+
+async def get_weather_data_async(location):
+    """
+    Async variant of get_weather_data for the ASGI serving path.
+    
+    Uses the same caches as get_weather_data. Misses are fetched with the async
+    HTTP client, and concurrent coroutines for the same key share one fetch.
+    
+    Args:
+        location (str): The name of the location to get weather data for
         
-        # Get 5-day forecast
-        forecast_params = {
-            'q': location,
-            'appid': WEATHER_API_KEY,
-            'units': 'metric',
-            'cnt': 40  # Get 40 data points (5 days, every 3 hours)
-        }
+    Returns:
+        dict: Weather data including current conditions and farming recommendations
+    """
+    key, place = resolve_location(location)
+    cached_data, status = _cache_get(key)
+    
+    if status == CACHE_HIT:
+        return _for_place(cached_data, place)
+    
+    if status == CACHE_STALE:
+        _schedule_refresh(key, location, place)
+        return _for_place(cached_data, place)
+    
+    task = _async_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_cache_async(key, location, place))
+        _async_inflight[key] = task
+        task.add_done_callback(lambda _: _async_inflight.pop(key, None))
+    
+    return _for_place(await asyncio.shield(task), place)
+
+async def _fetch_and_cache_async(key, location, place):
+    """Fetch weather data with the async client and cache it if the fetch succeeded."""
+    weather_data = await fetch_weather_data_async(location, place)
+    if 'error' not in weather_data:
+        _cache_set(key, weather_data)
+    return weather_data
+
+def _get_async_client():
+    """Return the shared async HTTP client, creating it on first use."""
+    global _async_http
+    if _async_http is None or _async_http.is_closed:
+        _async_http = httpx.AsyncClient(
+            timeout=httpx.Timeout(WEATHER_READ_TIMEOUT, connect=WEATHER_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=WEATHER_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=WEATHER_POOL_SIZE
+            )
+        )
+    return _async_http
+
+async def close_async_client():
+    """Close the shared async HTTP client (call on application shutdown)."""
+    global _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+
+async def _get_json_async(url, params):
+    """Issue a GET with the async client and decode the JSON body."""
+    response = await _get_async_client().get(url, params=params)
+    response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+    return response.json()
+
+async def fetch_weather_data_async(location, place=None):
+    """
+    Async variant of fetch_weather_data; the current and forecast calls run concurrently.
+    
+    Args:
+        location (str): The name of the location to get weather data for
+        place (dict, optional): Gazetteer entry for the location
         
-        forecast_response = requests.get(FORECAST_API_URL, params=forecast_params)
-        forecast_response.raise_for_status()
+    Returns:
+        dict: Weather data including current conditions and farming recommendations
+    """
+    try:
+        fallback_data = _skip_fetch(location, place)
+        if fallback_data is not None:
+            return fallback_data
         
-        forecast_data = forecast_response.json()
+        params, cell_key = _request_params(location, place)
+        forecast_params = dict(params, cnt=40)  # 40 data points (5 days, every 3 hours)
         
-        # Process and extract relevant weather information
-        processed_data = process_weather_data(weather_data, forecast_data)
+        try:
+            weather_data, forecast_data = await asyncio.gather(
+                _get_json_async(WEATHER_API_URL, params),
+                _get_json_async(FORECAST_API_URL, forecast_params)
+            )
+        except Exception as e:
+            _record_fetch_error(e)
+            raise
+        weather_breaker.record_success()
         
-        return processed_data
+        return _finish_weather_data(weather_data, forecast_data, place, cell_key)
     
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, ValueError) as e:
         logger.error(f"Error fetching weather data: {e}")
         return get_fallback_weather_data(location)
 
@@ -73,6 +635,39 @@ def process_weather_data(current_data, forecast_data):
     Returns:
         dict: Processed weather data with farming recommendations
     """
+    # Parse the 3-hourly forecast once for daily aggregation and crop advice
+    forecast_columns = forecast.forecast_columns(forecast_data)
+    
+    # Aggregate the 3-hourly forecast into daily min/max/mean values (next 5 days)
+    forecast_days = forecast.summarize_columns(forecast_columns)
+    
+    # Generate farming recommendations based on weather conditions
+    farming_recommendations = generate_farming_recommendations(current_data, forecast_data, forecast_columns)
+    
+    return _weather_payload(current_data, forecast_columns, forecast_days, farming_recommendations)
+
+def process_weather_batch(responses):
+    """
+    Process the raw weather data of several locations together.
+    
+    Args:
+        responses (list): (current data, forecast data) pairs from the API
+        
+    Returns:
+        list: Processed weather data for each pair, as from process_weather_data
+    """
+    current_data_list = [current_data for current_data, _ in responses]
+    forecasts = [forecast_data for _, forecast_data in responses]
+    forecast_days = forecast.summarize_forecasts(forecasts)
+    recommendations = farming_rules.recommend_batch(current_data_list, forecasts)
+    return [
+        _weather_payload(current_data, forecast.forecast_columns(forecast_data), days, farming_recommendations)
+        for current_data, forecast_data, days, farming_recommendations
+        in zip(current_data_list, forecasts, forecast_days, recommendations)
+    ]
+
+def _weather_payload(current_data, forecast_columns, forecast_days, farming_recommendations):
+    """Assemble the processed weather data of one location."""
     # Extract current weather information
     current_temp = current_data['main']['temp']
     current_humidity = current_data['main']['humidity']
@@ -80,28 +675,8 @@ def process_weather_data(current_data, forecast_data):
     current_weather_desc = current_data['weather'][0]['description']
     current_weather_icon = current_data['weather'][0]['icon']
     
-    # Extract forecast information (next 5 days)
-    forecast_days = []
-    date_processed = set()
-    
-    for item in forecast_data['list']:
-        # Extract date (without time)
-        date_str = item['dt_txt'].split(' ')[0]
-        
-        # Only process each date once
-        if date_str not in date_processed and len(date_processed) < 5:
-            date_processed.add(date_str)
-            
-            forecast_days.append({
-                'date': date_str,
-                'temp': item['main']['temp'],
-                'humidity': item['main']['humidity'],
-                'description': item['weather'][0]['description'],
-                'icon': item['weather'][0]['icon']
-            })
-    
-    # Generate farming recommendations based on weather conditions
-    farming_recommendations = generate_farming_recommendations(current_data, forecast_data)
+    # Look up crop-specific advice in the precomputed crop-condition index
+    crop_advisories = generate_crop_advisories(current_data, forecast_columns)
     
     # Prepare the final weather data
     processed_data = {
@@ -115,67 +690,47 @@ def process_weather_data(current_data, forecast_data):
             'icon': f"http://openweathermap.org/img/wn/{current_weather_icon}@2x.png"
         },
         'forecast': forecast_days,
-        'farming_recommendations': farming_recommendations
+        'farming_recommendations': farming_recommendations,
+        'crop_advisories': crop_advisories
     }
     
     return processed_data
 
-def generate_farming_recommendations(current_data, forecast_data):
+def generate_farming_recommendations(current_data, forecast_data, forecast_columns=None):
     """
     Generate farming recommendations based on weather conditions.
     
+    The thresholds and messages live in farming_rules.RECOMMENDATION_RULES.
+    
     Args:
         current_data (dict): Current weather data
         forecast_data (dict): Forecast weather data
+        forecast_columns (dict, optional): forecast_data already parsed by forecast.forecast_columns
         
     Returns:
         list: Farming recommendations based on weather conditions
     """
-    recommendations = []
+    if forecast_columns is None:
+        forecast_columns = forecast.forecast_columns(forecast_data)
     
-    # Check current temperature
-    current_temp = current_data['main']['temp']
-    if current_temp > 35:
-        recommendations.append("High temperature alert! Ensure crops have adequate water. Consider overhead sprinkling for cooling effect.")
-    elif current_temp < 10:
-        recommendations.append("Low temperature alert! Protect sensitive crops from frost. Use covers or heaters if available.")
+    return farming_rules.recommendation_evaluator.evaluate_one(current_data, forecast_columns)
+
+def generate_crop_advisories(current_data, forecast_columns):
+    """
+    Get crop-specific advice for the current and forecast weather.
     
-    # Check humidity
-    current_humidity = current_data['main']['humidity']
-    if current_humidity > 80:
-        recommendations.append("High humidity detected. Monitor for fungal diseases and mildew. Apply fungicides if necessary.")
-    elif current_humidity < 30:
-        recommendations.append("Low humidity detected. Increase irrigation and consider mulching to retain soil moisture.")
-    
-    # Check for rain in the forecast
-    rain_expected = False
-    for item in forecast_data['list'][:8]:  # Check next 24 hours
-        if 'rain' in item:
-            rain_expected = True
-            break
-    
-    if rain_expected:
-        recommendations.append("Rain expected in the next 24 hours. Hold off on applying fertilizers or pesticides.")
-    else:
-        recommendations.append("No significant rain expected in the next 24 hours. Good opportunity for field operations.")
-    
-    # Check wind conditions
-    current_wind = current_data['wind']['speed']
-    if current_wind > 5:  # Wind speed in m/s
-        recommendations.append("Moderate to high winds expected. Avoid spraying operations and secure young plants.")
-    
-    # Add seasonal recommendation based on current month
-    month = datetime.now().month
-    if 3 <= month <= 5:  # Spring (Northern Hemisphere)
-        recommendations.append("Spring season: Good time for planting summer crops. Prepare fields and ensure adequate nutrition.")
-    elif 6 <= month <= 8:  # Summer
-        recommendations.append("Summer season: Monitor irrigation needs carefully. Consider shade for sensitive crops.")
-    elif 9 <= month <= 11:  # Fall
-        recommendations.append("Fall season: Prepare for harvest operations. Monitor storage conditions for harvested crops.")
-    else:  # Winter
-        recommendations.append("Winter season: Focus on winter crops and preparation for spring planting. Protect soil from erosion.")
-    
-    return recommendations
+    Args:
+        current_data (dict): Current weather data
+        forecast_columns (dict): Forecast weather data parsed by forecast.forecast_columns
+        
+    Returns:
+        list: {'id', 'crop', 'advice'} for each crop with advice (empty if the index is unavailable)
+    """
+    try:
+        return crop_advisory.advise(current_data, forecast_columns)
+    except Exception as e:
+        logger.error(f"Error generating crop advisories: {e}")
+        return []
 
 def get_fallback_weather_data(location):
     """
@@ -202,5 +757,6 @@ def get_fallback_weather_data(location):
         'farming_recommendations': [
             "Weather data is currently unavailable. Please check your local weather service for accurate forecasts.",
             "In the absence of weather data, monitor your fields regularly and follow standard seasonal practices."
-        ]
+        ],
+        'crop_advisories': []
     }